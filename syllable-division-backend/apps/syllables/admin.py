@@ -1,14 +1,23 @@
 from django.contrib import admin
-from .models import Syllable
+from .models import Syllable, SyllabifyJob
 
 @admin.register(Syllable)
 class SyllableAdmin(admin.ModelAdmin):
     
-    list_display = ("id", "word", "syllables_count")
+    list_display = ("id", "word", "lang", "syllables_count", "source")
+    list_filter = ("lang", "source")
     search_fields = ("word",)
 
     def syllables_count(self, obj):
         data = getattr(obj, "syllables", None)
         return len(data) if isinstance(data, (list, tuple)) else 0
     syllables_count.short_description = "Syllables"
-   
\ No newline at end of file
+   
+
+
+@admin.register(SyllabifyJob)
+class SyllabifyJobAdmin(admin.ModelAdmin):
+
+    list_display = ("id", "status", "total", "processed", "failed", "created_at", "finished_at")
+    list_filter = ("status",)
+    readonly_fields = ("total", "processed", "failed", "created_at", "started_at", "finished_at")
@@ -2,4 +2,9 @@ from django.apps import AppConfig
 
 class SyllablesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'apps.syllables'
\ No newline at end of file
+    name = 'apps.syllables'
+
+    def ready(self):
+        from apps.syllables import signals
+
+        signals.connect()
\ No newline at end of file
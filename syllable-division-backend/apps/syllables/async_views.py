@@ -0,0 +1,108 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseBadRequest
+
+from apps.syllables.services.limits import limit_request
+from apps.syllables.services.offload import OffloadQueueFull, get_offloader
+from apps.syllables.views import (
+    divide_response,
+    ndjson_lines,
+    ndjson_response,
+    parse_json_body,
+    split_response,
+    split_syllables_args,
+    split_syllables_cached,
+    wants_stream,
+)
+
+
+# Async (ASGI) variants of divide/, split/ and split-syllables/.
+#
+# Same request/response contract as the sync views in views.py. Bodies up to
+# SYLLABLE_ASYNC_INLINE_MAX_BYTES are handled straight away through
+# sync_to_async (the ORM can't run on the event loop itself, and the dictionary
+# may need a lookup); larger ones are decoded and processed in the bounded
+# offload pool so a huge upload never blocks the loop. A full pool queue
+# answers 503 + Retry-After.
+# Size limits and the rate limiter are shared with the sync endpoints.
+
+
+def csrf_exempt(view):
+    # Django 4.2's csrf_exempt wraps views in a sync function, which would hide
+    # the coroutine from the handler; flag the view itself instead.
+    view.csrf_exempt = True
+    return view
+
+
+def _is_large(request) -> bool:
+    return len(request.body) > getattr(settings, "SYLLABLE_ASYNC_INLINE_MAX_BYTES", 16 * 1024)
+
+
+def _busy():
+    response = HttpResponse("Servidor ocupado, reintente en unos segundos", status=503)
+    response["Retry-After"] = "1"
+    return response
+
+
+async def _run(request, fn, *args):
+    if not _is_large(request):
+        return await sync_to_async(fn)(*args)
+    try:
+        return await get_offloader().run(fn, *args)
+    except OffloadQueueFull:
+        return _busy()
+
+
+async def _parse(request):
+    # (data, error response) of parse_json_body; large bodies are decoded in the pool
+    if not _is_large(request):
+        return parse_json_body(request)
+    try:
+        return await get_offloader().run(parse_json_body, request)
+    except OffloadQueueFull:
+        return None, _busy()
+
+
+@csrf_exempt
+async def divide_syllables_async(request):
+    if request.method != "POST":
+        return HttpResponseBadRequest("Use POST con JSON {'word': '...'}")
+    data, error = await _parse(request)
+    if error:
+        return error
+    return await _run(request, divide_response, data)
+
+
+@csrf_exempt
+@limit_request("split_text")
+async def split_text_async(request):
+    if request.method != "POST":
+        return HttpResponseBadRequest("Use POST con JSON {'text': '...'}")
+    data, error = await _parse(request)
+    if error:
+        return error
+    return await _run(request, split_response, data, request)
+
+
+@csrf_exempt
+@limit_request("split_and_syllabify")
+async def split_and_syllabify_async(request):
+    """Async split-syllables. Streaming mode (?stream=1) pulls lines from the
+    offload pool in chunks, so the loop stays free between chunks.
+    """
+    if request.method != "POST":
+        return HttpResponseBadRequest("Use POST con JSON {'text': '...'}")
+    data, error = await _parse(request)
+    if error:
+        return error
+    text, options, error = split_syllables_args(data)
+    if error:
+        return error
+
+    if wants_stream(request):
+        try:
+            stream = get_offloader().stream(ndjson_lines(text, options))
+        except OffloadQueueFull:
+            return _busy()
+        return ndjson_response(stream)
+    return await _run(request, split_syllables_cached, request, text, options)
@@ -0,0 +1,108 @@
+import json
+from itertools import cycle
+from typing import Iterable, List
+
+from django.test import Client
+from django.urls import reverse
+
+from apps.syllables.benchmarks.harness import Case, build_text, load_corpus
+from apps.syllables.services.parallel import syllabify_compact_parallel
+from apps.syllables.services.syllable_cache import reset_syllable_cache
+from apps.syllables.services.syllable_divider import syllable_divider
+from apps.syllables.services.syllable_engine import divide
+from apps.syllables.services.text_syllabifier import syllabify_compact
+from apps.syllables.services.word_splitter import split_words
+
+
+# Benchmark cases, grouped as:
+#   divider          syllable_divider / engine divide, one word per operation
+#   split_words      split_words(keep_punct=True) in every attach_punct mode
+#   split_syllables  POST split-syllables/ end to end through the test client
+#   parallel         syllabify_compact vs the process pool path on a songbook-sized
+#                    text (PARALLEL_LINES lines); the ops/s ratio is the speedup
+
+CORPORA = ("es", "en", "synthetic")
+DEFAULT_SIZES = (10, 100, 1000)
+ATTACH_MODES = ("separate", "left", "right", "auto")
+GROUPS = ("divider", "split_words", "split_syllables", "parallel")
+PARALLEL_LINES = 20000
+
+
+def _word_cycle(lines: List[str]):
+    words = split_words("\n".join(lines), keep_hyphens=False)
+    return cycle(words)
+
+
+def divider_cases(corpus: str, lines: List[str]) -> List[Case]:
+    words = _word_cycle(lines)
+    return [
+        Case(f"divider/syllable_divider/{corpus}", "divider", corpus, 1, lambda: syllable_divider(next(words))),
+        Case(f"divider/engine/{corpus}", "divider", corpus, 1, lambda: divide(next(words))),
+    ]
+
+
+def split_words_cases(corpus: str, lines: List[str], sizes: Iterable[int]) -> List[Case]:
+    cases = []
+    for size in sizes:
+        text = build_text(lines, size)
+        for mode in ATTACH_MODES:
+            cases.append(Case(
+                f"split_words/{mode}/{corpus}/{size}",
+                "split_words",
+                corpus,
+                size,
+                lambda text=text, mode=mode: split_words(text, keep_punct=True, attach_punct=mode),
+            ))
+    return cases
+
+
+def split_syllables_cases(corpus: str, lines: List[str], sizes: Iterable[int]) -> List[Case]:
+    client = Client()
+    url = reverse("split_and_syllabify")
+    cases = []
+    for size in sizes:
+        body = json.dumps({"text": build_text(lines, size)})
+
+        def post(body=body):
+            response = client.post(url, data=body, content_type="application/json")
+            assert response.status_code == 200, response.content[:200]
+
+        cases.append(Case(f"split_syllables/{corpus}/{size}", "split_syllables", corpus, size, post))
+    return cases
+
+
+def parallel_cases(corpus: str, lines: List[str]) -> List[Case]:
+    text = build_text(lines, PARALLEL_LINES)
+
+    # A cold cache on every run, as for a fresh import: the serial path would
+    # otherwise only measure cache hits after the first run.
+    def serial():
+        reset_syllable_cache()
+        syllabify_compact(text)
+
+    def pool():
+        reset_syllable_cache()
+        syllabify_compact_parallel(text)
+
+    return [
+        Case(f"parallel/serial/{corpus}/{PARALLEL_LINES}", "parallel", corpus, PARALLEL_LINES, serial),
+        Case(f"parallel/pool/{corpus}/{PARALLEL_LINES}", "parallel", corpus, PARALLEL_LINES, pool),
+    ]
+
+
+def build_cases(groups: Iterable[str] = GROUPS, corpora: Iterable[str] = CORPORA, sizes: Iterable[int] = DEFAULT_SIZES) -> List[Case]:
+    groups = set(groups)
+    sizes = list(sizes)
+    cases: List[Case] = []
+    for corpus in corpora:
+        lines = load_corpus(corpus)
+        if "divider" in groups:
+            cases.extend(divider_cases(corpus, lines))
+        if "split_words" in groups:
+            cases.extend(split_words_cases(corpus, lines, sizes))
+        if "split_syllables" in groups:
+            cases.extend(split_syllables_cases(corpus, lines, sizes))
+        if "parallel" in groups:
+            cases.extend(parallel_cases(corpus, lines))
+    return cases
+
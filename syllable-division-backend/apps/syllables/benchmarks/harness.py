@@ -0,0 +1,167 @@
+import gc
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+
+# Micro-benchmark harness for the syllabification hot paths (see the
+# benchmark_syllables management command).
+#
+# Each case is a callable that performs one operation. It is warmed up, then run
+# repeatedly until both a minimum number of runs and a minimum time are reached;
+# every run is timed individually to get p50/p99. Peak memory comes from one
+# extra run under tracemalloc (kept apart so tracing doesn't skew the timings).
+
+CORPORA_DIR = Path(__file__).resolve().parent / "corpora"
+
+# Syllables used to build the synthetic corpus: common Spanish onsets and rimes.
+_ONSETS = ["", "b", "c", "d", "f", "g", "l", "m", "n", "p", "r", "s", "t", "v", "ch", "ll", "bl", "br", "cr", "pl", "tr"]
+_NUCLEI = ["a", "e", "i", "o", "u", "á", "é", "ó", "ia", "ie", "ue", "ai"]
+_CODAS = ["", "", "", "n", "s", "r", "l"]
+_PUNCT = [",", ".", "!", "?", "...", ";", ":"]
+
+
+class Case(NamedTuple):
+    name: str
+    group: str
+    corpus: str
+    size: int  # lines of input (words for the divider cases)
+    fn: Callable[[], Any]
+
+
+def load_corpus(name: str) -> List[str]:
+    """Lines of a bundled corpus ('es', 'en') or of the seeded 'synthetic' one."""
+    if name == "synthetic":
+        return synthetic_lines(200)
+    return (CORPORA_DIR / f"{name}.txt").read_text(encoding="utf-8").splitlines()
+
+
+def synthetic_lines(count: int, seed: int = 1234) -> List[str]:
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        words = []
+        for _ in range(rng.randint(3, 10)):
+            word = "".join(
+                rng.choice(_ONSETS) + rng.choice(_NUCLEI) + rng.choice(_CODAS)
+                for _ in range(rng.randint(1, 4))
+            )
+            words.append(word.capitalize() if not words else word)
+        lines.append(" ".join(words) + rng.choice(_PUNCT))
+    return lines
+
+
+def build_text(lines: List[str], size: int) -> str:
+    """size lines taken cyclically from lines."""
+    return "\n".join(lines[i % len(lines)] for i in range(size))
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def measure(fn: Callable[[], Any], *, min_runs: int = 5, min_time: float = 0.5, warmup: int = 1) -> Dict[str, float]:
+    for _ in range(warmup):
+        fn()
+
+    timings: List[float] = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        while len(timings) < min_runs or time.perf_counter() - started < min_time:
+            t0 = time.perf_counter_ns()
+            fn()
+            timings.append((time.perf_counter_ns() - t0) / 1000)
+        elapsed = time.perf_counter() - started
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "runs": len(timings),
+        "ops_per_sec": len(timings) / elapsed if elapsed else 0.0,
+        "mean_us": sum(timings) / len(timings),
+        "p50_us": _percentile(timings, 50),
+        "p99_us": _percentile(timings, 99),
+        "peak_kib": peak / 1024,
+    }
+
+
+def run_cases(cases: List[Case], progress: Optional[Callable[[Dict[str, Any]], None]] = None, **measure_options) -> List[Dict[str, Any]]:
+    results = []
+    for case in cases:
+        result = {"name": case.name, "group": case.group, "corpus": case.corpus, "size": case.size}
+        result.update(measure(case.fn, **measure_options))
+        results.append(result)
+        if progress is not None:
+            progress(result)
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            timeout=10,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+    }
+
+
+def save_report(path: str, results: List[Dict[str, Any]], options: Dict[str, Any]) -> None:
+    report = {"environment": environment(), "options": options, "results": results}
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+        fh.write("\n")
+
+
+def compare(baseline_path: str, results: List[Dict[str, Any]], threshold: float) -> List[Dict[str, Any]]:
+    """Match results by name against a saved report. Returns one row per common
+    case with the ops/sec ratio (current / baseline) and whether it dropped by
+    more than threshold (e.g. 0.1 = 10% slower).
+    """
+    with open(baseline_path, encoding="utf-8") as fh:
+        baseline = {r["name"]: r for r in json.load(fh)["results"]}
+    rows = []
+    for result in results:
+        old = baseline.get(result["name"])
+        if old is None or not old["ops_per_sec"]:
+            continue
+        ratio = result["ops_per_sec"] / old["ops_per_sec"]
+        rows.append({
+            "name": result["name"],
+            "baseline_ops_per_sec": old["ops_per_sec"],
+            "ops_per_sec": result["ops_per_sec"],
+            "ratio": ratio,
+            "regression": ratio < 1 - threshold,
+        })
+    return rows
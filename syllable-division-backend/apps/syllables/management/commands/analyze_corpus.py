@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.syllables.services.analytics import analyze_corpus, iter_songs, write_columns
+from apps.syllables.services.languages import LANGUAGES
+
+
+class Command(BaseCommand):
+    help = (
+        "Offline syllable analytics for a lyric catalogue: stream text files (one song each) "
+        "or JSONL dumps ({\"id\", \"text\"} per line), syllabify the distinct vocabulary once "
+        "and write per-line and per-song counts and meter statistics to a columnar file "
+        "(see apps/syllables/services/analytics.py). Uses NumPy when it is installed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="Files, or directories searched for *.txt / *.jsonl.")
+        parser.add_argument("--output", "-o", required=True, help="Columnar output file.")
+        parser.add_argument("--format", choices=["text", "jsonl"], help="Default: from each file's extension.")
+        parser.add_argument("--lang", choices=list(LANGUAGES), help="Default: SYLLABLE_DEFAULT_LANG.")
+        parser.add_argument("--keep-case", action="store_true", help="Don't lowercase words before counting.")
+        parser.add_argument("--keep-hyphens", action="store_true")
+        parser.add_argument("--no-numbers", action="store_true", help="Ignore numeric tokens.")
+        parser.add_argument("--no-dictionary", action="store_true", help="Heuristic rules only, skip Syllable rows.")
+
+    def handle(self, *args, **options):
+        every = 10000
+
+        def progress(index):
+            if len(index.song_ids) % every == 0:
+                self.stderr.write(f"  {len(index.song_ids):>10,} songs  {index.lines:>12,} lines")
+
+        try:
+            index, columns, stats = analyze_corpus(
+                iter_songs(options["paths"], options["format"]),
+                lang=options["lang"],
+                use_dictionary=not options["no_dictionary"],
+                progress=progress,
+                include_numbers=not options["no_numbers"],
+                keep_hyphens=options["keep_hyphens"],
+                lower=not options["keep_case"],
+            )
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        try:
+            written = write_columns(options["output"], columns, {**stats, "song_ids": index.song_ids})
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        seconds = stats["seconds"]
+        self.stdout.write(self.style.SUCCESS(
+            f"{stats['songs']:,} songs, {stats['lines']:,} lines, {stats['tokens']:,} words "
+            f"({stats['vocabulary']:,} distinct) in {sum(seconds.values()):.2f}s "
+            f"({stats['lines_per_second']:,.0f} lines/s; tokenize {seconds['tokenize']:.2f}s, "
+            f"syllabify {seconds['syllabify']:.2f}s, aggregate {seconds['aggregate']:.2f}s "
+            f"with {stats['backend']}). Wrote {written:,} bytes to {options['output']}"
+        ))
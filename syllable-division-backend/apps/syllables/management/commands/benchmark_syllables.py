@@ -0,0 +1,100 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from apps.syllables.benchmarks.cases import CORPORA, DEFAULT_SIZES, GROUPS, build_cases
+from apps.syllables.benchmarks.harness import compare, run_cases, save_report
+from apps.syllables.services.dictionary import clear_pending
+from apps.syllables.services.parallel import shutdown_pool
+from apps.syllables.services.syllable_cache import reset_syllable_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the syllabification hot paths (divider, split_words, split-syllables "
+        "end to end, serial vs parallel pool) over bundled Spanish/English lyrics and a synthetic corpus. Reports "
+        "ops/s, p50/p99 latency and peak memory; save with --output and compare two "
+        "commits with --compare. End-to-end cases run against a throwaway test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--group", action="append", choices=GROUPS, help="Repeatable (default: all).")
+        parser.add_argument("--corpus", action="append", choices=CORPORA, help="Repeatable (default: all).")
+        parser.add_argument(
+            "--sizes",
+            default=",".join(str(s) for s in DEFAULT_SIZES),
+            help="Comma-separated input sizes in lines (default: %(default)s).",
+        )
+        parser.add_argument("--min-time", type=float, default=0.5, help="Seconds per case (default: %(default)s).")
+        parser.add_argument("--min-runs", type=int, default=5)
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+        parser.add_argument("--compare", metavar="BASELINE", help="Previous --output file to compare against.")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.1,
+            help="With --compare, fail if any case loses more than this fraction of ops/s (default: %(default)s).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(s) for s in options["sizes"].split(",") if s.strip()]
+        except ValueError:
+            raise CommandError("--sizes must be a comma-separated list of integers")
+        if not sizes or min(sizes) < 1:
+            raise CommandError("--sizes must be positive")
+
+        groups = options["group"] or GROUPS
+        corpora = options["corpus"] or CORPORA
+
+        setup_test_environment()
+        old_name = None
+        if {"split_syllables", "parallel"} & set(groups):  # both read the dictionary
+            old_name = connection.settings_dict["NAME"]
+            connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            reset_syllable_cache()
+            clear_pending()
+            # Every run posts the same body: measure the work, not the response cache
+            with override_settings(SYLLABLE_RESPONSE_CACHE_ENABLED=False):
+                results = run_cases(
+                    build_cases(groups, corpora, sizes),
+                    progress=self._report,
+                    min_runs=options["min_runs"],
+                    min_time=options["min_time"],
+                )
+        finally:
+            shutdown_pool()
+            if old_name is not None:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        if options["output"]:
+            save_report(
+                options["output"],
+                results,
+                {"groups": list(groups), "corpora": list(corpora), "sizes": sizes, "min_time": options["min_time"]},
+            )
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if options["compare"]:
+            try:
+                rows = compare(options["compare"], results, options["threshold"])
+            except (OSError, ValueError, KeyError) as exc:
+                raise CommandError(f"Can't read baseline: {exc}")
+            regressions = [row for row in rows if row["regression"]]
+            for row in rows:
+                line = f"{row['name']:<44} {row['ratio']:>7.2f}x"
+                self.stdout.write(self.style.ERROR(line) if row["regression"] else line)
+            if regressions:
+                raise CommandError(
+                    f"{len(regressions)} case(s) slower than baseline by more than {options['threshold']:.0%}"
+                )
+            self.stdout.write(self.style.SUCCESS(f"No regressions in {len(rows)} compared cases"))
+
+    def _report(self, result):
+        self.stdout.write(
+            f"{result['name']:<44} {result['ops_per_sec']:>12,.1f} ops/s  "
+            f"p50 {result['p50_us']:>10,.1f}us  p99 {result['p99_us']:>10,.1f}us  "
+            f"peak {result['peak_kib']:>9,.1f}KiB"
+        )
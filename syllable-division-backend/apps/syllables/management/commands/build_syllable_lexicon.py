@@ -0,0 +1,60 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.syllables.services.dictionary import current_rows
+from apps.syllables.services.languages import LANGUAGES, get_rules
+from apps.syllables.services.lexicon import Lexicon, build_lexicon, lexicon_path, reset_lexicons
+
+
+class Command(BaseCommand):
+    help = (
+        "Compile the Syllable table plus optional wordlists (one word per line, extra "
+        "columns ignored) into a read-only lexicon file that workers memory-map and share "
+        "(see apps/syllables/services/lexicon.py). Dictionary rows win over the rules, "
+        "curated rows over computed ones. Workers pick up a rebuilt file when they restart."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("wordlists", nargs="*", help="Word list files divided with the language rules.")
+        parser.add_argument("--lang", choices=list(LANGUAGES), help="Default: SYLLABLE_DEFAULT_LANG.")
+        parser.add_argument("--output", "-o", help="Default: <SYLLABLE_LEXICON_DIR>/<lang>.sylx.")
+        parser.add_argument("--no-dictionary", action="store_true", help="Only the wordlists, skip Syllable rows.")
+
+    def handle(self, *args, **options):
+        rules = get_rules(options["lang"])
+        output = options["output"] or lexicon_path(rules.code)
+        if not output:
+            raise CommandError("Pass --output or set SYLLABLE_LEXICON_DIR.")
+        started = time.perf_counter()
+
+        def entries():
+            for path in options["wordlists"]:
+                with open(path, encoding="utf-8") as fh:
+                    for line in fh:
+                        fields = line.split()
+                        if fields:
+                            yield fields[0], rules.divide(fields[0])
+            if not options["no_dictionary"]:
+                rows = (
+                    current_rows(rules.code)
+                    .order_by("source", "id")  # ascending: 'curated' rows come last and win
+                    .values_list("word", "syllables")
+                )
+                for word, sylls in rows.iterator(chunk_size=2000):
+                    if isinstance(sylls, list):
+                        yield word, sylls
+
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+            written = build_lexicon(output, entries())
+            Lexicon(output).close()  # fail here, not in the workers, if the file is unreadable
+        except (OSError, UnicodeDecodeError, ValueError) as exc:
+            raise CommandError(str(exc))
+        reset_lexicons()
+        size = os.path.getsize(output)
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {written:,} {rules.code} entries ({size / 1024 / 1024:.1f} MiB) to {output} "
+            f"in {time.perf_counter() - started:.2f}s"
+        ))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.syllables.models import Syllable
+from apps.syllables.services.dictionary_io import FORMATS, export_entries
+from apps.syllables.services.languages import LANGUAGES
+
+
+class Command(BaseCommand):
+    help = "Stream the Syllable dictionary to a CSV or JSONL file (same formats as import_syllables)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Output file ('-' writes to stdout).")
+        parser.add_argument("--format", choices=FORMATS, help="Default: from the file extension.")
+        parser.add_argument("--separator", default="-", help="Syllable separator in CSV files.")
+        parser.add_argument("--lang", choices=list(LANGUAGES), default="es", help="Language to export.")
+        parser.add_argument(
+            "--source",
+            choices=[Syllable.SOURCE_CURATED, Syllable.SOURCE_COMPUTED],
+            help="Only export curated or computed entries.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+        try:
+            fileobj = self.stdout if path == "-" else open(path, "w", encoding="utf-8", newline="")
+        except OSError as exc:
+            raise CommandError(str(exc))
+        try:
+            written = export_entries(
+                fileobj, fmt, lang=options["lang"], source=options["source"], separator=options["separator"]
+            )
+        finally:
+            if fileobj is not self.stdout:
+                fileobj.close()
+        if path != "-":
+            self.stdout.write(self.style.SUCCESS(f"Exported {written:,} entries to {path}"))
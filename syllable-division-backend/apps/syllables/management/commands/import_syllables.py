@@ -0,0 +1,77 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.syllables.models import Syllable
+from apps.syllables.services.dictionary_io import FORMATS, import_entries, iter_entries
+from apps.syllables.services.languages import LANGUAGES
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream a CSV (word,pa-la-bra) or JSONL ({\"word\", \"syllables\"}) file into the "
+        "Syllable dictionary with chunked upserts. Existing words are overwritten. "
+        "Running workers keep their cached words and rhyme index until they restart, and "
+        "their cached responses too unless the response cache is shared (Redis, Memcached): "
+        "restart them after an import."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import ('-' reads stdin).")
+        parser.add_argument("--format", choices=FORMATS, help="Default: from the file extension.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--separator", default="-", help="Syllable separator in CSV files.")
+        parser.add_argument("--lang", choices=list(LANGUAGES), default="es", help="Language of the entries.")
+        parser.add_argument(
+            "--source",
+            choices=[Syllable.SOURCE_CURATED, Syllable.SOURCE_COMPUTED],
+            default=Syllable.SOURCE_CURATED,
+        )
+        parser.add_argument(
+            "--no-validate",
+            action="store_true",
+            help="Accept rows whose syllables don't spell the word exactly.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+        skipped = []
+
+        def on_error(lineno, reason):
+            skipped.append(lineno)
+            if len(skipped) <= 20:
+                self.stderr.write(f"line {lineno}: {reason} (skipped)")
+
+        def progress(stats):
+            self.stderr.write(
+                f"  {stats['rows']:>10,} rows  {stats['rows_per_second']:>10,.0f} rows/s"
+            )
+
+        try:
+            fileobj = sys.stdin if path == "-" else open(path, encoding="utf-8", newline="")
+        except OSError as exc:
+            raise CommandError(str(exc))
+        with fileobj:
+            entries = iter_entries(
+                fileobj,
+                fmt,
+                separator=options["separator"],
+                validate=not options["no_validate"],
+                on_error=on_error,
+            )
+            stats = import_entries(
+                entries,
+                lang=options["lang"],
+                source=options["source"],
+                batch_size=options["batch_size"],
+                progress=progress,
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {stats['rows']:,} entries in {stats['batches']} batches, "
+            f"{stats['seconds']:.2f}s ({stats['rows_per_second']:,.0f} rows/s); "
+            f"skipped {len(skipped)} invalid rows"
+        ))
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.syllables.services.dictionary import preload
+from apps.syllables.services.syllable_cache import cache_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Preload the syllable dictionary (curated entries first) into the in-process cache. "
+        "Workers do the same at startup when SYLLABLE_DICTIONARY_PRELOAD is on; run this to "
+        "check how long the warmup takes and how much of the cache it fills."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Maximum number of entries to load (default: the cache capacity).",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        loaded = preload(limit=options["limit"])
+        elapsed = time.perf_counter() - started
+        stats = cache_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f"Loaded {loaded} entries in {elapsed:.2f}s "
+            f"(cache size {stats['size']}/{stats['capacity']})"
+        ))
@@ -0,0 +1,69 @@
+import multiprocessing
+import signal
+import threading
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from apps.syllables.services.jobs import purge_jobs, run_worker, run_worker_process
+
+
+class Command(BaseCommand):
+    help = (
+        "Process queued syllabify jobs (POST /api/syllables/jobs/) from the database queue "
+        "(see apps/syllables/services/jobs.py). Run as many commands or --processes as the "
+        "machine has cores to spare: workers share jobs document by document. Stops after "
+        "finishing the current documents on SIGTERM/Ctrl-C."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=1, help="Worker processes (default 1).")
+        parser.add_argument("--batch-size", type=int, default=4, help="Documents claimed at a time (default 4).")
+        parser.add_argument(
+            "--poll-interval", type=float, default=1.0, help="Seconds between polls of an empty queue (default 1).",
+        )
+        parser.add_argument("--once", action="store_true", help="Exit when the queue is empty (one process).")
+        parser.add_argument(
+            "--purge-days", type=float, default=None, help="First delete jobs finished more than this many days ago.",
+        )
+
+    def handle(self, *args, **options):
+        processes, batch_size = options["processes"], options["batch_size"]
+        if processes < 1 or batch_size < 1:
+            raise CommandError("--processes and --batch-size must be at least 1.")
+        if options["purge_days"] is not None:
+            purged = purge_jobs(timedelta(days=options["purge_days"]))
+            self.stdout.write(f"Purged {purged} finished jobs")
+
+        started = time.perf_counter()
+        if options["once"] or processes == 1:
+            stop = threading.Event()
+            signal.signal(signal.SIGTERM, lambda *_: stop.set())
+            try:
+                done = run_worker(batch_size, options["poll_interval"], stop, once=options["once"])
+            except KeyboardInterrupt:
+                return
+            self.stdout.write(self.style.SUCCESS(
+                f"Processed {done} documents in {time.perf_counter() - started:.2f}s"
+            ))
+            return
+
+        # spawn, not fork: each child opens its own database connection
+        connections.close_all()
+        context = multiprocessing.get_context("spawn")
+        children = [
+            context.Process(target=run_worker_process, args=(batch_size, options["poll_interval"]), name=f"syllable-jobs-{i}")
+            for i in range(processes)
+        ]
+        for child in children:
+            child.start()
+        signal.signal(signal.SIGTERM, lambda *_: [child.terminate() for child in children if child.is_alive()])
+        self.stdout.write(f"Started {processes} job worker processes")
+        try:
+            for child in children:
+                child.join()
+        except KeyboardInterrupt:  # the children got the SIGINT too
+            for child in children:
+                child.join()
@@ -0,0 +1,62 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from apps.syllables.services import instrumentation
+
+
+class SyllableMetricsMiddleware:
+    """Time every request, add a Server-Timing header with the stages recorded
+    through `instrumentation.span` and fold the request into the metrics
+    served by GET /api/syllables/metrics/. Works under WSGI and ASGI.
+
+    Streaming responses are recorded when the view returns: their lines are
+    produced later, so only the stages up to that point are included.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "SYLLABLE_METRICS_ENABLED", True)
+        self.server_timing = getattr(settings, "SYLLABLE_SERVER_TIMING", True)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+        metrics, token = instrumentation.begin_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            instrumentation.end_request(token)
+        return self._finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+        metrics, token = instrumentation.begin_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            instrumentation.end_request(token)
+        return self._finish(request, response, metrics)
+
+    def _finish(self, request, response, metrics):
+        total = time.perf_counter() - metrics.started
+        match = request.resolver_match
+        endpoint = match.url_name.removesuffix("_no_slash") if match and match.url_name else "unmatched"
+        try:
+            body_bytes = int(request.META.get("CONTENT_LENGTH") or 0)
+        except ValueError:
+            body_bytes = 0
+        instrumentation.record(endpoint, response.status_code, body_bytes, metrics, total)
+        if self.server_timing:
+            response["Server-Timing"] = metrics.server_timing(total)
+        return response
@@ -0,0 +1,27 @@
+# Generated by Django 4.2 on 2026-10-16 23:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Syllable',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('word', models.CharField(max_length=255, unique=True)),
+                ('syllables', models.JSONField()),
+                ('source', models.CharField(choices=[('curated', 'Curated'), ('computed', 'Computed')], default='curated', max_length=16)),
+            ],
+            options={
+                'verbose_name': 'Syllable',
+                'verbose_name_plural': 'Syllables',
+            },
+        ),
+    ]
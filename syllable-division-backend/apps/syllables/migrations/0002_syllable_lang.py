@@ -0,0 +1,27 @@
+# Generated by Django 4.2 on 2026-10-17 00:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('syllables', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='syllable',
+            name='lang',
+            field=models.CharField(default='es', max_length=8),
+        ),
+        migrations.AlterField(
+            model_name='syllable',
+            name='word',
+            field=models.CharField(max_length=255),
+        ),
+        migrations.AddConstraint(
+            model_name='syllable',
+            constraint=models.UniqueConstraint(fields=('word', 'lang'), name='syllable_word_lang_unique'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2 on 2026-10-17 00:29
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('syllables', '0002_syllable_lang'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyllabifyJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done')], default='queued', max_length=16)),
+                ('options', models.JSONField(default=dict)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('processed', models.PositiveIntegerField(default=0)),
+                ('failed', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Syllabify job',
+                'verbose_name_plural': 'Syllabify jobs',
+            },
+        ),
+        migrations.CreateModel(
+            name='SyllabifyJobDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.PositiveIntegerField()),
+                ('name', models.CharField(max_length=128)),
+                ('text', models.TextField()),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=16)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True, default='')),
+                ('claim', models.CharField(blank=True, default='', max_length=32)),
+                ('claimed_at', models.DateTimeField(blank=True, null=True)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='documents', to='syllables.syllabifyjob')),
+            ],
+            options={
+                'verbose_name': 'Syllabify job document',
+                'verbose_name_plural': 'Syllabify job documents',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='syllabifyjobdocument',
+            index=models.Index(fields=['status', 'id'], name='syllabify_job_doc_queue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='syllabifyjobdocument',
+            index=models.Index(fields=['claim'], name='syllabify_job_doc_claim_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='syllabifyjobdocument',
+            constraint=models.UniqueConstraint(fields=('job', 'index'), name='syllabify_job_document_index_unique'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2 on 2026-10-17 00:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('syllables', '0003_syllabify_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='syllable',
+            name='rules_version',
+            field=models.CharField(blank=True, default='', max_length=16),
+        ),
+    ]
@@ -1,12 +1,104 @@
+import uuid
+
 from django.db import models
 
 class Syllable(models.Model):
+    """Persistent syllabification dictionary entry.
+    Curated rows are corrections that win over the heuristic divider; computed
+    rows are heuristic results written back so workers don't recompute them.
+    """
+
+    SOURCE_CURATED = "curated"
+    SOURCE_COMPUTED = "computed"
+    SOURCE_CHOICES = [
+        (SOURCE_CURATED, "Curated"),
+        (SOURCE_COMPUTED, "Computed"),
+    ]
+
     word = models.CharField(max_length=255)
+    lang = models.CharField(max_length=8, default="es")
     syllables = models.JSONField()
+    source = models.CharField(max_length=16, choices=SOURCE_CHOICES, default=SOURCE_CURATED)
+    # SyllableRules.version a computed row was produced with
+    rules_version = models.CharField(max_length=16, blank=True, default="")
 
     def __str__(self):
         return self.word
 
     class Meta:
         verbose_name = 'Syllable'
-        verbose_name_plural = 'Syllables'
\ No newline at end of file
+        verbose_name_plural = 'Syllables'
+        constraints = [
+            models.UniqueConstraint(fields=["word", "lang"], name="syllable_word_lang_unique"),
+        ]
+
+class SyllabifyJob(models.Model):
+    """Batch of documents submitted to POST /api/syllables/jobs/ and processed
+    by background workers (see services/jobs.py).
+    """
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    options = models.JSONField(default=dict)
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)  # done + failed documents
+    failed = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return str(self.id)
+
+    class Meta:
+        verbose_name = 'Syllabify job'
+        verbose_name_plural = 'Syllabify jobs'
+
+
+class SyllabifyJobDocument(models.Model):
+    """One document of a SyllabifyJob: the unit of work claimed by a worker."""
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    job = models.ForeignKey(SyllabifyJob, on_delete=models.CASCADE, related_name="documents")
+    index = models.PositiveIntegerField()
+    name = models.CharField(max_length=128)
+    text = models.TextField()
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    claim = models.CharField(max_length=32, blank=True, default="")
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.job_id}:{self.index}"
+
+    class Meta:
+        verbose_name = 'Syllabify job document'
+        verbose_name_plural = 'Syllabify job documents'
+        constraints = [
+            models.UniqueConstraint(fields=["job", "index"], name="syllabify_job_document_index_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["status", "id"], name="syllabify_job_doc_queue_idx"),
+            models.Index(fields=["claim"], name="syllabify_job_doc_claim_idx"),
+        ]
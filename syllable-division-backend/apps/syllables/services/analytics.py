@@ -0,0 +1,367 @@
+import json
+import struct
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency: pure Python aggregation instead
+    np = None
+
+from apps.syllables.services.dictionary import LOOKUP_CHUNK_SIZE, dictionary_enabled, lookup
+from apps.syllables.services.languages import get_rules
+from apps.syllables.services.tokenizer import tokenize_compact
+
+
+# Offline syllable analytics over whole lyric catalogues (see the
+# analyze_corpus management command).
+#
+# Songs are streamed from text files (one song per file) or JSONL dumps
+# ({"id", "text"} per line) and tokenized in chunks of lines with the same word
+# rules as split-syllables. Every word becomes an integer id into a vocabulary,
+# so the corpus is held as flat integer arrays (word ids, line offsets, song
+# offsets). The distinct vocabulary is syllabified once (curated dictionary rows
+# first, then the language rules) and the per-line/per-song counts are computed
+# over those arrays: vectorized with NumPy when it is installed, with plain
+# loops otherwise (same results).
+#
+# Results go to a columnar file: magic, a JSON header describing each column
+# and the raw little-endian arrays, 8-byte aligned (see write_columns and
+# read_columns; np.frombuffer/np.memmap can map a column directly).
+
+MAGIC = b"SYLCOL1\n"
+
+# Characters of input text tokenized per call: bounds the per-chunk token lists
+CHUNK_CHARS = 1 << 20
+
+# dtype -> array typecode
+_TYPECODES = {"<u2": "H", "<u4": "I", "<u8": "Q", "<f4": "f", "<f8": "d"}
+
+Song = Tuple[str, Iterable[str]]
+
+
+def iter_songs(paths: Sequence[str], fmt: Optional[str] = None) -> Iterator[Song]:
+    """Yield (song_id, lines) for every song in paths (files, or directories
+    searched for *.txt / *.jsonl). Lines are read lazily; with fmt=None the
+    format comes from each file's extension.
+    """
+    for path in _expand(paths):
+        file_fmt = fmt or ("jsonl" if path.suffix in (".jsonl", ".ndjson") else "text")
+        if file_fmt == "text":
+            yield str(path), _read_lines(path)
+        elif file_fmt == "jsonl":
+            with open(path, encoding="utf-8") as fh:
+                for lineno, raw in enumerate(fh, start=1):
+                    if not raw.strip():
+                        continue
+                    record = json.loads(raw)
+                    song_id = str(record.get("id", f"{path}:{lineno}"))
+                    yield song_id, str(record.get("text", "")).splitlines(keepends=True)
+        else:
+            raise ValueError(f"Unknown format {file_fmt!r} (use 'text' or 'jsonl')")
+
+
+def _expand(paths: Sequence[str]) -> Iterator[Path]:
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            yield from sorted(p for p in path.rglob("*") if p.suffix in (".txt", ".jsonl", ".ndjson") and p.is_file())
+        else:
+            yield path
+
+
+def _read_lines(path: Path) -> Iterator[str]:
+    # Universal newlines: every line ends with '\n', so chunks split cleanly
+    with open(path, encoding="utf-8") as fh:
+        yield from fh
+
+
+class CorpusIndex:
+    """Songs as integer arrays: song s covers lines
+    song_offsets[s]:song_offsets[s + 1], line i covers tokens
+    line_offsets[i]:line_offsets[i + 1] and word_ids are ids into `vocabulary`.
+    Lines follow str.splitlines(), as in split-syllables.
+    """
+
+    def __init__(self, *, include_numbers: bool = True, keep_hyphens: bool = False, lower: bool = True, min_len: int = 1):
+        self.options = {
+            "include_numbers": include_numbers,
+            "keep_hyphens": keep_hyphens,
+            "lower": lower,
+            "min_len": min_len,
+        }
+        self.vocabulary: Dict[str, int] = {}  # word -> id, ids in insertion order
+        self.word_ids = array("I")
+        self.line_offsets = array("Q", [0])
+        self.song_offsets = array("Q", [0])
+        self.song_ids: List[str] = []
+
+    @property
+    def lines(self) -> int:
+        return len(self.line_offsets) - 1
+
+    @property
+    def tokens(self) -> int:
+        return len(self.word_ids)
+
+    def words(self) -> List[str]:
+        """Vocabulary ordered by id."""
+        return list(self.vocabulary)
+
+    def add_song(self, song_id: str, lines: Iterable[str]) -> None:
+        chunk: List[str] = []
+        size = 0
+        for line in lines:
+            chunk.append(line)
+            size += len(line)
+            if size >= CHUNK_CHARS:
+                self._add_chunk("".join(chunk))
+                chunk, size = [], 0
+        if chunk:
+            self._add_chunk("".join(chunk))
+        self.song_ids.append(song_id)
+        self.song_offsets.append(self.lines)
+
+    def _add_chunk(self, text: str) -> None:
+        _, texts, offsets = tokenize_compact(text, keep_punct=False, **self.options)
+        if self.options["keep_hyphens"]:
+            texts = [t.replace("-", "") for t in texts]
+        vocabulary = self.vocabulary
+        ids = [vocabulary.setdefault(word, len(vocabulary)) for word in texts]
+        base = len(self.word_ids)
+        self.word_ids.extend(ids)
+        self.line_offsets.extend(base + offset for offset in offsets[1:])
+
+
+def vocabulary_syllables(words: Sequence[str], lang: Optional[str] = None, use_dictionary: bool = True) -> array:
+    """Syllable count of each vocabulary word: curated/computed dictionary rows
+    when available, the language rules otherwise. Each word is divided once.
+    """
+    rules = get_rules(lang)
+    known: Dict[str, List[str]] = {}
+    if use_dictionary and dictionary_enabled():
+        for i in range(0, len(words), LOOKUP_CHUNK_SIZE * 20):
+            known.update(lookup(words[i:i + LOOKUP_CHUNK_SIZE * 20], rules.code))
+    divide = rules.divide
+    counts = array("H")
+    for word in words:
+        sylls = known.get(word)
+        counts.append(min(len(sylls if sylls is not None else divide(word)), 0xFFFF))
+    return counts
+
+
+def aggregate(index: CorpusIndex, word_syllables: array) -> Dict[str, Any]:
+    """Per-line and per-song columns:
+      line_words, line_syllables                          one value per line
+      song_lines, song_words, song_syllables              totals per song
+      song_verse_lines                                    lines with at least one word
+      song_syllables_mean/_std/_min/_max                  syllables per verse line
+    """
+    if np is not None:
+        return _aggregate_numpy(index, word_syllables)
+    return _aggregate_python(index, word_syllables)
+
+
+def _aggregate_numpy(index: CorpusIndex, word_syllables: array) -> Dict[str, Any]:
+    per_word = np.frombuffer(word_syllables, dtype=np.uint16).astype(np.uint32)
+    word_ids = np.frombuffer(index.word_ids, dtype=np.uint32)
+    line_offsets = np.frombuffer(index.line_offsets, dtype=np.uint64).astype(np.int64)
+    song_offsets = np.frombuffer(index.song_offsets, dtype=np.uint64).astype(np.int64)
+
+    # Segment sums as differences of a cumulative sum (empty segments give 0)
+    token_cum = np.concatenate(([0], np.cumsum(per_word[word_ids], dtype=np.int64)))
+    line_syllables = token_cum[line_offsets[1:]] - token_cum[line_offsets[:-1]]
+    line_words = np.diff(line_offsets)
+
+    verse = line_words > 0
+    starts, ends = song_offsets[:-1], song_offsets[1:]
+
+    def song_sum(values):
+        cum = np.concatenate(([0], np.cumsum(values, dtype=np.float64)))
+        return cum[ends] - cum[starts]
+
+    song_lines = ends - starts
+    song_verse = song_sum(verse)
+    song_syllables = song_sum(line_syllables)
+    song_sq = song_sum(line_syllables.astype(np.float64) ** 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(song_verse > 0, song_syllables / song_verse, 0.0)
+        var = np.where(song_verse > 0, song_sq / song_verse - mean ** 2, 0.0)
+
+    # Min/max over verse lines only: non-verse lines become neutral values
+    # and empty songs are masked out (reduceat needs non-empty segments)
+    has_lines = song_lines > 0
+    song_min = np.zeros(len(song_lines), dtype=np.int64)
+    song_max = np.zeros(len(song_lines), dtype=np.int64)
+    if has_lines.any():
+        seg = starts[has_lines]
+        big = np.iinfo(np.int64).max
+        song_min[has_lines] = np.minimum.reduceat(np.where(verse, line_syllables, big), seg)
+        song_max[has_lines] = np.maximum.reduceat(np.where(verse, line_syllables, 0), seg)
+        song_min[song_min == big] = 0
+
+    return {
+        "line_words": line_words.astype(np.uint32),
+        "line_syllables": line_syllables.astype(np.uint32),
+        "song_lines": song_lines.astype(np.uint32),
+        "song_verse_lines": song_verse.astype(np.uint32),
+        "song_words": song_sum(line_words).astype(np.uint64),
+        "song_syllables": song_syllables.astype(np.uint64),
+        "song_syllables_mean": mean.astype(np.float32),
+        "song_syllables_std": np.sqrt(np.maximum(var, 0.0)).astype(np.float32),
+        "song_syllables_min": song_min.astype(np.uint32),
+        "song_syllables_max": song_max.astype(np.uint32),
+    }
+
+
+def _aggregate_python(index: CorpusIndex, word_syllables: array) -> Dict[str, Any]:
+    word_ids, line_offsets, song_offsets = index.word_ids, index.line_offsets, index.song_offsets
+    line_words = array("I")
+    line_syllables = array("I")
+    for i in range(len(line_offsets) - 1):
+        start, end = line_offsets[i], line_offsets[i + 1]
+        line_words.append(end - start)
+        line_syllables.append(sum(word_syllables[w] for w in word_ids[start:end]))
+
+    columns: Dict[str, array] = {
+        "line_words": line_words,
+        "line_syllables": line_syllables,
+        "song_lines": array("I"),
+        "song_verse_lines": array("I"),
+        "song_words": array("Q"),
+        "song_syllables": array("Q"),
+        "song_syllables_mean": array("f"),
+        "song_syllables_std": array("f"),
+        "song_syllables_min": array("I"),
+        "song_syllables_max": array("I"),
+    }
+    for s in range(len(song_offsets) - 1):
+        start, end = song_offsets[s], song_offsets[s + 1]
+        verse = [line_syllables[i] for i in range(start, end) if line_words[i]]
+        total = sum(verse)
+        mean = total / len(verse) if verse else 0.0
+        var = sum(v * v for v in verse) / len(verse) - mean * mean if verse else 0.0
+        columns["song_lines"].append(end - start)
+        columns["song_verse_lines"].append(len(verse))
+        columns["song_words"].append(sum(line_words[start:end]))
+        columns["song_syllables"].append(total)
+        columns["song_syllables_mean"].append(mean)
+        columns["song_syllables_std"].append(max(var, 0.0) ** 0.5)
+        columns["song_syllables_min"].append(min(verse, default=0))
+        columns["song_syllables_max"].append(max(verse, default=0))
+    return columns
+
+
+def analyze_corpus(
+    songs: Iterable[Song],
+    *,
+    lang: Optional[str] = None,
+    use_dictionary: bool = True,
+    progress: Optional[Callable[[CorpusIndex], None]] = None,
+    **word_options,
+) -> Tuple[CorpusIndex, Dict[str, Any], Dict[str, Any]]:
+    """Index, syllabify and aggregate songs. Returns (index, columns, stats);
+    progress(index) is called after every song.
+    """
+    timings = {}
+    started = time.perf_counter()
+    index = CorpusIndex(**word_options)
+    for song_id, lines in songs:
+        index.add_song(song_id, lines)
+        if progress is not None:
+            progress(index)
+    timings["tokenize"] = time.perf_counter() - started
+
+    mark = time.perf_counter()
+    word_syllables = vocabulary_syllables(index.words(), lang, use_dictionary)
+    timings["syllabify"] = time.perf_counter() - mark
+
+    mark = time.perf_counter()
+    columns = aggregate(index, word_syllables)
+    timings["aggregate"] = time.perf_counter() - mark
+
+    total = time.perf_counter() - started
+    stats = {
+        "songs": len(index.song_ids),
+        "lines": index.lines,
+        "tokens": index.tokens,
+        "vocabulary": len(index.vocabulary),
+        "lang": get_rules(lang).code,
+        "backend": "numpy" if np is not None else "python",
+        "seconds": {name: round(value, 3) for name, value in timings.items()},
+        "lines_per_second": round(index.lines / total, 1) if total else 0.0,
+    }
+    return index, columns, stats
+
+
+def _dtype(column) -> str:
+    if np is not None and isinstance(column, np.ndarray):
+        return column.dtype.newbyteorder("<").str
+    return {"H": "<u2", "I": "<u4", "L": "<u8", "Q": "<u8", "f": "<f4", "d": "<f8"}[column.typecode]
+
+
+def write_columns(path: str, columns: Dict[str, Any], meta: Dict[str, Any]) -> int:
+    """Write columns (numpy arrays or array.array) plus JSON metadata. Returns bytes written."""
+    entries = []
+    offset = 0
+    for name, column in columns.items():
+        dtype = _dtype(column)
+        nbytes = len(column) * int(dtype[2:])
+        entries.append({"name": name, "dtype": dtype, "length": len(column), "offset": offset})
+        offset += -(-nbytes // 8) * 8
+    header = json.dumps({"columns": entries, "meta": meta}, ensure_ascii=False).encode("utf-8")
+    header += b" " * (-(len(MAGIC) + 8 + len(header)) % 8)
+
+    with open(path, "wb") as fh:
+        fh.write(MAGIC)
+        fh.write(struct.pack("<Q", len(header)))
+        fh.write(header)
+        for entry, column in zip(entries, columns.values()):
+            data = _to_bytes(column, entry["dtype"])
+            fh.write(data)
+            fh.write(b"\0" * (-len(data) % 8))
+        return fh.tell()
+
+
+def _to_bytes(column, dtype: str) -> bytes:
+    if np is not None and isinstance(column, np.ndarray):
+        return np.ascontiguousarray(column, dtype=dtype).tobytes()
+    column = column if column.typecode == _TYPECODES[dtype] else array(_TYPECODES[dtype], column)
+    if column.itemsize != int(dtype[2:]):
+        raise ValueError(f"array typecode {column.typecode!r} isn't {dtype} on this platform")
+    if struct.pack("=H", 1) != struct.pack("<H", 1):
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def read_columns(path: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Return (meta, {name: column}). Columns are read-only numpy arrays mapped
+    from the file when NumPy is installed, array.array otherwise.
+    """
+    with open(path, "rb") as fh:
+        if fh.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a syllable columns file")
+        (size,) = struct.unpack("<Q", fh.read(8))
+        header = json.loads(fh.read(size))
+        base = fh.tell()
+        columns = {}
+        for entry in header["columns"]:
+            dtype, length = entry["dtype"], entry["length"]
+            if np is not None and length:
+                columns[entry["name"]] = np.memmap(
+                    path, dtype=dtype, mode="r", offset=base + entry["offset"], shape=(length,)
+                )
+            elif np is not None:
+                columns[entry["name"]] = np.zeros(0, dtype=dtype)
+            else:
+                fh.seek(base + entry["offset"])
+                column = array(_TYPECODES[dtype])
+                column.frombytes(fh.read(length * column.itemsize))
+                if struct.pack("=H", 1) != struct.pack("<H", 1):
+                    column.byteswap()
+                columns[entry["name"]] = column
+    return header["meta"], columns
+
@@ -0,0 +1,21 @@
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from apps.syllables.services.syllable_divider import divide_words
+
+
+# Batch syllabification: the editor sends every word of a verse at once instead
+# of one `divide/` request per word. Words are deduplicated before dividing, so
+# each distinct word is syllabified (or looked up in the cache) exactly once.
+
+
+def divide_distinct(words: Iterable[str], lang: Optional[str] = None) -> Dict[str, List[str]]:
+    """Return {word: syllables} for each distinct word, in first-occurrence order."""
+    return divide_words(words, lang)
+
+
+def divide_batch(words: Sequence[str], lang: Optional[str] = None) -> List[List[str]]:
+    """Return the syllables of each word, aligned with the input order
+    (repeated words map to the same result).
+    """
+    distinct = divide_words(words, lang)
+    return [distinct[word] for word in words]
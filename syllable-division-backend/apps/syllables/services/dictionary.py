@@ -0,0 +1,310 @@
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Q
+
+from apps.syllables.services.languages import LANGUAGES, get_rules
+from apps.syllables.services.lexicon import get_lexicon
+from apps.syllables.services.syllable_cache import get_syllable_cache
+
+
+# Persistent syllabification dictionary backed by the Syllable model.
+#
+# Resolution order for a word: in-process LRU cache -> memory-mapped lexicon
+# (when built, see lexicon.py) -> Syllable table -> heuristic engine. Curated
+# rows therefore win over the heuristic, and words the heuristic
+# had to compute are written back in bulk (source='computed') so other workers
+# and future restarts don't recompute them. `preload` warms the cache from the
+# table at worker start (see config/wsgi.py and the preload_syllables command).
+#
+# Computed rows are tagged with the SyllableRules.version that produced them and
+# only used while it matches, so a rules fix reaches words computed before it
+# (the stale row is replaced at the next writeback). Writeback stops once the
+# table holds SYLLABLE_DICTIONARY_MAX_COMPUTED computed rows.
+#
+# Entries are per language: rows carry a `lang` code and cache keys are
+# (lang, word) tuples, so e.g. Spanish and Italian 'piano' never mix.
+
+logger = logging.getLogger(__name__)
+
+# Stay under SQLite's default limit of host parameters per query.
+LOOKUP_CHUNK_SIZE = 500
+# Syllable.word max_length: longer tokens are never written back
+MAX_WORD_LENGTH = 255
+# Seconds between recounts of the computed rows against the writeback cap
+COMPUTED_RECOUNT_SECONDS = 60
+
+_pending: Dict[Tuple[str, str], List[str]] = {}
+_pending_lock = threading.Lock()
+_computed_rows: Optional[int] = None
+_computed_counted_at = 0.0
+
+
+def dictionary_enabled() -> bool:
+    return settings.configured and getattr(settings, "SYLLABLE_DICTIONARY_ENABLED", True)
+
+
+def writeback_enabled() -> bool:
+    return dictionary_enabled() and getattr(settings, "SYLLABLE_DICTIONARY_WRITEBACK", True)
+
+
+def current_filter(lang: Optional[str] = None) -> Q:
+    """Rows to use for lang (every language when None): curated rows and the
+    computed rows of the current rules.
+    """
+    from apps.syllables.models import Syllable
+
+    rules = [get_rules(lang)] if lang else LANGUAGES.values()
+    computed = Q()
+    for r in rules:
+        computed |= Q(lang=r.code, rules_version=r.version)
+    curated = Q(source=Syllable.SOURCE_CURATED)
+    if lang:
+        curated &= Q(lang=lang)
+    return curated | (Q(source=Syllable.SOURCE_COMPUTED) & computed)
+
+
+def current_rows(lang: str):
+    """Syllable rows of lang that win over the rules (see current_filter)."""
+    from apps.syllables.models import Syllable
+
+    return Syllable.objects.filter(current_filter(lang))
+
+
+def lookup(words: Iterable[str], lang: str) -> Dict[str, List[str]]:
+    """Fetch dictionary entries for words (one query per chunk of words)."""
+    words = list(words)
+    found: Dict[str, List[str]] = {}
+    try:
+        for i in range(0, len(words), LOOKUP_CHUNK_SIZE):
+            chunk = words[i:i + LOOKUP_CHUNK_SIZE]
+            rows = current_rows(lang).filter(word__in=chunk).values_list("word", "syllables")
+            for word, sylls in rows:
+                if isinstance(sylls, list):
+                    found[word] = sylls
+    except DatabaseError:
+        # Never fail a request because the dictionary is unavailable; fall back to the heuristic.
+        logger.warning("Syllable dictionary lookup failed", exc_info=True)
+    return found
+
+
+def resolve_words(words: Iterable[str], lang: Optional[str] = None, *, copy: bool = True) -> Dict[str, List[str]]:
+    """Return {word: syllables} for each distinct word, in first-occurrence order,
+    with the rules of `lang` (SYLLABLE_DEFAULT_LANG when None).
+    Cache misses are looked up in the lexicon, then in the dictionary with a
+    single query, and only the remaining words run through the heuristic. With copy=False the values
+    are the shared (cached) tuples, for callers that only read them.
+    """
+    rules = get_rules(lang)
+    lang = rules.code
+    cache = get_syllable_cache()
+    out: Dict[str, Optional[List[str]]] = dict.fromkeys(words)
+    misses = []
+    for word in out:
+        if not word:
+            out[word] = []
+            continue
+        hit = cache.get((lang, word))
+        if hit is None:
+            misses.append(word)
+        else:
+            out[word] = list(hit) if copy else hit
+
+    misses = _from_lexicon(misses, lang, out, copy)
+    if misses:
+        found = lookup(misses, lang) if dictionary_enabled() else {}
+        computed = {}
+        for word in misses:
+            sylls = found.get(word)
+            if sylls is None:
+                sylls = computed[word] = rules.divide(word)
+            shared = tuple(sylls)
+            cache.put((lang, word), shared)
+            out[word] = list(sylls) if copy else shared
+        if computed and writeback_enabled():
+            queue_writeback(computed, lang)
+    return out
+
+
+def _from_lexicon(words: List[str], lang: str, out: Dict, copy: bool) -> List[str]:
+    # Fill `out` (and the cache) from the lexicon; returns the words it doesn't have.
+    lexicon = get_lexicon(lang)
+    if lexicon is None or not words:
+        return words
+    cache = get_syllable_cache()
+    rest = []
+    for word in words:
+        hit = lexicon.get(word)
+        if hit is None:
+            rest.append(word)
+        else:
+            cache.put((lang, word), hit)
+            out[word] = list(hit) if copy else hit
+    return rest
+
+
+def reconcile(computed: Dict[str, List[str]], lang: Optional[str] = None) -> Dict[str, List[str]]:
+    """Check words the heuristic syllabified outside this process (the parallel
+    workers never touch the database) against the cache, the lexicon and the
+    dictionary.
+    Returns {word: syllables} for the words whose resolved syllables differ;
+    the rest are cached and queued for writeback as `resolve_words` would.
+    """
+    lang = get_rules(lang).code
+    cache = get_syllable_cache()
+    overrides: Dict[str, List[str]] = {}
+    misses = []
+    for word, sylls in computed.items():
+        if not word:
+            continue
+        hit = cache.get((lang, word))
+        if hit is None:
+            misses.append(word)
+        elif list(hit) != sylls:
+            overrides[word] = list(hit)
+
+    known: Dict[str, Tuple[str, ...]] = {}
+    misses = _from_lexicon(misses, lang, known, False)
+    for word, hit in known.items():
+        if list(hit) != computed[word]:
+            overrides[word] = list(hit)
+    if misses:
+        found = lookup(misses, lang) if dictionary_enabled() else {}
+        new = {}
+        for word in misses:
+            sylls = found.get(word)
+            if sylls is None:
+                sylls = new[word] = computed[word]
+            elif sylls != computed[word]:
+                overrides[word] = sylls
+            cache.put((lang, word), tuple(sylls))
+        if new and writeback_enabled():
+            queue_writeback(new, lang)
+    return overrides
+
+
+def queue_writeback(entries: Dict[str, List[str]], lang: str) -> None:
+    """Buffer newly computed words; they are flushed in bulk after the response
+    (see `flush_writeback`), not inside the request path.
+    """
+    max_pending = getattr(settings, "SYLLABLE_DICTIONARY_MAX_PENDING", 10000)
+    with _pending_lock:
+        for word, sylls in entries.items():
+            if len(_pending) >= max_pending:
+                break
+            # One over-long token would fail (PostgreSQL) the whole batch insert
+            if len(word) <= MAX_WORD_LENGTH:
+                _pending[(lang, word)] = sylls
+
+
+def _writeback_room() -> int:
+    # Computed rows the table may still take, recounted every COMPUTED_RECOUNT_SECONDS
+    global _computed_rows, _computed_counted_at
+    from apps.syllables.models import Syllable
+
+    now = time.monotonic()
+    if _computed_rows is None or now - _computed_counted_at > COMPUTED_RECOUNT_SECONDS:
+        _computed_rows = Syllable.objects.filter(source=Syllable.SOURCE_COMPUTED).count()
+        _computed_counted_at = now
+    return getattr(settings, "SYLLABLE_DICTIONARY_MAX_COMPUTED", 200000) - _computed_rows
+
+
+def flush_writeback(**_kwargs) -> int:
+    """Insert buffered computed words, replacing computed rows of older rules;
+    curated rows are left alone. Connected to `request_finished`, so it runs
+    once the response has been sent.
+    """
+    global _computed_rows
+    from apps.syllables.models import Syllable
+
+    with _pending_lock:
+        if not _pending:
+            return 0
+        entries = list(_pending.items())
+        _pending.clear()
+    try:
+        by_lang: Dict[str, List[str]] = {}
+        for lang, word in (key for key, _ in entries):
+            by_lang.setdefault(lang, []).append(word)
+        for lang, words in by_lang.items():
+            for i in range(0, len(words), LOOKUP_CHUNK_SIZE):
+                Syllable.objects.filter(
+                    source=Syllable.SOURCE_COMPUTED, lang=lang, word__in=words[i:i + LOOKUP_CHUNK_SIZE],
+                ).exclude(rules_version=get_rules(lang).version).delete()
+        with _pending_lock:
+            entries = entries[:max(0, _writeback_room())]
+            if not entries:
+                return 0
+            _computed_rows += len(entries)  # an estimate: conflicting rows are skipped
+        Syllable.objects.bulk_create(
+            [
+                Syllable(
+                    word=word, lang=lang, syllables=sylls,
+                    source=Syllable.SOURCE_COMPUTED, rules_version=get_rules(lang).version,
+                )
+                for (lang, word), sylls in entries
+            ],
+            batch_size=LOOKUP_CHUNK_SIZE,
+            ignore_conflicts=True,
+        )
+    except DatabaseError:
+        logger.warning("Syllable dictionary writeback failed", exc_info=True)
+        return 0
+    return len(entries)
+
+
+def clear_pending() -> None:
+    global _computed_rows
+    with _pending_lock:
+        _pending.clear()
+        _computed_rows = None
+
+
+def preload(limit: Optional[int] = None) -> int:
+    """Load dictionary entries into the in-process cache, curated rows first.
+    Defaults to filling the cache up to its capacity. Returns the number loaded.
+    """
+    from apps.syllables.models import Syllable
+
+    cache = get_syllable_cache()
+    if limit is None:
+        limit = cache.capacity
+    if limit <= 0:
+        return 0
+    rows = (
+        Syllable.objects.filter(current_filter())
+        .order_by("-source", "-id")  # descending: 'curated' before 'computed'
+        .values_list("lang", "word", "syllables")[:limit]
+    )
+    loaded = 0
+    for lang, word, sylls in rows.iterator(chunk_size=2000):
+        cache.put((lang, word), tuple(sylls))
+        loaded += 1
+    return loaded
+
+
+def warm_start() -> None:
+    """Preload the cache when SYLLABLE_DICTIONARY_PRELOAD is on (called from wsgi/asgi)."""
+    if not (dictionary_enabled() and getattr(settings, "SYLLABLE_DICTIONARY_PRELOAD", False)):
+        return
+    started = time.perf_counter()
+    try:
+        loaded = preload()
+    except DatabaseError:
+        logger.warning("Syllable dictionary preload failed", exc_info=True)
+        return
+    logger.info("Preloaded %d syllable entries in %.2fs", loaded, time.perf_counter() - started)
+
+
+def invalidate(word: str, lang: str) -> None:
+    """Forget a cached word so the next lookup sees the current dictionary row
+    (also over the lexicon entry, which was compiled before the change).
+    """
+    get_syllable_cache().discard((lang, word))
+    lexicon = get_lexicon(lang)
+    if lexicon is not None:
+        lexicon.mark_stale(word)
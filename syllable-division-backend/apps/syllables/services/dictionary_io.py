@@ -0,0 +1,166 @@
+import csv
+import json
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from django.db import transaction
+
+from apps.syllables.models import Syllable
+from apps.syllables.services.languages import get_rules
+from apps.syllables.services.response_cache import bump_generation
+
+
+# Bulk import/export of the syllable dictionary (see the import_syllables and
+# export_syllables management commands).
+#
+# Formats:
+#   csv    word,syllables            e.g. palabra,pa-la-bra   (header optional)
+#   jsonl  {"word": "palabra", "syllables": ["pa", "la", "bra"]}   one per line
+#
+# Files are streamed: rows are parsed lazily and upserted in chunks, one
+# transaction per chunk, so memory stays flat for lexicons of any size. A file
+# holds one language (the `lang` argument, Spanish by default).
+
+FORMATS = ("csv", "jsonl")
+
+Entry = Tuple[str, List[str]]
+
+
+class InvalidEntry(ValueError):
+    pass
+
+
+def _check(word, sylls, validate: bool) -> Entry:
+    if not isinstance(word, str) or not word:
+        raise InvalidEntry("missing word")
+    if not isinstance(sylls, list) or not sylls or not all(isinstance(s, str) and s for s in sylls):
+        raise InvalidEntry(f"invalid syllables for {word!r}")
+    if validate and "".join(sylls) != word:
+        raise InvalidEntry(f"syllables of {word!r} don't spell the word")
+    return word, sylls
+
+
+def iter_entries(
+    fileobj: TextIO,
+    fmt: str,
+    *,
+    separator: str = "-",
+    validate: bool = True,
+    on_error: Optional[Callable[[int, str], None]] = None,
+) -> Iterator[Entry]:
+    """Parse (word, syllables) entries from a CSV or JSONL stream.
+    Invalid rows are skipped and reported through on_error(line_number, reason).
+    """
+    if fmt == "csv":
+        rows = ((i, row) for i, row in enumerate(csv.reader(fileobj), start=1))
+    elif fmt == "jsonl":
+        rows = ((i, line) for i, line in enumerate(fileobj, start=1) if line.strip())
+    else:
+        raise ValueError(f"Unknown format {fmt!r} (use one of {', '.join(FORMATS)})")
+
+    for lineno, row in rows:
+        try:
+            if fmt == "csv":
+                if len(row) < 2:
+                    raise InvalidEntry("expected word,syllables")
+                word, raw = row[0].strip(), row[1].strip()
+                if lineno == 1 and word.lower() == "word":
+                    continue  # header
+                sylls = json.loads(raw) if raw.startswith("[") else raw.split(separator)
+            else:
+                obj = json.loads(row)
+                word, sylls = obj.get("word"), obj.get("syllables")
+            yield _check(word, sylls, validate)
+        except (InvalidEntry, ValueError, AttributeError) as exc:
+            if on_error is not None:
+                on_error(lineno, str(exc))
+
+
+def import_entries(
+    entries: Iterable[Entry],
+    *,
+    lang: str = "es",
+    source: str = Syllable.SOURCE_CURATED,
+    batch_size: int = 5000,
+    progress: Optional[Callable[[Dict[str, float]], None]] = None,
+) -> Dict[str, float]:
+    """Upsert entries in chunks of batch_size (insert new words, overwrite existing ones).
+    Returns throughput stats; progress(stats) is called after every chunk.
+    """
+    stats = {"rows": 0, "batches": 0, "seconds": 0.0, "rows_per_second": 0.0}
+    started = time.perf_counter()
+
+    # Imported computed rows count as results of the current rules
+    version = get_rules(lang).version if source == Syllable.SOURCE_COMPUTED else ""
+
+    def flush(batch: Dict[str, List[str]]):
+        with transaction.atomic():
+            Syllable.objects.bulk_create(
+                [
+                    Syllable(word=w, lang=lang, syllables=s, source=source, rules_version=version)
+                    for w, s in batch.items()
+                ],
+                update_conflicts=True,
+                unique_fields=["word", "lang"],
+                update_fields=["syllables", "source", "rules_version"],
+            )
+        stats["rows"] += len(batch)
+        stats["batches"] += 1
+        stats["seconds"] = time.perf_counter() - started
+        stats["rows_per_second"] = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+        if progress is not None:
+            progress(stats)
+
+    # A dict per chunk: a word repeated inside one chunk can't be upserted twice
+    # in the same statement (last occurrence wins).
+    batch: Dict[str, List[str]] = {}
+    for word, sylls in entries:
+        batch[word] = sylls
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = {}
+    if batch:
+        flush(batch)
+    if stats["rows"]:
+        # Bulk upserts send no post_save, so running workers aren't told. This only
+        # retires their cached responses when SYLLABLE_RESPONSE_CACHE_ALIAS is a
+        # shared cache (Redis, Memcached); their word caches and rhyme indexes keep
+        # the old rows until they restart.
+        bump_generation()
+    stats["seconds"] = time.perf_counter() - started
+    return stats
+
+
+def export_entries(
+    fileobj: TextIO,
+    fmt: str,
+    *,
+    lang: str = "es",
+    source: Optional[str] = None,
+    separator: str = "-",
+    chunk_size: int = 5000,
+) -> int:
+    """Stream the rows of one language (ordered by word) to fileobj. Returns the row count."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r} (use one of {', '.join(FORMATS)})")
+    qs = Syllable.objects.filter(lang=lang).order_by("word")
+    if source:
+        qs = qs.filter(source=source)
+    rows = qs.values_list("word", "syllables").iterator(chunk_size=chunk_size)
+
+    written = 0
+    if fmt == "csv":
+        writer = csv.writer(fileobj)
+        writer.writerow(["word", "syllables"])
+        for word, sylls in rows:
+            # Fall back to a JSON list when a syllable contains the separator
+            joined = separator.join(sylls)
+            if any(separator in s for s in sylls):
+                joined = json.dumps(sylls, ensure_ascii=False)
+            writer.writerow([word, joined])
+            written += 1
+    else:
+        for word, sylls in rows:
+            fileobj.write(json.dumps({"word": word, "syllables": sylls}, ensure_ascii=False) + "\n")
+            written += 1
+    return written
@@ -0,0 +1,186 @@
+import threading
+import uuid
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+from apps.syllables.services.limits import check_document
+from apps.syllables.services.meter import line_meter, meter_payload
+from apps.syllables.services.syllable_cache import LRUCache
+from apps.syllables.services.text_syllabifier import LineResult, SyllabifyCounts, iter_syllabified_lines
+
+
+# Incremental split-syllables for live editing.
+#
+# The client opens a document once with its full text and options. The server
+# keeps the per-line results in a bounded in-process store. After that the
+# client only sends the line ranges it changed along with the version it
+# edited, and gets back the recomputed lines as a patch plus the updated totals.
+# Work per keystroke is then proportional to the edit.
+#
+# The store lives in each worker process: an unknown document (evicted, or
+# opened on another worker) or a version mismatch raises DocumentConflict
+# (-> 409) and the client reopens the document with its full text.
+#
+# Document ids are always generated here (random UUIDs), never chosen by the
+# client, so nobody can replace or patch another client's document. Edits are
+# held to the same line/word/byte limits as opening a document, so a document
+# can't grow past them one patch at a time. Besides the number of documents
+# (SYLLABLE_INCREMENTAL_MAX_DOCS), the store bounds their total size in
+# characters (SYLLABLE_INCREMENTAL_MAX_CHARS): per-line results take roughly
+# 80 bytes of memory per character of text, so the least recently used
+# documents are evicted to stay under it.
+
+ENDPOINT = "split_and_syllabify_incremental"
+
+# Everything str.splitlines() breaks on
+_LINE_BREAKS = frozenset("\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029")
+
+
+class DocumentConflict(Exception):
+    def __init__(self, message: str, version: Optional[int] = None):
+        super().__init__(message)
+        self.version = version
+
+
+class InvalidChange(ValueError):
+    pass
+
+
+class Document:
+    __slots__ = ("doc_id", "options", "version", "lines", "counts", "size", "lock")
+
+    def __init__(self, doc_id: str, options: Dict[str, Any]):
+        self.doc_id = doc_id
+        self.options = options
+        self.version = 0
+        self.lines: List[LineResult] = []
+        self.counts = SyllabifyCounts(keep_per_line=False)
+        self.size = 0  # characters of the text with line breaks: a lower bound of its bytes
+        self.lock = threading.Lock()
+
+    def totals(self) -> Dict[str, Any]:
+        return self.counts.as_dict()
+
+
+def _empty_line(metric: bool = False) -> LineResult:
+    return LineResult(0, 0, 0, [], 0, meter=line_meter(()) if metric else None)
+
+
+def syllabify_lines(lines: Sequence[str], options: Dict[str, Any]) -> List[LineResult]:
+    """Syllabify standalone lines (no line breaks inside), one result per line."""
+    if not lines:
+        return []
+    results = list(iter_syllabified_lines("\n".join(lines), **options))
+    # A trailing empty line doesn't produce a result ("a\n" is a single line)
+    while len(results) < len(lines):
+        results.append(_empty_line(options.get("metric", False)))
+    return results
+
+
+def _line_size(line: LineResult) -> int:
+    return line.end - line.start + 1  # the span leaves out the line break
+
+
+def line_payload(line: LineResult) -> Dict[str, Any]:
+    payload = {"items": line.items, "syllables": line.syllables}
+    if line.meter is not None:
+        payload["meter"] = meter_payload(line.meter)
+    return payload
+
+
+class DocumentStore:
+    def __init__(self, capacity: int, max_chars: int = 0):
+        self._docs = LRUCache(capacity, max_weight=max_chars)
+
+    def open(self, text: str, options: Dict[str, Any]) -> Document:
+        """Create a document from its full text, at version 1, under a new id."""
+        doc = Document(uuid.uuid4().hex, options)
+        doc.lines = list(iter_syllabified_lines(text, doc.counts, **options))
+        doc.size = len(text)
+        doc.version = 1
+        self._docs.put(doc.doc_id, doc, weight=doc.size)
+        return doc
+
+    def apply(self, doc_id: str, version: int, changes: List[Dict[str, Any]]) -> Tuple[Document, List[Dict[str, Any]]]:
+        """Apply changes made on top of `version`, in order. Each change replaces
+        lines [start, end) of the document as it is after the previous changes
+        with `lines`. Returns the document (at version + 1) and the patch:
+        one {start, delete, lines: [{items, syllables}]} entry per change.
+        Raises RequestTooLarge, leaving the document untouched, when the result
+        exceeds the endpoint limits.
+        """
+        doc = self._docs.get(doc_id)
+        if doc is None:
+            raise DocumentConflict("Documento desconocido, reenvíe el texto completo")
+        parsed = [_parse_change(change) for change in changes]
+        with doc.lock:
+            if doc.version != version:
+                raise DocumentConflict("Versión desactualizada, reenvíe el texto completo", doc.version)
+            # Work on copies: a bad change further down leaves the document untouched
+            lines = list(doc.lines)
+            counts = SyllabifyCounts(keep_per_line=False)
+            counts.merge(doc.counts)
+            size = doc.size
+            patch = []
+            for start, end, new_text in parsed:
+                if end > len(lines):
+                    raise InvalidChange(f"Rango de líneas fuera del documento ({start}-{end} de {len(lines)})")
+                new_lines = syllabify_lines(new_text, doc.options)
+                for old in lines[start:end]:
+                    counts.remove_line(old)
+                    size -= _line_size(old)
+                size += sum(len(line) + 1 for line in new_text)
+                for line in new_lines:
+                    counts.add_line(line)
+                lines[start:end] = new_lines
+                patch.append({"start": start, "delete": end - start, "lines": [line_payload(l) for l in new_lines]})
+            check_document(len(lines), counts.words, size, ENDPOINT)
+            # Commit only once every change applied cleanly
+            doc.lines = lines
+            doc.counts = counts
+            doc.size = size
+            doc.version += 1
+        self._docs.put(doc.doc_id, doc, weight=doc.size)
+        return doc, patch
+
+    def discard(self, doc_id: str) -> None:
+        self._docs.discard(doc_id)
+
+    def stats(self) -> Dict[str, object]:
+        return self._docs.stats()
+
+
+def _parse_change(change: Any) -> Tuple[int, int, List[str]]:
+    if not isinstance(change, dict):
+        raise InvalidChange("Cada cambio debe ser un objeto {start, end, lines}")
+    start, end, lines = change.get("start"), change.get("end"), change.get("lines", [])
+    if any(isinstance(n, bool) or not isinstance(n, int) for n in (start, end)) or not 0 <= start <= end:
+        raise InvalidChange("'start' y 'end' deben ser enteros con 0 <= start <= end")
+    if not isinstance(lines, list) or not all(isinstance(line, str) for line in lines):
+        raise InvalidChange("'lines' debe ser una lista de textos")
+    if any(ch in _LINE_BREAKS for line in lines for ch in line):
+        raise InvalidChange("Las líneas no pueden contener saltos de línea")
+    return start, end, lines
+
+
+_store: Optional[DocumentStore] = None
+_store_lock = threading.Lock()
+
+
+def get_document_store() -> DocumentStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = DocumentStore(
+                    getattr(settings, "SYLLABLE_INCREMENTAL_MAX_DOCS", 1000),
+                    getattr(settings, "SYLLABLE_INCREMENTAL_MAX_CHARS", 2_000_000),
+                )
+    return _store
+
+
+def reset_document_store() -> None:
+    global _store
+    with _store_lock:
+        _store = None
@@ -0,0 +1,221 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Per-request stage timings and in-process metrics.
+#
+# SyllableMetricsMiddleware opens a RequestMetrics for each request; views and
+# services mark their stages with `span("tokenize")` and friends and report
+# sizes with `add_counts(words=...)`. Outside a request (management commands,
+# the parallel workers) or with SYLLABLE_METRICS_ENABLED off there is no
+# current RequestMetrics and every hook is a no-op. Finished requests are
+# folded into per-endpoint histograms served by GET /api/syllables/metrics/.
+
+_current: ContextVar[Optional["RequestMetrics"]] = ContextVar("syllable_request_metrics", default=None)
+
+# Histogram bucket upper bounds, in milliseconds (the last bucket is +inf).
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class RequestMetrics:
+    __slots__ = ("started", "stages", "counts")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}  # seconds, in first-seen order
+        self.counts: Dict[str, int] = {}
+
+    def add_stage(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def server_timing(self, total: float) -> str:
+        parts = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.stages.items()]
+        parts.append(f"total;dur={total * 1000:.3f}")
+        return ", ".join(parts)
+
+
+def begin_request() -> Tuple[RequestMetrics, Any]:
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def end_request(token) -> None:
+    _current.reset(token)
+
+
+def current() -> Optional[RequestMetrics]:
+    return _current.get()
+
+
+@contextmanager
+def _timed(metrics: RequestMetrics, name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add_stage(name, time.perf_counter() - started)
+
+
+class _NoSpan:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str):
+    """Context manager adding the time spent inside it to the current request's stage."""
+    metrics = _current.get()
+    if metrics is None:
+        return _NO_SPAN
+    return _timed(metrics, name)
+
+
+def timed_iter(iterable: Iterable, name: str) -> Iterator:
+    """Charge the time spent producing each item of iterable to a stage.
+    Returns the iterable unchanged when no request is being measured.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return iter(iterable)
+    return _timed_iter(iter(iterable), metrics, name)
+
+
+def _timed_iter(it: Iterator, metrics: RequestMetrics, name: str) -> Iterator:
+    perf_counter = time.perf_counter
+    while True:
+        started = perf_counter()
+        try:
+            item = next(it)
+        except StopIteration:
+            metrics.add_stage(name, perf_counter() - started)
+            return
+        metrics.add_stage(name, perf_counter() - started)
+        yield item
+
+
+def timed_call(fn: Callable, name: str) -> Callable:
+    """Wrap fn so its running time is charged to a stage (fn itself when idle)."""
+    metrics = _current.get()
+    if metrics is None:
+        return fn
+
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            metrics.add_stage(name, time.perf_counter() - started)
+
+    return wrapper
+
+
+def add_counts(**counts: int) -> None:
+    metrics = _current.get()
+    if metrics is not None:
+        for name, value in counts.items():
+            metrics.counts[name] = metrics.counts.get(name, 0) + value
+
+
+class Histogram:
+    __slots__ = ("buckets", "count", "sum_ms", "max_ms")
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.buckets[bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.sum_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (max for the last one)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum_ms": round(self.sum_ms, 3),
+            "mean_ms": round(self.sum_ms / self.count, 3) if self.count else None,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self.quantile(0.5),
+            "p99_ms": self.quantile(0.99),
+            "buckets": [[le, n] for le, n in zip(list(BUCKETS_MS) + ["+inf"], self.buckets)],
+        }
+
+
+class _EndpointMetrics:
+    __slots__ = ("requests", "statuses", "body_bytes", "body_bytes_max", "counts", "stages")
+
+    def __init__(self):
+        self.requests = 0
+        self.statuses: Dict[str, int] = {}
+        self.body_bytes = 0
+        self.body_bytes_max = 0
+        self.counts: Dict[str, int] = {}
+        self.stages: Dict[str, Histogram] = {}
+
+
+_registry: Dict[str, _EndpointMetrics] = {}
+_registry_lock = threading.Lock()
+
+
+def record(endpoint: str, status: int, body_bytes: int, metrics: RequestMetrics, total: float) -> None:
+    with _registry_lock:
+        entry = _registry.get(endpoint)
+        if entry is None:
+            entry = _registry[endpoint] = _EndpointMetrics()
+        entry.requests += 1
+        key = str(status)
+        entry.statuses[key] = entry.statuses.get(key, 0) + 1
+        entry.body_bytes += body_bytes
+        entry.body_bytes_max = max(entry.body_bytes_max, body_bytes)
+        for name, value in metrics.counts.items():
+            entry.counts[name] = entry.counts.get(name, 0) + value
+        stages: List[Tuple[str, float]] = list(metrics.stages.items()) + [("total", total)]
+        for name, seconds in stages:
+            hist = entry.stages.get(name)
+            if hist is None:
+                hist = entry.stages[name] = Histogram()
+            hist.observe(seconds * 1000)
+
+
+def snapshot() -> Dict[str, Any]:
+    with _registry_lock:
+        return {
+            endpoint: {
+                "requests": entry.requests,
+                "statuses": dict(entry.statuses),
+                "body_bytes_total": entry.body_bytes,
+                "body_bytes_max": entry.body_bytes_max,
+                "counts": dict(entry.counts),
+                "stages": {name: hist.as_dict() for name, hist in entry.stages.items()},
+            }
+            for endpoint, entry in sorted(_registry.items())
+        }
+
+
+def reset() -> None:
+    with _registry_lock:
+        _registry.clear()
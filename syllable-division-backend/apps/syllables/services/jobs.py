@@ -0,0 +1,283 @@
+import logging
+import os
+import signal
+import threading
+import uuid
+from contextlib import nullcontext
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import django
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.syllables.services.dictionary import flush_writeback
+from apps.syllables.services.meter import meter_payload
+from apps.syllables.services.text_syllabifier import syllabify_compact
+
+
+# Background batch jobs (POST /api/syllables/jobs/).
+#
+# Catalogue imports submit hundreds of songs at once. Instead of running
+# split-syllables for each one inside the HTTP request, the view stores a
+# SyllabifyJob with one SyllabifyJobDocument row per song and answers 202 with
+# the job id. Workers claim queued documents in small batches straight from
+# the database, so no broker is needed and any number of workers share a job:
+# `manage.py run_syllable_jobs --processes N` (separate processes, the
+# production setup) or SYLLABLE_JOB_THREADS threads inside each web process.
+#
+# A claim is a conditional UPDATE tagged with a random token, which is safe on
+# every backend; on PostgreSQL candidates are also picked with SKIP LOCKED so
+# concurrent workers don't collide on the same rows. A document whose claim is
+# older than SYLLABLE_JOB_LEASE_SECONDS (its worker died) is claimed again, up
+# to SYLLABLE_JOB_MAX_ATTEMPTS times before it is marked failed.
+
+logger = logging.getLogger(__name__)
+
+_stats = {"claimed": 0, "processed": 0, "failed": 0}
+_stats_lock = threading.Lock()
+_threads: List[threading.Thread] = []
+_threads_pid: Optional[int] = None
+_threads_lock = threading.Lock()
+
+
+def _count(**deltas: int) -> None:
+    with _stats_lock:
+        for name, delta in deltas.items():
+            _stats[name] += delta
+
+
+def lease_seconds() -> int:
+    return getattr(settings, "SYLLABLE_JOB_LEASE_SECONDS", 300)
+
+
+def max_attempts() -> int:
+    return getattr(settings, "SYLLABLE_JOB_MAX_ATTEMPTS", 3)
+
+
+def submit_job(documents: Sequence[Tuple[str, str]], options: Dict[str, Any]):
+    """Queue (name, text) documents for syllabification with split-syllables options."""
+    from apps.syllables.models import SyllabifyJob, SyllabifyJobDocument
+
+    with transaction.atomic():
+        job = SyllabifyJob.objects.create(options=options, total=len(documents))
+        SyllabifyJobDocument.objects.bulk_create(
+            [SyllabifyJobDocument(job=job, index=i, name=name, text=text) for i, (name, text) in enumerate(documents)],
+            batch_size=500,
+        )
+    return job
+
+
+def _fail_abandoned(now) -> None:
+    # Documents whose worker died too many times (e.g. killed for memory)
+    from apps.syllables.models import SyllabifyJobDocument
+
+    expired = SyllabifyJobDocument.objects.filter(
+        status=SyllabifyJobDocument.STATUS_RUNNING,
+        claimed_at__lt=now - timedelta(seconds=lease_seconds()),
+        attempts__gte=max_attempts(),
+    )
+    for doc in expired.only("id", "job_id", "claim"):
+        _finish(doc, SyllabifyJobDocument.STATUS_FAILED, error="El documento agotó sus reintentos")
+
+
+def claim_documents(limit: int = 4) -> list:
+    """Claim up to limit documents (oldest first) for this worker."""
+    from apps.syllables.models import SyllabifyJob, SyllabifyJobDocument
+
+    now = timezone.now()
+    _fail_abandoned(now)
+    claimable = Q(status=SyllabifyJobDocument.STATUS_QUEUED) | Q(
+        status=SyllabifyJobDocument.STATUS_RUNNING,
+        claimed_at__lt=now - timedelta(seconds=lease_seconds()),
+    )
+    token = uuid.uuid4().hex
+    skip_locked = connection.features.has_select_for_update_skip_locked
+    # Without SKIP LOCKED (SQLite) no transaction: upgrading its read lock to a
+    # write lock fails at once under contention, while the UPDATE alone is atomic.
+    with transaction.atomic() if skip_locked else nullcontext():
+        candidates = SyllabifyJobDocument.objects.filter(claimable).order_by("id")
+        if skip_locked:
+            candidates = candidates.select_for_update(skip_locked=True)
+        ids = list(candidates.values_list("id", flat=True)[:limit])
+        if not ids:
+            return []
+        # Rows another worker claimed since the SELECT no longer match `claimable`
+        SyllabifyJobDocument.objects.filter(claimable, id__in=ids).update(
+            status=SyllabifyJobDocument.STATUS_RUNNING, claim=token, claimed_at=now, attempts=F("attempts") + 1,
+        )
+    docs = list(SyllabifyJobDocument.objects.filter(claim=token).select_related("job").order_by("id"))
+    if docs:
+        SyllabifyJob.objects.filter(
+            id__in={doc.job_id for doc in docs}, status=SyllabifyJob.STATUS_QUEUED,
+        ).update(status=SyllabifyJob.STATUS_RUNNING, started_at=now)
+        _count(claimed=len(docs))
+    return docs
+
+
+def syllabify_document(text: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """split-syllables result of one document: items per line, counts and,
+    with the metric option, the meter of each line.
+    """
+    result = syllabify_compact(text, **options)
+    payload = {"items": [result.line_items(i) for i in range(len(result))], "counts": result.counts}
+    if result.meter is not None:
+        payload["meter"] = [meter_payload(meter) for meter in result.meter]
+    return payload
+
+
+def _finish(doc, status: str, result: Optional[Dict[str, Any]] = None, error: str = "") -> bool:
+    from apps.syllables.models import SyllabifyJob, SyllabifyJobDocument
+
+    failed = status == SyllabifyJobDocument.STATUS_FAILED
+    now = timezone.now()
+    with transaction.atomic():
+        updated = SyllabifyJobDocument.objects.filter(
+            id=doc.id, claim=doc.claim, status=SyllabifyJobDocument.STATUS_RUNNING,
+        ).update(status=status, result=result, error=error)
+        if not updated:  # the lease expired and another worker took the document
+            return False
+        SyllabifyJob.objects.filter(id=doc.job_id).update(
+            processed=F("processed") + 1, failed=F("failed") + int(failed),
+        )
+        SyllabifyJob.objects.filter(id=doc.job_id, processed__gte=F("total")).exclude(
+            status=SyllabifyJob.STATUS_DONE,
+        ).update(status=SyllabifyJob.STATUS_DONE, finished_at=now)
+    _count(processed=1, failed=int(failed))
+    return True
+
+
+def process_document(doc) -> bool:
+    from apps.syllables.models import SyllabifyJobDocument
+
+    try:
+        result = syllabify_document(doc.text, doc.job.options)
+    except Exception as exc:
+        logger.exception("Syllabify job %s: document %d failed", doc.job_id, doc.index)
+        return _finish(doc, SyllabifyJobDocument.STATUS_FAILED, error=f"{type(exc).__name__}: {exc}")
+    return _finish(doc, SyllabifyJobDocument.STATUS_DONE, result=result)
+
+
+def run_worker(
+    batch_size: int = 4,
+    poll_interval: float = 1.0,
+    stop: Optional[threading.Event] = None,
+    once: bool = False,
+) -> int:
+    """Process queued documents until stop is set (or, with once, until the
+    queue is empty). Returns the number of documents processed.
+    """
+    stop = stop or threading.Event()
+    processed = 0
+    while not stop.is_set():
+        close_old_connections()
+        try:
+            docs = claim_documents(batch_size)
+            for doc in docs:
+                processed += process_document(doc)
+        except DatabaseError:
+            # Claimed documents come back once their lease expires
+            logger.warning("Syllabify job worker: database error, retrying", exc_info=True)
+            stop.wait(poll_interval)
+            continue
+        if docs:
+            flush_writeback()
+            continue
+        if once:
+            break
+        stop.wait(poll_interval)
+    close_old_connections()
+    return processed
+
+
+def run_worker_process(batch_size: int, poll_interval: float) -> int:
+    """Entry point of a `run_syllable_jobs --processes` child (spawned)."""
+    django.setup()
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    return run_worker(batch_size, poll_interval, stop)
+
+
+def start_job_threads() -> int:
+    """Start SYLLABLE_JOB_THREADS worker threads in this process, once (again
+    after a fork). Called at worker start from config/wsgi.py, config/asgi.py
+    or gunicorn's post_fork hook. Returns the number of running threads.
+    """
+    global _threads_pid
+    count = getattr(settings, "SYLLABLE_JOB_THREADS", 0)
+    if count <= 0:
+        return 0
+    with _threads_lock:
+        if _threads_pid != os.getpid():
+            _threads.clear()
+            _threads_pid = os.getpid()
+        _threads[:] = [thread for thread in _threads if thread.is_alive()]
+        while len(_threads) < count:
+            thread = threading.Thread(target=run_worker, name=f"syllable-jobs-{len(_threads)}", daemon=True)
+            thread.start()
+            _threads.append(thread)
+        return len(_threads)
+
+
+def get_job(job_id):
+    """The SyllabifyJob with this id, or None."""
+    from apps.syllables.models import SyllabifyJob
+
+    return SyllabifyJob.objects.filter(id=job_id).first()
+
+
+def job_payload(job) -> Dict[str, Any]:
+    return {
+        "job_id": str(job.id),
+        "status": job.status,
+        "total": job.total,
+        "processed": job.processed,
+        "failed": job.failed,
+        "progress": round(job.processed / job.total, 4) if job.total else 1.0,
+        "created_at": job.created_at.isoformat(),
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "options": job.options,
+    }
+
+
+def finished_documents(job, after: int = -1, limit: int = 50) -> List[Dict[str, Any]]:
+    """Results of the documents after index `after`, in index order, up to the
+    first one still pending: a client paging with the last index it received
+    never misses a document.
+    """
+    from apps.syllables.models import SyllabifyJobDocument
+
+    records = []
+    rows = job.documents.filter(index__gt=after).order_by("index").values_list("index", "name", "status", "result", "error")
+    for index, name, status, result, error in rows[:limit].iterator():
+        if status not in (SyllabifyJobDocument.STATUS_DONE, SyllabifyJobDocument.STATUS_FAILED):
+            break
+        record = {"index": index, "id": name, "status": status}
+        if status == SyllabifyJobDocument.STATUS_DONE:
+            record.update(result)
+        else:
+            record["error"] = error
+        records.append(record)
+    return records
+
+
+def purge_jobs(older_than: timedelta) -> int:
+    """Delete finished jobs (and their documents) older than older_than; returns
+    the number of jobs deleted.
+    """
+    from apps.syllables.models import SyllabifyJob
+
+    _, deleted = SyllabifyJob.objects.filter(
+        status=SyllabifyJob.STATUS_DONE, finished_at__lt=timezone.now() - older_than,
+    ).delete()
+    return deleted.get(SyllabifyJob._meta.label, 0)
+
+
+def job_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        counts = dict(_stats)
+    return {**counts, "threads": sum(thread.is_alive() for thread in _threads)}
@@ -0,0 +1,111 @@
+from typing import Dict, Optional
+
+from django.conf import settings
+
+from apps.syllables.services.syllable_engine import SPANISH, SyllableRules
+
+
+# Per-language syllabification rules, selected with the `lang` option of the
+# syllable endpoints.
+#
+# Each language is data for a SyllableRules: character classes, a nucleus regex
+# over those classes and the allowed onset clusters/digraphs. Everything is
+# compiled here, once per process; dividing a word is then the same table-driven
+# pass for every language. Results are heuristics tuned for lyrics (syllable
+# counts first), curated dictionary rows still win (see dictionary.py).
+
+ENGLISH = SyllableRules(
+    "en",
+    "English",
+    classes={
+        "A": "aàáâä",
+        "I": "iìíîï",
+        "O": "oòóôö",
+        "U": "uùúûü",
+        "V": "èéêë",
+        "E": "e",
+        "Y": "y",
+        "L": "l",
+        "D": "d",
+        "T": "t",
+        "S": "s",
+        "Z": "zxch",
+        "G": "g",
+        "N": "n",
+        "Q": "q",
+    },
+    # Vowel runs are one nucleus ('beau-ti-ful'), except across a hiatus:
+    # before a final '-ing' ('go-ing', 'see-ing'), io/ia ('li-on', 'pi-a-no';
+    # not in '-tion', '-cial', '-gion', 'mil-lion', 'o-nion'), ie before -t/-nt/-nce
+    # ('qui-et', 'sci-ence'; not 'an-cient'), eo ('vi-de-o'; not 'peo-ple',
+    # 'George'), oe before a consonant ('po-em'; not 'does'), ue not after q/g
+    # nor final ('cru-el'; not 'queen', 'blue'), final ea after a syllable
+    # ('i-de-a') and 'cre-ate'.
+    # 'y' is a vowel unless a vowel follows ('yes', 'be-yond'), or before a final
+    # '-ing' ('try-ing'). Silent: final 'e' ('time', but 'ta-ble'), '-ed' unless
+    # after d/t ('loved', 'wan-ted'), '-es' unless after a sibilant ('times', 'pla-ces').
+    nucleus=(
+        r"(?P<silent>(?<![AIOUVEYL])E\Z|(?<=[AIOUVEY]L)E\Z|(?<![AIOUVEYDT])E(?=D\Z)|(?<![AIOUVEYSZG])E(?=S\Z))"
+        r"|[AIOUVE](?:(?!"
+        r"ING\Z"
+        r"|(?<=I)(?<![TSZG]I)(?<!LLI)(?<!NI)O"
+        r"|(?<=I)(?<![TSZ]I)A"
+        r"|(?<=I)(?:(?<=SZI)|(?<![ZT]I))E(?:T\Z|N[ZT])"
+        r"|(?<=E)(?<!GE)O(?!CLE)"
+        r"|(?<=O)E[CTL]"
+        r"|(?<=U)(?<![QG]U)E(?!(?:S|D)?\Z)"
+        r"|(?<=[AIOUVEY][^AIOUVEY]E)A\Z"
+        r"|(?<=ZCE)AT[EI]"
+        r")[AIOUVE])*(?:Y(?![AIOUVE])|Y(?=ING\Z))?"
+        r"|(?<![AIOUVE])Y(?:(?![AIOUVE])|(?=ING\Z))"
+    ),
+    clusters={
+        "pl", "pr", "bl", "br", "tr", "dr", "cl", "cr", "gl", "gr", "fl", "fr",
+        "thr", "shr", "phr", "chr", "tw", "dw",
+        "tl", "dl", "kl",  # syllabic '-le': 'lit-tle', 'han-dle'
+    },
+    digraphs={"ch", "sh", "th", "ph", "wh", "gh"},
+)
+
+PORTUGUESE = SyllableRules(
+    "pt",
+    "Português",
+    classes={"S": "aáàâeéêoóô", "N": "ãõ", "W": "iuü", "T": "íú", "G": "qg"},
+    # Falling diphthongs (pai, meu), nasal ones (mão, mãe, põe); a weak vowel
+    # before a strong one is a hiatus ('di-a') except after q/g ('quan-do', 'á-gua').
+    nucleus=r"(?<=G)WSW?|N[SW]|SW|WW|[SWTN]",
+    clusters={"pr", "pl", "br", "bl", "tr", "dr", "cr", "cl", "gr", "gl", "fr", "fl", "vr"},
+    digraphs={"ch", "lh", "nh"},
+)
+
+ITALIAN = SyllableRules(
+    "it",
+    "Italiano",
+    classes={"S": "aàáeèéoòó", "W": "iu", "T": "ìíùú"},
+    nucleus=r"WSW|WW|SW|WS|[SWT]",
+    # s + consonant opens the syllable ('pa-sta', 'mo-stro'), doubles split ('bel-lo')
+    clusters={
+        "pr", "pl", "br", "bl", "tr", "dr", "cr", "cl", "gr", "gl", "fr", "fl", "vr",
+        "sb", "sc", "sd", "sf", "sg", "sl", "sm", "sn", "sp", "sq", "sr", "st", "sv",
+        "spr", "str", "scr", "spl", "sbr", "sdr", "sfr", "sgr",
+    },
+    digraphs={"ch", "gh", "gn"},
+)
+
+LANGUAGES: Dict[str, SyllableRules] = {rules.code: rules for rules in (SPANISH, ENGLISH, PORTUGUESE, ITALIAN)}
+
+
+class UnknownLanguage(ValueError):
+    pass
+
+
+def default_language() -> str:
+    return getattr(settings, "SYLLABLE_DEFAULT_LANG", "es") if settings.configured else "es"
+
+
+def get_rules(lang: Optional[str] = None) -> SyllableRules:
+    """Rules for a language code (SYLLABLE_DEFAULT_LANG when None)."""
+    rules = LANGUAGES.get(lang or default_language())
+    if rules is None:
+        raise UnknownLanguage(f"Idioma no soportado: {lang!r} (use {', '.join(LANGUAGES)})")
+    return rules
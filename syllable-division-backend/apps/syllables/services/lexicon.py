@@ -0,0 +1,226 @@
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+
+
+# Precomputed, memory-mapped syllable lexicon (see the build_syllable_lexicon
+# command).
+#
+# One read-only file per language, <SYLLABLE_LEXICON_DIR>/<lang>.sylx, compiled
+# from the Syllable table plus wordlists. Workers mmap it instead of warming a
+# cache from the database, so every worker on a host shares the same page-cached
+# copy and startup costs one open() call. Lookups go through an open-addressing
+# hash table (crc32, load factor <= 0.5, so one or two probes); a miss falls
+# through to the dictionary table and the heuristic (see dictionary.py).
+#
+# Layout (native byte order, 4-byte aligned sections):
+#   magic, header (byte order marker, entry count, slot count, section offsets)
+#   slots          2^k x u32    entry index + 1 at crc32(key) & (2^k - 1), linear probing
+#   key_offsets    (n+1) x u32  key i is keys[key_offsets[i]:key_offsets[i + 1]]
+#   keys           UTF-8 words, sorted bytewise
+#   bound_offsets  (n+1) x u32  boundaries of entry i are bounds[bound_offsets[i]:...]
+#   bounds         u8 character positions where a new syllable starts (0 excluded)
+#
+# The file is replaced atomically when rebuilt: running workers keep their
+# mapping of the old file until they reopen it (reset_lexicons or a restart).
+
+MAGIC = b"SYLLEX1\n"
+_HEADER = struct.Struct("=IIIIIIII")  # marker, count, slots, then the offset of each section
+_MARKER = 0x01020304
+
+# Boundaries are stored as u8 character positions
+MAX_WORD_CHARS = 255
+
+
+def build_lexicon(path: str, entries: Iterable[Tuple[str, List[str]]]) -> int:
+    """Write a lexicon file from (word, syllables) entries (later entries win).
+    Entries whose syllables don't spell the word, or longer than
+    MAX_WORD_CHARS, are skipped. Returns the number of entries written.
+    """
+    table: Dict[bytes, bytes] = {}
+    for word, sylls in entries:
+        if not word or len(word) > MAX_WORD_CHARS or "".join(sylls) != word:
+            continue
+        bounds = []
+        pos = 0
+        for syll in sylls[:-1]:
+            pos += len(syll)
+            bounds.append(pos)
+        table[word.encode("utf-8", "surrogatepass")] = bytes(bounds)
+    keys = sorted(table)
+
+    size = 8
+    while size < 2 * len(keys):
+        size *= 2
+    mask = size - 1
+    slots = [0] * size
+    for i, key in enumerate(keys, 1):
+        slot = zlib.crc32(key) & mask
+        while slots[slot]:
+            slot = (slot + 1) & mask
+        slots[slot] = i
+
+    key_offsets, bound_offsets = [0], [0]
+    for key in keys:
+        key_offsets.append(key_offsets[-1] + len(key))
+        bound_offsets.append(bound_offsets[-1] + len(table[key]))
+    sections = [
+        struct.pack(f"={size}I", *slots),
+        struct.pack(f"={len(key_offsets)}I", *key_offsets),
+        b"".join(keys),
+        struct.pack(f"={len(bound_offsets)}I", *bound_offsets),
+        b"".join(table[key] for key in keys),
+    ]
+
+    offsets = []
+    pos = len(MAGIC) + _HEADER.size
+    for data in sections:
+        pos += -pos % 4
+        offsets.append(pos)
+        pos += len(data)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".lexicon-")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(MAGIC)
+            fh.write(_HEADER.pack(_MARKER, len(keys), size, *offsets))
+            for offset, data in zip(offsets, sections):
+                fh.write(b"\0" * (offset - fh.tell()))
+                fh.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)  # readers keep the old inode mapped
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return len(keys)
+
+
+class Lexicon:
+    """Read-only view of a lexicon file. `get` returns a tuple of syllables or None."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mm)
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path} is not a syllable lexicon")
+        marker, count, size, slots, key_offsets, keys, bound_offsets, bounds = _HEADER.unpack_from(
+            self._mm, len(MAGIC)
+        )
+        if marker != _MARKER:
+            raise ValueError(f"{path} was built on a machine with a different byte order")
+        self.count = count
+        self._mask = size - 1
+        self._slots = view[slots:slots + 4 * size].cast("I")
+        self._key_offsets = view[key_offsets:key_offsets + 4 * (count + 1)].cast("I")
+        self._keys = keys
+        self._bound_offsets = view[bound_offsets:bound_offsets + 4 * (count + 1)].cast("I")
+        self._bounds = bounds
+        self._stale: Set[bytes] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _find(self, key: bytes) -> int:
+        mm, slots, offsets, base, mask = self._mm, self._slots, self._key_offsets, self._keys, self._mask
+        slot = zlib.crc32(key) & mask
+        while True:
+            i = slots[slot] - 1
+            if i < 0:
+                return -1
+            if mm[base + offsets[i]:base + offsets[i + 1]] == key:
+                return i
+            slot = (slot + 1) & mask
+
+    def get(self, word: str) -> Optional[Tuple[str, ...]]:
+        if not word:
+            return None
+        key = word.encode("utf-8", "surrogatepass")
+        i = self._find(key) if key not in self._stale else -1
+        if i < 0:
+            self.misses += 1
+            return None
+        self.hits += 1
+        bounds = self._mm[self._bounds + self._bound_offsets[i]:self._bounds + self._bound_offsets[i + 1]]
+        sylls = []
+        prev = 0
+        for pos in bounds:
+            sylls.append(word[prev:pos])
+            prev = pos
+        sylls.append(word[prev:])
+        return tuple(sylls)
+
+    def mark_stale(self, word: str) -> None:
+        """Ignore the stored entry for word (its dictionary row changed after the build)."""
+        self._stale.add(word.encode("utf-8", "surrogatepass"))
+
+    def close(self) -> None:
+        for view in (self._slots, self._key_offsets, self._bound_offsets):
+            view.release()
+        self._mm.close()
+
+    def stats(self) -> Dict[str, object]:
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": self.count,
+            "bytes": len(self._mm),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+_lexicons: Dict[str, Optional[Lexicon]] = {}
+_lock = threading.Lock()
+
+
+def lexicon_dir() -> str:
+    return getattr(settings, "SYLLABLE_LEXICON_DIR", "") if settings.configured else ""
+
+
+def lexicon_path(lang: str) -> Optional[str]:
+    directory = lexicon_dir()
+    return os.path.join(directory, f"{lang}.sylx") if directory else None
+
+
+def get_lexicon(lang: str) -> Optional[Lexicon]:
+    """The mapped lexicon of a language, or None when there is no file."""
+    try:
+        return _lexicons[lang]
+    except KeyError:
+        pass
+    with _lock:
+        if lang not in _lexicons:
+            path = lexicon_path(lang)
+            _lexicons[lang] = Lexicon(path) if path and Path(path).is_file() else None
+        return _lexicons[lang]
+
+
+def reset_lexicons() -> None:
+    """Unmap every lexicon; the next lookup reopens the current files."""
+    with _lock:
+        for lexicon in _lexicons.values():
+            if lexicon is not None:
+                lexicon.close()
+        _lexicons.clear()
+
+
+def lexicon_stats() -> Dict[str, object]:
+    with _lock:
+        loaded = dict(_lexicons)
+    return {
+        "dir": lexicon_dir(),
+        "languages": {lang: lexicon.stats() for lang, lexicon in loaded.items() if lexicon is not None},
+    }
@@ -0,0 +1,204 @@
+import functools
+import hashlib
+import math
+import threading
+import time
+from typing import Dict, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+
+# Request size limits and per-client rate limiting for the text endpoints.
+#
+# Both run before any work is done on a request: the body size is checked from
+# Content-Length (then the actual body) before JSON parsing, and the line and
+# token limits on the parsed text before tokenizing, with cheap counts. Limits
+# are configured per endpoint (url name, without the _no_slash suffix) in
+# SYLLABLE_REQUEST_LIMITS, falling back to its "default" entry.
+#
+# The rate limiter is a token bucket per client kept in a Django cache
+# (SYLLABLE_RATE_LIMIT_CACHE_ALIAS), so with Redis/Memcached it is shared by all
+# workers. Each request costs 1 plus one unit per SYLLABLE_RATE_LIMIT_BYTES_PER_UNIT
+# bytes of body, so one pasted novel drains a client's bucket the way many lyric
+# requests would. Reads and writes of a bucket aren't atomic: concurrent
+# requests of the same client may both pass, which only makes it slightly lenient.
+
+_DEFAULT_LIMITS = {"max_bytes": 2 * 1024 * 1024, "max_lines": 50000, "max_tokens": 500000}
+
+_stats = {"too_large": 0, "rate_limited": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+
+class RequestTooLarge(ValueError):
+    pass
+
+
+def endpoint_limits(endpoint: str) -> Dict[str, int]:
+    configured = getattr(settings, "SYLLABLE_REQUEST_LIMITS", {})
+    return {**_DEFAULT_LIMITS, **configured.get("default", {}), **configured.get(endpoint, {})}
+
+
+def too_large(message: str) -> HttpResponse:
+    _count("too_large")
+    return HttpResponse(message, status=413)
+
+
+def body_too_large(request, endpoint: str) -> Optional[HttpResponse]:
+    """413 response when the body exceeds the endpoint's max_bytes, else None."""
+    max_bytes = endpoint_limits(endpoint)["max_bytes"]
+    try:
+        declared = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        declared = 0
+    # Content-Length first, so an oversized upload is refused before it is read
+    if declared > max_bytes or len(request.body) > max_bytes:
+        return too_large(f"El cuerpo de la petición supera el máximo de {max_bytes} bytes")
+    return None
+
+
+def check_text(text: str, endpoint: str) -> None:
+    """Raise RequestTooLarge when text has more lines or (estimated) tokens than
+    the endpoint allows. Tokens are estimated as whitespace-separated chunks.
+    """
+    limits = endpoint_limits(endpoint)
+    lines = text.count("\n") + 1
+    if lines > limits["max_lines"]:
+        raise RequestTooLarge(f"El texto supera el máximo de {limits['max_lines']} líneas")
+    if len(text) > limits["max_tokens"] and len(text.split()) > limits["max_tokens"]:
+        raise RequestTooLarge(f"El texto supera el máximo de {limits['max_tokens']} palabras")
+
+
+def check_document(lines: int, tokens: int, size: int, endpoint: str) -> None:
+    """Raise RequestTooLarge when a document assembled across requests (see
+    incremental.py) has grown past the endpoint's lines, tokens or bytes.
+    """
+    limits = endpoint_limits(endpoint)
+    if lines > limits["max_lines"]:
+        raise RequestTooLarge(f"El documento supera el máximo de {limits['max_lines']} líneas")
+    if tokens > limits["max_tokens"]:
+        raise RequestTooLarge(f"El documento supera el máximo de {limits['max_tokens']} palabras")
+    if size > limits["max_bytes"]:
+        raise RequestTooLarge(f"El documento supera el máximo de {limits['max_bytes']} bytes")
+
+
+def rate_limit_enabled() -> bool:
+    return getattr(settings, "SYLLABLE_RATE_LIMIT_ENABLED", False)
+
+
+def request_cost(request) -> int:
+    """Cost estimate of a request, in bucket units, from its body size."""
+    per_unit = max(1, getattr(settings, "SYLLABLE_RATE_LIMIT_BYTES_PER_UNIT", 16 * 1024))
+    try:
+        size = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        size = 0
+    # Chunked uploads carry no Content-Length; body_too_large has read the body by now
+    if not size:
+        size = len(request.body)
+    return 1 + size // per_unit
+
+
+def client_key(request) -> str:
+    header = getattr(settings, "SYLLABLE_RATE_LIMIT_CLIENT_HEADER", "")
+    client = ""
+    if header:
+        # X-Forwarded-For style lists: each proxy appends the address it saw, so
+        # the entry TRUSTED_PROXIES from the right is the last one a trusted
+        # proxy wrote (anything left of it is whatever the client sent).
+        entries = [entry.strip() for entry in request.META.get(header, "").split(",")]
+        entries = [entry for entry in entries if entry]
+        hops = max(1, getattr(settings, "SYLLABLE_RATE_LIMIT_TRUSTED_PROXIES", 1))
+        if entries:
+            client = entries[-min(hops, len(entries))]
+    client = client or request.META.get("REMOTE_ADDR", "")
+    # Hashed: header values may hold spaces or be long, which Memcached keys can't
+    return "syllables:rate:" + hashlib.sha1(client.encode("utf-8", "replace")).hexdigest()
+
+
+class TokenBucket:
+    """Token bucket of `burst` units refilled at `rate` units per second,
+    stored as (tokens, timestamp) under one cache key per client.
+    """
+
+    def __init__(self, cache, rate: float, burst: float):
+        self.cache = cache
+        self.rate = rate
+        self.burst = burst
+
+    def consume(self, key: str, cost: float, now: Optional[float] = None) -> float:
+        """Take cost units; returns 0 when allowed, else the seconds to wait
+        until they are available. Costs above the burst are capped at it.
+        """
+        now = time.time() if now is None else now
+        cost = min(cost, self.burst)
+        tokens, updated = self.cache.get(key) or (self.burst, now)
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        timeout = math.ceil(self.burst / self.rate) + 1  # a full bucket needs no entry
+        if tokens < cost:
+            self.cache.set(key, (tokens, now), timeout)
+            return (cost - tokens) / self.rate
+        self.cache.set(key, (tokens - cost, now), timeout)
+        return 0.0
+
+
+def get_bucket() -> TokenBucket:
+    return TokenBucket(
+        caches[getattr(settings, "SYLLABLE_RATE_LIMIT_CACHE_ALIAS", "default")],
+        rate=getattr(settings, "SYLLABLE_RATE_LIMIT_RATE", 10.0),
+        burst=getattr(settings, "SYLLABLE_RATE_LIMIT_BURST", 60.0),
+    )
+
+
+def rate_limited(request) -> Optional[HttpResponse]:
+    """429 response with Retry-After when the client's bucket is empty, else None."""
+    if not rate_limit_enabled():
+        return None
+    wait = get_bucket().consume(client_key(request), request_cost(request))
+    if not wait:
+        return None
+    _count("rate_limited")
+    response = HttpResponse("Demasiadas peticiones, reintente más tarde", status=429)
+    response["Retry-After"] = str(math.ceil(wait))
+    return response
+
+
+def _reject(request, endpoint: str) -> Optional[HttpResponse]:
+    if request.method != "POST":
+        return None
+    return body_too_large(request, endpoint) or rate_limited(request)
+
+
+def limit_request(endpoint: str):
+    """View decorator: answer 413/429 before the view parses the body.
+    Works on sync and async views.
+    """
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @functools.wraps(view)
+            async def wrapped(request, *args, **kwargs):
+                return _reject(request, endpoint) or await view(request, *args, **kwargs)
+
+            return markcoroutinefunction(wrapped)
+
+        @functools.wraps(view)
+        def wrapped(request, *args, **kwargs):
+            return _reject(request, endpoint) or view(request, *args, **kwargs)
+
+        return wrapped
+
+    return decorator
+
+
+def limit_stats() -> Dict[str, object]:
+    with _stats_lock:
+        counts = dict(_stats)
+    return {**counts, "rate_limit_enabled": rate_limit_enabled()}
@@ -0,0 +1,79 @@
+from typing import Iterable, List, NamedTuple, Optional, Sequence
+
+from apps.syllables.services.rhymes import STRESS_NAMES, find_stress
+
+
+# Metrical (sung) syllable count of a lyric line, for split-syllables with
+# "metric": true.
+#
+# Spanish verse counts differ from the orthographic syllables in two ways:
+#   - synalepha: a word ending in a vowel and the next one starting with a vowel
+#     (or a silent h + vowel) share one beat: "de alma" -> de-al|ma, 2 beats;
+#   - the final word's stress: one beat more after an aguda (mar), one less
+#     after an esdrújula (lágrima), none after a llana.
+# `line_meter` applies both while walking the line's words once and maps every
+# orthographic syllable to the beat it is sung on.
+
+METER_LANGS = ("es",)
+
+OPEN_VOWELS = set("aeiouáéíóúü")
+_FINAL_ADJUSTMENT = {"aguda": 1, "llana": 0, "esdrujula": -1, "sobresdrujula": -1}
+
+
+class LineMeter(NamedTuple):
+    syllables: int  # metrical count, after synalepha and the final-stress adjustment
+    beats: List[int]  # beat index of each orthographic syllable of the line, in order
+    synalephas: int
+    final_stress: Optional[str]  # aguda | llana | esdrujula | sobresdrujula, None without words
+
+
+def _ends_in_vowel(word: str) -> bool:
+    last = word[-1:]
+    # Final y is a vowel sound too (hoy, muy, y)
+    return last in OPEN_VOWELS or (last == "y" and (len(word) == 1 or word[-2] in OPEN_VOWELS))
+
+
+def _starts_with_vowel(word: str) -> bool:
+    first = word[:1]
+    if first == "h":  # silent, but hie-/hue- sound consonantal (hielo, huevo)
+        return word[1:2] in OPEN_VOWELS and not (word[1:2] in ("i", "u") and word[2:3] in OPEN_VOWELS)
+    return first in OPEN_VOWELS or word == "y"
+
+
+def line_meter(words: Iterable[Sequence[str]]) -> LineMeter:
+    """Meter of a line given the syllables of its words, in order."""
+    beats: List[int] = []
+    beat = -1
+    synalephas = 0
+    previous = ""
+    last: Sequence[str] = ()
+    for sylls in words:
+        if not sylls:
+            continue
+        word = "".join(sylls).lower()
+        merge = bool(previous) and _ends_in_vowel(previous) and _starts_with_vowel(word)
+        if merge:
+            synalephas += 1
+        else:
+            beat += 1
+        beats.append(beat)
+        for _ in range(len(sylls) - 1):
+            beat += 1
+            beats.append(beat)
+        previous = word
+        last = sylls
+
+    if not beats:
+        return LineMeter(0, beats, 0, None)
+    stress = find_stress([s.lower() for s in last])
+    final = STRESS_NAMES[min(len(last) - 1 - stress.syllable, 3)] if stress else None
+    return LineMeter(beat + 1 + _FINAL_ADJUSTMENT.get(final, 0), beats, synalephas, final)
+
+
+def meter_payload(meter: LineMeter) -> dict:
+    return {
+        "syllables": meter.syllables,
+        "beats": meter.beats,
+        "synalephas": meter.synalephas,
+        "final_stress": meter.final_stress,
+    }
@@ -0,0 +1,177 @@
+import asyncio
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import AsyncIterator, Callable, Dict, Iterable, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+
+
+# Bounded worker pool for the async (ASGI) views.
+#
+# Large lyric bodies are syllabified in this pool instead of on the event loop,
+# so one huge upload can't stall every other client. At most
+# SYLLABLE_ASYNC_WORKERS jobs run at once; up to SYLLABLE_ASYNC_MAX_QUEUE more
+# may wait, beyond that callers get OffloadQueueFull (-> 503). A stream holds
+# one of those slots from admission until it ends, not only while a chunk is in
+# the pool, so long streams count against the bound too. Counters are exposed in
+# GET /api/syllables/stats/ to tune both numbers.
+
+
+class OffloadQueueFull(Exception):
+    pass
+
+
+def _default_workers() -> int:
+    return min(4, os.cpu_count() or 1)
+
+
+class Offloader:
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.slots = 0  # pending run() calls plus open streams
+        self.streams = 0
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.max_queued_seen = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="syllables-offload"
+                    )
+        return self._executor
+
+    def _call(self, fn: Callable, args: tuple):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        # Pool threads outlive requests: drop stale DB connections like request_started does
+        close_old_connections()
+        try:
+            return fn(*args)
+        finally:
+            close_old_connections()
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    def _reserve(self) -> None:
+        with self._lock:
+            if self.slots >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise OffloadQueueFull()
+            self.slots += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self.slots -= 1
+
+    async def _submit(self, fn: Callable, args: tuple):
+        with self._lock:
+            self.queued += 1
+            self.max_queued_seen = max(self.max_queued_seen, self.queued)
+        loop = asyncio.get_running_loop()
+        # run_in_executor doesn't carry contextvars over; copy them so request
+        # metrics (instrumentation spans) still see the current request.
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self._get_executor(), context.run, self._call, fn, args)
+
+    async def run(self, fn: Callable, *args):
+        """Run fn(*args) in the pool and await its result.
+        Raises OffloadQueueFull when the queue is already at its limit.
+        """
+        self._reserve()
+        try:
+            return await self._submit(fn, args)
+        finally:
+            self._release()
+
+    def stream(self, iterable: Iterable, chunk_size: int = 64) -> "OffloadStream":
+        """Admit a stream consuming a (lazy) sync iterable in the pool,
+        chunk_size items per hop, for an async consumer (e.g. an async
+        StreamingHttpResponse). Raises OffloadQueueFull when the queue is
+        full; otherwise the slot is held until the stream ends or is closed.
+        """
+        self._reserve()
+        with self._lock:
+            self.streams += 1
+        return OffloadStream(self, iterable, chunk_size)
+
+    def _end_stream(self) -> None:
+        with self._lock:
+            self.streams -= 1
+        self._release()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self.running,
+                "streams": self.streams,
+                "queue_depth": self.queued,  # submitted, not started yet
+                "max_queue_depth_seen": self.max_queued_seen,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+
+class OffloadStream:
+    """Async iterator returned by Offloader.stream. close() (called by Django
+    when the response is done, even if it was never iterated) frees its slot.
+    """
+
+    def __init__(self, offloader: Offloader, iterable: Iterable, chunk_size: int):
+        self._offloader = offloader
+        self._it = iter(iterable)
+        self._chunk_size = chunk_size
+        self._closed = False
+
+    async def __aiter__(self) -> AsyncIterator:
+        try:
+            while not self._closed:
+                chunk = await self._offloader._submit(lambda: list(islice(self._it, self._chunk_size)), ())
+                if not chunk:
+                    return
+                for item in chunk:
+                    yield item
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        with self._offloader._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._offloader._end_stream()
+
+
+_offloader: Optional[Offloader] = None
+_offloader_lock = threading.Lock()
+
+
+def get_offloader() -> Offloader:
+    global _offloader
+    if _offloader is None:
+        with _offloader_lock:
+            if _offloader is None:
+                _offloader = Offloader(
+                    max_workers=getattr(settings, "SYLLABLE_ASYNC_WORKERS", None) or _default_workers(),
+                    max_queue=getattr(settings, "SYLLABLE_ASYNC_MAX_QUEUE", 64),
+                )
+    return _offloader
+
+
+def offload_stats() -> Dict[str, int]:
+    return get_offloader().stats()
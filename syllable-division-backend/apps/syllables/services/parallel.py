@@ -0,0 +1,187 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+
+from apps.syllables.services.dictionary import reconcile
+from apps.syllables.services.instrumentation import span
+from apps.syllables.services.languages import get_rules
+from apps.syllables.services.text_syllabifier import SyllabifiedText, SyllabifyCounts, syllabify_compact
+from apps.syllables.services.tokenizer import CODE_WORD
+
+
+# Parallel split-syllables for very large texts (songbook imports).
+#
+# The document is cut into shards of whole lines, each shard is syllabified in a
+# persistent process pool (`syllabify_compact`) and the token arrays are
+# concatenated in line order, so the output is exactly the serial one. Workers
+# only run the heuristic engine (each distinct word of a shard once) and send back
+# their arrays, whose syllables are the shared tuples of what they computed, so
+# every distinct word is pickled once per shard; the parent then checks those
+# words against the cache and the Syllable dictionary and patches the few tokens
+# where a curated entry differs.
+#
+# Kicks in for texts of at least SYLLABLE_PARALLEL_MIN_CHARS characters when the
+# pool has two or more workers (SYLLABLE_PARALLEL_WORKERS, default: the CPUs this
+# process may run on). Every web process has its own pool, so gunicorn.conf.py
+# sets the default to the CPUs per gunicorn worker.
+
+logger = logging.getLogger(__name__)
+
+# Shards per worker: smaller shards balance uneven lines better, at some IPC cost.
+SHARDS_PER_WORKER = 4
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_stats = {"documents": 0, "shards": 0, "fallbacks": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(**deltas: int) -> None:
+    with _stats_lock:
+        for name, delta in deltas.items():
+            _stats[name] += delta
+
+
+def available_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))  # honours container CPU sets
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def parallel_workers() -> int:
+    return getattr(settings, "SYLLABLE_PARALLEL_WORKERS", None) or available_cpus()
+
+
+def use_parallel(text: str) -> bool:
+    min_chars = getattr(settings, "SYLLABLE_PARALLEL_MIN_CHARS", 100_000)
+    return min_chars > 0 and len(text) >= min_chars and parallel_workers() > 1
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn, not fork: the parent has DB connections and pool threads
+                # (see offload.py) that must not leak into the children.
+                _pool = ProcessPoolExecutor(
+                    max_workers=parallel_workers(),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+def split_shards(text: str, n: int) -> List[str]:
+    """Cut text into at most n chunks of whole lines (line breaks kept) of
+    roughly equal size. Concatenating the chunks gives back text.
+    """
+    target = max(1, -(-len(text) // max(1, n)))
+    shards = []
+    current: List[str] = []
+    size = 0
+    for line in text.splitlines(keepends=True):
+        current.append(line)
+        size += len(line)
+        if size >= target:
+            shards.append("".join(current))
+            current = []
+            size = 0
+    if current:
+        shards.append("".join(current))
+    return shards
+
+
+def _syllabify_shard(shard: str, options: Dict[str, Any]) -> Tuple[SyllabifiedText, Dict[str, Tuple[str, ...]]]:
+    # Runs in a worker process: heuristic only, each distinct word divided once
+    computed: Dict[str, Tuple[str, ...]] = {}
+
+    def resolve(words, lang):
+        rules = get_rules(lang)
+        out = {}
+        for word in words:
+            sylls = computed.get(word)
+            if sylls is None:
+                sylls = computed[word] = tuple(rules.divide(word))
+            out[word] = sylls
+        return out
+
+    return syllabify_compact(shard, resolve=resolve, **options), computed
+
+
+def syllabify_compact_parallel(text: str, **options) -> SyllabifiedText:
+    """Same result as `syllabify_compact`, computed across the process pool.
+    Falls back to the serial path if the pool is unavailable.
+    """
+    metric = options.pop("metric", False)
+    shards = split_shards(text, parallel_workers() * SHARDS_PER_WORKER)
+    try:
+        with span("syllabify_parallel"):
+            results = list(_get_pool().map(_syllabify_shard, shards, [options] * len(shards)))
+    except (BrokenProcessPool, OSError):
+        logger.warning("Parallel syllabification failed, falling back to serial", exc_info=True)
+        shutdown_pool()
+        _count(fallbacks=1)
+        return syllabify_compact(text, metric=metric, **options)
+
+    types = bytearray()
+    texts: List[str] = []
+    syllables: List[Optional[Sequence[str]]] = []
+    line_offsets = [0]
+    counts = SyllabifyCounts()
+    computed: Dict[str, Tuple[str, ...]] = {}
+    for part, shard_computed in results:
+        base = len(texts)
+        types += part.types
+        texts.extend(part.texts)
+        syllables.extend(part.syllables)
+        line_offsets.extend(base + offset for offset in part.line_offsets[1:])
+        counts.merge(SyllabifyCounts.from_dict(part.counts))
+        computed.update(shard_computed)
+
+    with span("reconcile"):
+        overrides = reconcile({word: list(sylls) for word, sylls in computed.items()}, options.get("lang"))
+    if overrides:
+        overrides = {word: tuple(sylls) for word, sylls in overrides.items()}
+        for index in range(len(line_offsets) - 1):
+            delta = 0
+            for j in range(line_offsets[index], line_offsets[index + 1]):
+                sylls = overrides.get(texts[j]) if types[j] == CODE_WORD else None
+                if sylls is not None:
+                    delta += len(sylls) - len(syllables[j])
+                    syllables[j] = sylls
+            if delta:
+                counts.syllables_per_line[index] += delta
+                counts.syllables_total += delta
+
+    counts.report()
+    _count(documents=1, shards=len(shards))
+    result = SyllabifiedText(types, texts, syllables, line_offsets, counts.as_dict())
+    if metric:
+        result.add_meter()  # after the shards' words were reconciled with the dictionary
+    return result
+
+
+def parallel_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        counts = dict(_stats)
+    return {
+        "workers": parallel_workers(),
+        "min_chars": getattr(settings, "SYLLABLE_PARALLEL_MIN_CHARS", 100_000),
+        "pool_started": _pool is not None,
+        **counts,
+    }
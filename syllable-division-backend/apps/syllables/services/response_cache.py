@@ -0,0 +1,119 @@
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import parse_etags
+
+from apps.syllables.services.instrumentation import add_counts, span
+
+
+# Response cache for split/ and split-syllables/.
+#
+# The editor resubmits the whole lyric on every debounce tick, mostly unchanged.
+# A request is identified by a SHA-256 of (endpoint, validated options, text,
+# dictionary generation); the digest is the response ETag, and the serialized
+# body is kept in a Django cache (SYLLABLE_RESPONSE_CACHE_ALIAS, by default its
+# own local-memory cache). If-None-Match with the current ETag gets a bodiless 304, a known
+# digest gets the stored bytes back without tokenizing or serializing anything.
+#
+# The text is hashed as sent: the response echoes it, so e.g. normalizing line
+# endings would hand back a body for a different text. The dictionary
+# generation is bumped whenever Syllable rows change (see signals.py), which
+# retires every ETag and cached body that may embed the old syllables.
+
+# Bump when a code change alters the responses, to retire stale cached bodies.
+FORMAT_VERSION = 1
+
+GENERATION_KEY = "syllables:dictionary-generation"
+
+_stats = {"hits": 0, "misses": 0, "not_modified": 0, "stored": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def enabled() -> bool:
+    return getattr(settings, "SYLLABLE_RESPONSE_CACHE_ENABLED", True)
+
+
+def _cache():
+    return caches[getattr(settings, "SYLLABLE_RESPONSE_CACHE_ALIAS", "responses")]
+
+
+def dictionary_generation() -> int:
+    return _cache().get(GENERATION_KEY, 0)
+
+
+def bump_generation(**_kwargs) -> None:
+    """Invalidate every cached response and ETag (call when dictionary rows change)."""
+    cache = _cache()
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        # Missing key: start the counter (add() so a concurrent bump isn't lost)
+        if not cache.add(GENERATION_KEY, 1, timeout=None):
+            cache.incr(GENERATION_KEY)
+
+
+def request_digest(endpoint: str, text: str, options: Dict[str, Any], generation: int) -> str:
+    digest = hashlib.sha256()
+    header = json.dumps([FORMAT_VERSION, endpoint, generation, options], sort_keys=True, separators=(",", ":"))
+    digest.update(header.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(text.encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+def cached_response(request, endpoint: str, text: str, options: Dict[str, Any], build: Callable[[str, Dict[str, Any]], HttpResponse]) -> HttpResponse:
+    """Serve build(text, options) through the response cache, with ETag and
+    If-None-Match support. Only 200 responses up to
+    SYLLABLE_RESPONSE_CACHE_MAX_BYTES are stored.
+    """
+    if not enabled():
+        return build(text, options)
+
+    with span("cache"):
+        cache = _cache()
+        digest = request_digest(endpoint, text, options, dictionary_generation())
+        etag = f'"{digest}"'
+
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            _count("not_modified")
+            add_counts(cache_not_modified=1)
+            response = HttpResponseNotModified()
+            response["ETag"] = etag
+            return response
+
+        key = f"syllables:response:{digest}"
+        content = cache.get(key)
+
+    if content is not None:
+        _count("hits")
+        add_counts(cache_hits=1)
+        response = HttpResponse(content, content_type="application/json")
+    else:
+        _count("misses")
+        response = build(text, options)
+        max_bytes = getattr(settings, "SYLLABLE_RESPONSE_CACHE_MAX_BYTES", 64 * 1024)
+        if response.status_code == 200 and len(response.content) <= max_bytes:
+            with span("cache"):
+                cache.set(key, response.content, getattr(settings, "SYLLABLE_RESPONSE_CACHE_TIMEOUT", 300))
+            _count("stored")
+    response["ETag"] = etag
+    return response
+
+
+def response_cache_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+    stats["enabled"] = enabled()
+    return stats
@@ -0,0 +1,272 @@
+import bisect
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db import DatabaseError
+
+from apps.syllables.services.languages import get_rules
+
+
+# Rhyme and stress index over the syllabified vocabulary (GET /api/syllables/rhymes/).
+#
+# Built once per process from the Syllable table plus an optional wordlist
+# (SYLLABLE_RHYME_WORDLIST, "word [frequency]" per line), then kept up to date
+# by the Syllable save/delete signals. Every word is stored under its consonant
+# rhyme (letters from the stressed vowel to the end: canción -> "on") and its
+# assonant rhyme (the vowels from the stressed one: patria -> "a-a"), both for
+# any syllable count and for its own count, in posting lists kept sorted by
+# (-frequency, word). A query is then a dict lookup plus a slice.
+#
+# Stress follows the Spanish written-accent rules, so only Spanish is indexed.
+# Other workers see signal updates only after they rebuild (restart).
+
+logger = logging.getLogger(__name__)
+
+RHYME_LANGS = ("es",)
+RHYME_TYPES = ("consonant", "assonant")
+STRESS_NAMES = ("aguda", "llana", "esdrujula", "sobresdrujula")
+
+ACCENTED = set("áéíóú")
+STRONG = set("aeoáéó")
+VOWELS = set("aeiouáéíóúü")
+_PLAIN = str.maketrans("áéíóúü", "aeiouu")
+
+
+class Stress(NamedTuple):
+    syllable: int  # index of the stressed syllable
+    vowel: int  # index of the stressed vowel within the word
+
+
+class RhymeEntry(NamedTuple):
+    syllables: Tuple[str, ...]
+    frequency: int
+    stress: str
+    consonant: str
+    assonant: str
+
+
+def _nucleus_vowel(syllable: str) -> int:
+    # Index of the vowel carrying the syllable's stress: an accented one, else a
+    # strong one, else the last weak one (cui-da, ciu-dad, qui-so).
+    positions = [i for i, c in enumerate(syllable) if c in VOWELS]
+    if not positions:
+        return -1
+    for pick in (ACCENTED, STRONG):
+        for i in positions:
+            if syllable[i] in pick:
+                return i
+    return positions[-1]
+
+
+def find_stress(syllables: Sequence[str]) -> Optional[Stress]:
+    """Stressed syllable and vowel of a lowercase word, or None if it has no vowel."""
+    n = len(syllables)
+    stressed = None
+    for i in range(n - 1, -1, -1):
+        if any(c in ACCENTED for c in syllables[i]):
+            stressed = i
+            break
+    if stressed is None:
+        last = syllables[-1][-1:]
+        stressed = n - 2 if n > 1 and (last in VOWELS or last in ("n", "s")) else n - 1
+    vowel = _nucleus_vowel(syllables[stressed])
+    if vowel < 0:
+        return None
+    return Stress(stressed, sum(len(s) for s in syllables[:stressed]) + vowel)
+
+
+def rhyme_keys(syllables: Sequence[str]) -> Optional[Tuple[str, str, str]]:
+    """(stress name, consonant rhyme, assonant rhyme) of a lowercase word."""
+    stress = find_stress(syllables)
+    if stress is None:
+        return None
+    word = "".join(syllables)
+    post = syllables[stress.syllable + 1:]
+    consonant = word[stress.vowel:].translate(_PLAIN)
+    vowels = [word[stress.vowel]]
+    # Esdrújulas rhyme on the stressed and final vowels (lágrima ~ casa)
+    for syllable in post[-1:] if len(post) > 1 else post:
+        i = _nucleus_vowel(syllable)
+        if i >= 0:
+            vowels.append(syllable[i])
+    assonant = "-".join(vowels).translate(_PLAIN)
+    return STRESS_NAMES[min(len(post), 3)], consonant, assonant
+
+
+class RhymeIndex:
+    def __init__(self, lang: str):
+        self.lang = lang
+        self.entries: Dict[str, RhymeEntry] = {}
+        self.wordlist: Dict[str, int] = {}  # wordlist words and their frequency
+        self._postings: Dict[Tuple[str, str, int], List[Tuple[int, str]]] = {}
+        self._lock = threading.Lock()
+        self.build_seconds = 0.0
+
+    @staticmethod
+    def _keys(entry: RhymeEntry):
+        n = len(entry.syllables)
+        yield ("consonant", entry.consonant, 0)
+        yield ("consonant", entry.consonant, n)
+        yield ("assonant", entry.assonant, 0)
+        yield ("assonant", entry.assonant, n)
+
+    def _remove(self, word: str) -> None:
+        entry = self.entries.pop(word, None)
+        if entry is None:
+            return
+        item = (-entry.frequency, word)
+        for key in self._keys(entry):
+            postings = self._postings[key]
+            del postings[bisect.bisect_left(postings, item)]
+            if not postings:
+                del self._postings[key]
+
+    def _add(self, word: str, syllables: Sequence[str], sort: bool = True) -> None:
+        keys = rhyme_keys(syllables)
+        if keys is None:
+            return
+        entry = RhymeEntry(tuple(syllables), self.wordlist.get(word, 0), *keys)
+        self.entries[word] = entry
+        item = (-entry.frequency, word)
+        for key in self._keys(entry):
+            postings = self._postings.setdefault(key, [])
+            if sort:
+                bisect.insort(postings, item)
+            else:
+                postings.append(item)
+
+    def load(self, entries: Iterable[Tuple[str, Sequence[str]]]) -> None:
+        """Bulk load (word, syllables) pairs; later pairs replace earlier ones."""
+        words: Dict[str, Sequence[str]] = {}
+        for word, syllables in entries:
+            word = word.lower()
+            syllables = [s.lower() for s in syllables]
+            if word.isalpha() and "".join(syllables) == word:
+                words[word] = syllables
+        with self._lock:
+            for word, syllables in words.items():
+                self._remove(word)
+                self._add(word, syllables, sort=False)
+            for postings in self._postings.values():
+                postings.sort()
+
+    def update(self, word: str, syllables: Optional[Sequence[str]]) -> None:
+        """Re-index word with new syllables; None removes it (wordlist words fall
+        back to the heuristic division).
+        """
+        word = word.lower()
+        if syllables is None and word in self.wordlist:
+            syllables = get_rules(self.lang).divide(word)
+        with self._lock:
+            self._remove(word)
+            if syllables is not None:
+                syllables = [s.lower() for s in syllables]
+                if word.isalpha() and "".join(syllables) == word:
+                    self._add(word, syllables)
+
+    def query(self, word: str, rhyme: str = "consonant", syllables: int = 0,
+              offset: int = 0, limit: int = 50) -> Optional[Dict[str, object]]:
+        """Words rhyming with word (or with an ending such as 'ón'), most frequent
+        first, excluding word itself. None when word has no vowel to rhyme on.
+        """
+        word = word.lower()
+        entry = self.entries.get(word)
+        keys = (entry.stress, entry.consonant, entry.assonant) if entry else rhyme_keys(get_rules(self.lang).divide(word))
+        if keys is None:
+            return None
+        stress, consonant, assonant = keys
+        key = consonant if rhyme == "consonant" else assonant
+        postings = self._postings.get((rhyme, key, syllables), [])
+        skip = -1  # position of the word itself, left out of the results
+        if entry is not None and (not syllables or len(entry.syllables) == syllables):
+            skip = bisect.bisect_left(postings, (-entry.frequency, word))
+        start = offset + (0 <= skip <= offset)
+        page = [item for item in postings[start:start + limit + 1] if item[1] != word][:limit]
+        results = []
+        for _, other in page:
+            found = self.entries.get(other)
+            if found is None:  # removed by a concurrent update
+                continue
+            results.append({"word": other, "syllables": list(found.syllables), "frequency": found.frequency})
+        return {"rhyme": key, "stress": stress, "count": len(postings) - (skip >= 0), "results": results}
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "lang": self.lang,
+            "words": len(self.entries),
+            "wordlist_words": len(self.wordlist),
+            "keys": len(self._postings),
+            "build_ms": round(self.build_seconds * 1000, 3),
+        }
+
+
+def read_wordlist(path: str) -> Dict[str, int]:
+    """{word: frequency} from a "word [frequency]" per line file (frequency 0 if missing)."""
+    words: Dict[str, int] = {}
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            fields = line.split()
+            if not fields:
+                continue
+            word = fields[0].lower()
+            try:
+                frequency = int(fields[1]) if len(fields) > 1 else 0
+            except ValueError:
+                frequency = 0
+            words[word] = max(frequency, words.get(word, 0))
+    return words
+
+
+def build_index(lang: str = "es") -> RhymeIndex:
+    from apps.syllables.services.dictionary import current_rows
+
+    started = time.perf_counter()
+    index = RhymeIndex(lang)
+    path = getattr(settings, "SYLLABLE_RHYME_WORDLIST", "")
+    if path:
+        index.wordlist = read_wordlist(path)
+    rules = get_rules(lang)
+    entries: List[Tuple[str, Sequence[str]]] = [(word, rules.divide(word)) for word in index.wordlist]
+    try:
+        rows = current_rows(lang).order_by("source", "id").values_list("word", "syllables")
+        entries.extend((word, sylls) for word, sylls in rows.iterator(chunk_size=2000) if isinstance(sylls, list))
+    except DatabaseError:
+        logger.warning("Rhyme index: dictionary rows unavailable", exc_info=True)
+    index.load(entries)
+    index.build_seconds = time.perf_counter() - started
+    logger.info("Built the %s rhyme index (%d words) in %.2fs", lang, len(index.entries), index.build_seconds)
+    return index
+
+
+_indexes: Dict[str, RhymeIndex] = {}
+_build_lock = threading.Lock()
+
+
+def get_rhyme_index(lang: str = "es") -> RhymeIndex:
+    try:
+        return _indexes[lang]
+    except KeyError:
+        pass
+    with _build_lock:
+        if lang not in _indexes:
+            _indexes[lang] = build_index(lang)
+        return _indexes[lang]
+
+
+def update_word(word: str, lang: str, syllables: Optional[Sequence[str]]) -> None:
+    """Apply a dictionary change to the built index of lang, if any."""
+    index = _indexes.get(lang)
+    if index is not None:
+        index.update(word, syllables)
+
+
+def reset_rhyme_indexes() -> None:
+    with _build_lock:
+        _indexes.clear()
+
+
+def rhyme_stats() -> List[Dict[str, object]]:
+    return [index.stats() for index in list(_indexes.values())]
@@ -0,0 +1,79 @@
+import json
+from typing import Any, Iterable, Tuple
+
+from django.conf import settings
+from django.http import HttpResponse
+
+try:
+    import orjson
+except ImportError:  # optional dependency: fall back to the stdlib
+    orjson = None
+
+
+# JSON encoding/decoding for the syllable views.
+#
+# Uses orjson when it is installed (SYLLABLE_JSON_BACKEND = 'auto' | 'orjson' |
+# 'json'), the stdlib otherwise. Request bodies are decoded straight from bytes;
+# responses are written as compact UTF-8. Anything orjson refuses (lone
+# surrogates, integers beyond 64 bits) goes through the stdlib instead, so the
+# accepted input and produced output don't depend on the backend.
+#
+# Large documents are written piecewise: `json_object` splices already encoded
+# members (RawJSON) into the body, so e.g. split-syllables items are encoded one
+# line at a time instead of building every item dict up front.
+
+CONTENT_TYPE = "application/json"
+
+
+def backend() -> str:
+    choice = getattr(settings, "SYLLABLE_JSON_BACKEND", "auto")
+    if choice == "json" or orjson is None:
+        return "json"
+    return "orjson"
+
+
+def loads(data: bytes) -> Any:
+    """Parse a UTF-8 JSON body. Raises ValueError (json.JSONDecodeError or
+    UnicodeDecodeError) when it isn't valid.
+    """
+    if backend() == "orjson":
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # let the stdlib decide, it accepts e.g. escaped lone surrogates
+    return json.loads(data.decode("utf-8"))
+
+
+def dumps(payload: Any) -> bytes:
+    if backend() == "orjson":
+        try:
+            return orjson.dumps(payload)
+        except (orjson.JSONEncodeError, TypeError):
+            pass
+    text = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    try:
+        return text.encode("utf-8")
+    except UnicodeEncodeError:
+        # Lone surrogates can't be UTF-8: keep them as \uXXXX escapes
+        return json.dumps(payload, separators=(",", ":")).encode("ascii")
+
+
+def json_response(payload: Any, status: int = 200) -> HttpResponse:
+    return HttpResponse(dumps(payload), content_type=CONTENT_TYPE, status=status)
+
+
+class RawJSON(bytes):
+    """Already encoded JSON, inserted as is by `json_object`."""
+
+
+def json_array(parts: Iterable[bytes]) -> RawJSON:
+    """Join encoded values into a JSON array."""
+    return RawJSON(b"[" + b",".join(parts) + b"]")
+
+
+def json_object(members: Iterable[Tuple[str, Any]]) -> bytes:
+    """Encode (key, value) pairs as a JSON object; RawJSON values are spliced in."""
+    return b"{" + b",".join(
+        dumps(key) + b":" + (value if isinstance(value, RawJSON) else dumps(value))
+        for key, value in members
+    ) + b"}"
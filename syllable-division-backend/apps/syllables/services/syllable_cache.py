@@ -0,0 +1,129 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+
+# Process-wide, size-bounded LRU cache placed in front of the syllable divider.
+# Lyrics repeat the same words constantly, so most lookups are hits and skip
+# the nucleus/cluster analysis entirely. Capacity comes from settings
+# (SYLLABLE_CACHE_SIZE); hits/misses/evictions are tracked for sizing.
+# Values are tuples of syllables so callers can't mutate cached entries.
+
+
+DEFAULT_CACHE_SIZE = 50_000
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe LRU mapping with hit/miss/eviction counters.
+    With max_weight, entries also carry a weight (see `put`) and the least
+    recently used ones are evicted while the total exceeds it.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CACHE_SIZE, max_weight: int = 0):
+        self.capacity = max(0, int(capacity))
+        self.max_weight = max(0, int(max_weight))
+        self.weight = 0
+        self._data: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._weights: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value, weight: int = 1) -> None:
+        if self.capacity == 0:
+            return
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+            self._data[key] = value
+            if self.max_weight:
+                self.weight += weight - self._weights.get(key, 0)
+                self._weights[key] = weight
+            # The entry just put always stays, even if it is heavier than max_weight
+            while len(self._data) > self.capacity or (self.weight > self.max_weight > 0 and len(self._data) > 1):
+                old, _ = self._data.popitem(last=False)
+                self.weight -= self._weights.pop(old, 0)
+                self.evictions += 1
+
+    def discard(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            self.weight -= self._weights.pop(key, 0)
+
+    def clear(self, reset_stats: bool = True) -> None:
+        with self._lock:
+            self._data.clear()
+            self._weights.clear()
+            self.weight = 0
+            if reset_stats:
+                self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "capacity": self.capacity,
+                "size": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+            if self.max_weight:
+                stats.update(weight=self.weight, max_weight=self.max_weight)
+            return stats
+
+
+_cache: Optional[LRUCache] = None
+_cache_lock = threading.Lock()
+
+
+def _configured_capacity() -> int:
+    from django.conf import settings
+
+    if not settings.configured:
+        return DEFAULT_CACHE_SIZE
+    return int(getattr(settings, "SYLLABLE_CACHE_SIZE", DEFAULT_CACHE_SIZE))
+
+
+def get_syllable_cache() -> LRUCache:
+    """Return the process-wide syllable cache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LRUCache(_configured_capacity())
+    return _cache
+
+
+def reset_syllable_cache(capacity: Optional[int] = None) -> LRUCache:
+    """Drop the current cache (and its stats) and build a new one.
+    Mainly for tests and for resizing after a settings change.
+    """
+    global _cache
+    with _cache_lock:
+        _cache = LRUCache(_configured_capacity() if capacity is None else capacity)
+    return _cache
+
+
+def cache_stats() -> Dict[str, object]:
+    return get_syllable_cache().stats()
@@ -1,3 +1,6 @@
+from apps.syllables.services.dictionary import resolve_words
+
+
 def syllable_divider(word: str):
     """
     Divide a word into syllables using Spanish-oriented heuristics
@@ -181,9 +184,18 @@ def syllable_divider(word: str):
 
     return syllables
 
-# Alias para mantener compatibilidad con importaciones existentes
-def divide_into_syllables(word):
-    return syllable_divider(word)
+# Alias para mantener compatibilidad con importaciones existentes.
+# Goes through the process-wide LRU cache, the Syllable dictionary and the
+# table-driven engine with the rules of `lang` (see languages.py; Spanish by
+# default); `syllable_divider` above is kept as the reference implementation
+# the Spanish rules are tested against.
+def divide_into_syllables(word, lang=None):
+    if not word:
+        return []
+    return resolve_words((word,), lang)[word]
 
-def divide_words(words):
-    return {word: syllable_divider(word) for word in words}
\ No newline at end of file
+def divide_words(words, lang=None):
+    """Map each distinct word to its syllables (first-occurrence order).
+    Repeated words are syllabified once and dictionary misses are fetched in one query.
+    """
+    return resolve_words(words, lang)
\ No newline at end of file
@@ -0,0 +1,227 @@
+import hashlib
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+
+# Table-driven syllabification engine.
+#
+# A SyllableRules object compiles one language's rules (see languages.py) into
+# lookup tables once, at import time:
+# - every character is mapped to a one-letter class code with str.translate;
+# - vowel nuclei (diphthongs/triphthongs included) are found by a single compiled
+#   regex pass over that class string;
+# - the onset split of each consonant run between nuclei comes from an OnsetTable
+#   (transition tables over consonant classes), memoized per run.
+#
+# SPANISH gives the same output as `syllable_divider.syllable_divider` (which
+# stays as the reference implementation). Its class codes:
+#   S  strong vowel (a, e, o, with or without accent)
+#   W  weak vowel without accent (i, u, ü)
+#   T  accented (tonic) weak vowel (í, ú) -> always a nucleus of its own
+#   Y  'y' -> vowel only at the end of the word after another vowel ('buey', 'hoy')
+#   C  anything else (consonants, digits, apostrophes, hyphens...)
+
+# Allowed onset clusters in Spanish (approx.). Include digraphs as units.
+ALLOWED_CLUSTERS = frozenset({
+    "pr", "pl", "br", "bl", "tr", "dr",
+    "cr", "cl", "gr", "gl", "fr", "fl",
+    "ch", "ll", "rr",
+})
+DIGRAPHS = frozenset({"ch", "ll", "rr"})
+
+
+class OnsetTable:
+    """Decides how many trailing characters of the consonant run between two
+    nuclei open the next syllable, for a given set of onset clusters and
+    digraphs (e.g. Spanish ch/ll/rr count as one consonant). Clusters of up to
+    three units are supported; the longest allowed one wins.
+
+    Letters that appear in a cluster or digraph get a class id, everything else
+    is class 0. Units are class ids for single letters and extra ids for the
+    digraphs; the run is read left to right through three flat tables:
+      _digraph[a * n + b]  unit formed by letter classes a, b (0 = none)
+      _unit_len[u]         characters in unit u
+      _onset[u * m + v]    the units u, v together are an allowed onset
+      _onset3              u * m * m + v * m + w for allowed three-unit onsets
+    so no substring is sliced, joined or lowercased along the way. Results are
+    memoized per run.
+    """
+
+    def __init__(self, clusters, digraphs=frozenset()):
+        clusters = {c.lower() for c in clusters}
+        digraphs = {d.lower() for d in digraphs}
+        letters = sorted({ch for group in clusters | digraphs for ch in group})
+        self.clusters = frozenset(clusters)
+        self.digraphs = frozenset(digraphs)
+        self._letters = {ch: i for i, ch in enumerate(letters, 1)}
+        self._classes = dict(self._letters)
+        self._classes.update({ch.upper(): i for ch, i in self._letters.items() if len(ch.upper()) == 1})
+
+        n = len(letters) + 1
+        texts = [""] + letters  # unit id -> lowercase text
+        self._n = n
+        self._digraph = [0] * (n * n)
+        for digraph in sorted(digraphs):
+            if len(digraph) == 2:
+                self._digraph[self._letters[digraph[0]] * n + self._letters[digraph[1]]] = len(texts)
+                texts.append(digraph)
+        self._unit_len = [max(len(t), 1) for t in texts]
+        m = self._m = len(texts)
+        # Class 0 stands for "some other letter", never part of an allowed onset
+        self._onset = [False] * (m * m)
+        onset3 = set()
+        for cluster in clusters:
+            units = self._units(cluster)
+            if len(units) == 2:
+                self._onset[units[0] * m + units[1]] = True
+            elif len(units) == 3:
+                onset3.add((units[0] * m + units[1]) * m + units[2])
+        self._onset3 = frozenset(onset3)
+        self.onset_len = lru_cache(maxsize=4096)(self._onset_len)
+
+    def _units(self, run: str) -> List[int]:
+        """Unit ids of a consonant run, digraphs grouped left to right."""
+        digraph, n, size = self._digraph, self._n, len(run)
+        units = []
+        k = 0
+        while k < size:
+            cls = self._class(run[k])
+            unit = digraph[cls * n + self._class(run[k + 1])] if k + 1 < size else 0
+            if unit:
+                units.append(unit)
+                k += 2
+            else:
+                units.append(cls)
+                k += 1
+        return units
+
+    def _class(self, ch: str) -> int:
+        cls = self._classes.get(ch)
+        if cls is None:
+            # Non-ASCII letters lowercasing onto a cluster letter (e.g. KELVIN SIGN -> k)
+            cls = 0 if ch.isascii() else self._letters.get(ch.lower(), 0)
+            self._classes[ch] = cls
+        return cls
+
+    def _onset_len(self, run: str) -> int:
+        size = len(run)
+        if size < 2:
+            return size
+        digraph, unit_len, n, m = self._digraph, self._unit_len, self._n, self._m
+        first = prev = last = -1  # last three units
+        k = 0
+        cls = self._class(run[0])
+        while k < size:
+            nxt = self._class(run[k + 1]) if k + 1 < size else 0
+            unit = digraph[cls * n + nxt] if k + 1 < size else 0
+            if unit:
+                k += 2
+                cls = self._class(run[k]) if k < size else 0
+            else:
+                unit = cls
+                k += 1
+                cls = nxt
+            first, prev, last = prev, last, unit
+        if prev < 0:
+            # V C V -> V - CV (a single consonant or digraph)
+            return size
+        if first >= 0 and (first * m + prev) * m + last in self._onset3:
+            # VC - C1C2C3V ('mostro' -> 'mo-stro' in Italian)
+            return unit_len[first] + unit_len[prev] + unit_len[last]
+        if self._onset[prev * m + last]:
+            # V - CCV / VC1 - C2C3V
+            return unit_len[prev] + unit_len[last]
+        # VC - CV / VC1C2 - C3V
+        return unit_len[last]
+
+
+class SyllableRules:
+    """One language's syllabification rules, compiled into lookup tables.
+
+    classes  {class code: characters}; uppercase forms are added, any other
+             character is class 'C'
+    nucleus  regex over the class string matching one vowel nucleus; matches
+             of a group named 'silent' (e.g. English final 'e') are not nuclei
+    clusters allowed onset clusters; digraphs count as one consonant
+
+    `version` is a digest of the definition: dictionary rows computed with
+    other rules carry a different one and are ignored (see dictionary.py).
+    """
+
+    def __init__(
+        self,
+        code: str,
+        name: str,
+        *,
+        classes: Dict[str, str],
+        nucleus: str,
+        clusters: Iterable[str],
+        digraphs: Iterable[str] = (),
+    ):
+        self.code = code
+        self.name = name
+        clusters, digraphs = list(clusters), list(digraphs)
+        definition = repr((sorted(classes.items()), nucleus, sorted(clusters), sorted(digraphs)))
+        self.version = hashlib.sha1(definition.encode("utf-8")).hexdigest()[:12]
+        # Only ASCII needs an explicit 'C' entry: str.translate leaves unmapped characters
+        # untouched, and a non-ASCII character can never collide with an ASCII class code.
+        mapped = {}
+        for cls, chars in classes.items():
+            for ch in chars:
+                mapped[ord(ch)] = cls
+        for cp, cls in list(mapped.items()):
+            upper = chr(cp).upper()
+            if len(upper) == 1:
+                mapped.setdefault(ord(upper), cls)
+        self.class_table = {cp: "C" for cp in range(128)}
+        self.class_table.update(mapped)
+        self.nucleus_re = re.compile(nucleus)
+        self.silent = "silent" in self.nucleus_re.groupindex
+        self.onsets = OnsetTable(clusters, digraphs)
+
+    def __repr__(self) -> str:
+        return f"<SyllableRules {self.code}>"
+
+    def divide(self, word: str) -> List[str]:
+        if not word:
+            return []
+
+        matches = self.nucleus_re.finditer(word.translate(self.class_table))
+        if self.silent:
+            spans = [m.span() for m in matches if m.lastgroup != "silent"]
+        else:
+            spans = [m.span() for m in matches]
+        if not spans:
+            return [word]  # No vowels, return the whole word as one syllable
+
+        onset_len = self.onsets.onset_len
+        syllables = []
+        start_idx = 0
+        prev_end = spans[0][1]
+        for next_start, next_end in spans[1:]:
+            split_at = next_start - onset_len(word[prev_end:next_start])
+            syllables.append(word[start_idx:split_at])
+            start_idx = split_at
+            prev_end = next_end
+        syllables.append(word[start_idx:])
+        return syllables
+
+
+SPANISH = SyllableRules(
+    "es",
+    "Español",
+    classes={"S": "aáeéoó", "W": "iuü", "T": "íú", "Y": "y"},
+    # Order matters: triphthongs first, then diphthongs, then a single vowel.
+    # A final 'y' only counts when it closes a diphthong/triphthong.
+    nucleus=r"WS(?:W|Y\Z)|WW|SW|WS|[SW]Y\Z|[SWT]",
+    clusters=ALLOWED_CLUSTERS,
+    digraphs=DIGRAPHS,
+)
+
+
+def divide(word: str, rules: Optional[SyllableRules] = None) -> List[str]:
+    """Divide a word into syllables (Spanish rules by default, identical to
+    `syllable_divider`).
+    """
+    return (rules or SPANISH).divide(word)
@@ -0,0 +1,378 @@
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+from apps.syllables.services.dictionary import resolve_words
+from apps.syllables.services.instrumentation import add_counts, span, timed_call, timed_iter
+from apps.syllables.services.meter import LineMeter, line_meter, meter_payload
+from apps.syllables.services.tokenizer import (
+    CODE_WORD,
+    TYPE_CODES,
+    TYPE_NAMES,
+    WORD,
+    TokenArrays,
+    tokenize_compact,
+    tokenize_lines,
+    unique_tokens,
+)
+from apps.syllables.services.word_splitter import get_profile
+
+
+# Core of `split-syllables/`: one tokenizer pass over the whole text, words are
+# syllabified as they come and counts are accumulated on the way. Lines are
+# produced lazily so the streaming (NDJSON) mode never holds the whole document.
+#
+# Whole-document responses use `syllabify_compact` instead: the tokens stay in
+# parallel arrays (type codes, texts, shared syllable tuples) and the public
+# per-item dicts are only built line by line while serializing.
+#
+# With metric=True every line also gets its sung syllable count (synalepha and
+# final stress, see meter.py), computed in the same walk over the line's words.
+
+
+class LineResult(NamedTuple):
+    index: int
+    start: int  # span of the line in the original text
+    end: int
+    items: List[Dict[str, Any]]
+    syllables: int
+    words: int = 0
+    punct: int = 0
+    punct_open: int = 0
+    punct_close: int = 0
+    meter: Optional[LineMeter] = None
+
+
+class SyllabifyCounts:
+    """Counters accumulated line by line while syllabifying."""
+
+    __slots__ = (
+        "lines", "words", "punct", "punct_open", "punct_close",
+        "syllables_total", "syllables_per_line",
+    )
+
+    def __init__(self, keep_per_line: bool = True):
+        self.lines = 0
+        self.words = 0
+        self.punct = 0
+        self.punct_open = 0
+        self.punct_close = 0
+        self.syllables_total = 0
+        # None when streaming: each streamed line already carries its own count
+        self.syllables_per_line: Optional[List[int]] = [] if keep_per_line else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        counts = {
+            "lines": self.lines,
+            "total with symbols": self.words + self.punct,
+            "words": self.words,
+            "punct": self.punct,
+            "punct_open": self.punct_open,
+            "punct_close": self.punct_close,
+            "punct_total": self.punct_open + self.punct_close,
+            "syllables_total": self.syllables_total,
+        }
+        if self.syllables_per_line is not None:
+            counts["syllables_per_line"] = self.syllables_per_line
+        return counts
+
+    def add_line(self, line: LineResult) -> None:
+        self.lines += 1
+        self.words += line.words
+        self.punct += line.punct
+        self.punct_open += line.punct_open
+        self.punct_close += line.punct_close
+        self.syllables_total += line.syllables
+        if self.syllables_per_line is not None:
+            self.syllables_per_line.append(line.syllables)
+
+    def remove_line(self, line: LineResult) -> None:
+        """Undo add_line (only for counts that don't keep per-line syllables)."""
+        self.lines -= 1
+        self.words -= line.words
+        self.punct -= line.punct
+        self.punct_open -= line.punct_open
+        self.punct_close -= line.punct_close
+        self.syllables_total -= line.syllables
+
+    def report(self) -> None:
+        """Add the totals to the current request's metrics (no-op outside one)."""
+        add_counts(
+            lines=self.lines,
+            tokens=self.words + self.punct,
+            words=self.words,
+            syllables=self.syllables_total,
+        )
+
+    @classmethod
+    def from_dict(cls, counts: Dict[str, Any]) -> "SyllabifyCounts":
+        """Inverse of as_dict."""
+        self = cls(keep_per_line="syllables_per_line" in counts)
+        for name in ("lines", "words", "punct", "punct_open", "punct_close", "syllables_total"):
+            setattr(self, name, counts[name])
+        if self.syllables_per_line is not None:
+            self.syllables_per_line = list(counts["syllables_per_line"])
+        return self
+
+    def merge(self, other: "SyllabifyCounts") -> None:
+        """Append the counts of a following chunk of the same text."""
+        self.lines += other.lines
+        self.words += other.words
+        self.punct += other.punct
+        self.punct_open += other.punct_open
+        self.punct_close += other.punct_close
+        self.syllables_total += other.syllables_total
+        if self.syllables_per_line is not None and other.syllables_per_line is not None:
+            self.syllables_per_line.extend(other.syllables_per_line)
+
+
+def iter_syllabified_lines(
+    text: str,
+    counts: Optional[SyllabifyCounts] = None,
+    *,
+    include_numbers: bool = True,
+    keep_hyphens: bool = False,
+    keep_punct: bool = True,
+    attach_punct: str = "auto",
+    normalize_ellipsis: bool = True,
+    lower: bool = False,
+    min_len: int = 1,
+    unique: bool = False,
+    lang: Optional[str] = None,
+    metric: bool = False,
+    resolve: Callable[[Iterable[str], Optional[str]], Dict[str, List[str]]] = resolve_words,
+) -> Iterator[LineResult]:
+    """Yield one LineResult per line of text (str.splitlines() semantics).
+    Each item is { type: 'word'|'punct'|'punct_open'|'punct_close', token: str, [syllables]: [...] }.
+    If counts is given it is updated as lines are produced. `resolve` maps a
+    line's words and `lang` to their syllables (cache + dictionary + heuristic
+    by default). With metric, each line also carries its LineMeter.
+    """
+    profile = get_profile(include_numbers, keep_hyphens)
+    opening = profile.opening
+    closing = profile.closing
+    resolve = timed_call(resolve, "syllabify")
+
+    for index, (start, end, tokens) in enumerate(timed_iter(tokenize_lines(
+        text,
+        include_numbers=include_numbers,
+        keep_hyphens=keep_hyphens,
+        keep_punct=keep_punct,
+        lower=lower,
+        min_len=min_len,
+        normalize_ellipsis=normalize_ellipsis,
+    ), "tokenize")):
+        if unique:
+            tokens = unique_tokens(tokens, attach_punct, keep_hyphens)
+
+        # Resolve the line's words together: dictionary misses cost one query per line
+        line_words = [tok.text.replace("-", "") if tok.type == WORD else None for tok in tokens]
+        resolved = resolve((w for w in line_words if w is not None), lang)
+
+        line_items = []
+        line_syllables = 0
+        words = 0
+        word_syllables = [] if metric else None
+        for tok, word in zip(tokens, line_words):
+            if word is not None:
+                sylls = resolved[word]
+                line_items.append({"type": WORD, "token": word, "syllables": sylls})
+                line_syllables += len(sylls)
+                words += 1
+                if metric:
+                    word_syllables.append(sylls)
+            else:
+                line_items.append({"type": tok.type, "token": tok.text})
+
+        line = LineResult(
+            index,
+            start,
+            end,
+            line_items,
+            line_syllables,
+            words,
+            len(line_items) - words,
+            # Count punctuation in the original text to capture opening signs even if attached
+            sum(text.count(ch, start, end) for ch in opening),
+            sum(text.count(ch, start, end) for ch in closing),
+            line_meter(word_syllables) if metric else None,
+        )
+        if counts is not None:
+            counts.add_line(line)
+        yield line
+
+
+def syllabify_text(text: str, **options) -> Dict[str, Any]:
+    """Split text by lines and syllabify word tokens.
+    Returns {"items": [[item, ...], ...], "counts": {...}}, plus "meter" (one
+    entry per line) with metric=True.
+    """
+    counts = SyllabifyCounts()
+    lines = list(iter_syllabified_lines(text, counts, **options))
+    counts.report()
+    result = {"items": [line.items for line in lines], "counts": counts.as_dict()}
+    if options.get("metric"):
+        result["meter"] = [meter_payload(line.meter) for line in lines]
+    return result
+
+
+class SyllabifiedText:
+    """Compact split-syllables result: tokens of line i are
+    texts[line_offsets[i]:line_offsets[i + 1]], syllables[j] holds the (shared,
+    read-only) syllables of token j, or None for punctuation. meter[i] is the
+    LineMeter of line i when it was requested.
+    """
+
+    __slots__ = ("types", "texts", "syllables", "line_offsets", "counts", "meter")
+
+    def __init__(
+        self,
+        types: bytearray,
+        texts: List[str],
+        syllables: List[Optional[Sequence[str]]],
+        line_offsets: List[int],
+        counts: Dict[str, Any],
+        meter: Optional[List[LineMeter]] = None,
+    ):
+        self.types = types
+        self.texts = texts
+        self.syllables = syllables
+        self.line_offsets = line_offsets
+        self.counts = counts
+        self.meter = meter
+
+    def __len__(self) -> int:
+        return len(self.line_offsets) - 1
+
+    def add_meter(self) -> None:
+        """Compute the meter of every line (for results built without metric)."""
+        syllables, offsets = self.syllables, self.line_offsets
+        self.meter = [
+            line_meter(sylls for sylls in syllables[offsets[i]:offsets[i + 1]] if sylls is not None)
+            for i in range(len(offsets) - 1)
+        ]
+
+    def line_items(self, index: int) -> List[Dict[str, Any]]:
+        """Items of one line in the public shape ({type, token, [syllables]})."""
+        items = []
+        types, texts, syllables = self.types, self.texts, self.syllables
+        for j in range(self.line_offsets[index], self.line_offsets[index + 1]):
+            code = types[j]
+            if code == CODE_WORD:
+                items.append({"type": WORD, "token": texts[j], "syllables": syllables[j]})
+            else:
+                items.append({"type": TYPE_NAMES[code], "token": texts[j]})
+        return items
+
+    def columnar(self) -> Dict[str, Any]:
+        """Parallel arrays for ?format=columnar:
+          line_offsets      tokens of line i are tokens[line_offsets[i]:line_offsets[i + 1]]
+          types             type code per token (index into type_names)
+          tokens            token text
+          syllable_offsets  syllables of token j are syllables[syllable_offsets[j]:syllable_offsets[j + 1]]
+          syllables         flat list of syllables (punctuation contributes none)
+        and with the meter:
+          beats             beat of each entry of syllables, numbered per line
+          metrical_syllables_per_line, synalephas_per_line, final_stress_per_line
+        """
+        flat: List[str] = []
+        offsets = [0]
+        for sylls in self.syllables:
+            if sylls:
+                flat.extend(sylls)
+            offsets.append(len(flat))
+        columns = {
+            "type_names": list(TYPE_NAMES),
+            "line_offsets": self.line_offsets,
+            "types": list(self.types),
+            "tokens": self.texts,
+            "syllable_offsets": offsets,
+            "syllables": flat,
+        }
+        if self.meter is not None:
+            columns["beats"] = [beat for meter in self.meter for beat in meter.beats]
+            columns["metrical_syllables_per_line"] = [meter.syllables for meter in self.meter]
+            columns["synalephas_per_line"] = [meter.synalephas for meter in self.meter]
+            columns["final_stress_per_line"] = [meter.final_stress for meter in self.meter]
+        return columns
+
+
+def _unique_arrays(text: str, attach_punct: str, options: Dict[str, Any]) -> TokenArrays:
+    # unique=True needs the Token records to group attached punctuation
+    types = bytearray()
+    texts: List[str] = []
+    line_offsets = [0]
+    for _, _, tokens in tokenize_lines(text, **options):
+        for tok in unique_tokens(tokens, attach_punct, options["keep_hyphens"]):
+            types.append(TYPE_CODES[tok.type])
+            texts.append(tok.text)
+        line_offsets.append(len(texts))
+    return TokenArrays(types, texts, line_offsets)
+
+
+def syllabify_compact(
+    text: str,
+    *,
+    include_numbers: bool = True,
+    keep_hyphens: bool = False,
+    keep_punct: bool = True,
+    attach_punct: str = "auto",
+    normalize_ellipsis: bool = True,
+    lower: bool = False,
+    min_len: int = 1,
+    unique: bool = False,
+    lang: Optional[str] = None,
+    metric: bool = False,
+    resolve: Optional[Callable[[Iterable[str], Optional[str]], Dict[str, Sequence[str]]]] = None,
+) -> SyllabifiedText:
+    """Same result as `syllabify_text`, as a SyllabifiedText. The distinct words
+    of the whole text are resolved at once (one dictionary query per chunk of
+    misses instead of per line) and no per-token record or dict is allocated.
+    `resolve` replaces the dictionary lookup as in `iter_syllabified_lines`.
+    """
+    options = {
+        "include_numbers": include_numbers,
+        "keep_hyphens": keep_hyphens,
+        "keep_punct": keep_punct,
+        "lower": lower,
+        "min_len": min_len,
+        "normalize_ellipsis": normalize_ellipsis,
+    }
+    with span("tokenize"):
+        if unique:
+            types, texts, line_offsets = _unique_arrays(text, attach_punct, options)
+        else:
+            types, texts, line_offsets = tokenize_compact(text, **options)
+
+    counts = SyllabifyCounts()
+    with span("syllabify"):
+        if keep_hyphens:
+            # Hyphenated words are syllabified (and returned) without the hyphens
+            texts = [t.replace("-", "") if code == CODE_WORD else t for t, code in zip(texts, types)]
+        words = (t for t, code in zip(texts, types) if code == CODE_WORD)
+        resolved = resolve(words, lang) if resolve else resolve_words(words, lang, copy=False)
+        syllables: List[Optional[Sequence[str]]] = [
+            resolved[t] if code == CODE_WORD else None for t, code in zip(texts, types)
+        ]
+
+        per_line = counts.syllables_per_line
+        meter: Optional[List[LineMeter]] = [] if metric else None
+        for i in range(len(line_offsets) - 1):
+            line = syllables[line_offsets[i]:line_offsets[i + 1]]
+            line_syllables = 0
+            for sylls in line:
+                if sylls is not None:
+                    line_syllables += len(sylls)
+            per_line.append(line_syllables)
+            if metric:
+                meter.append(line_meter(sylls for sylls in line if sylls is not None))
+        counts.syllables_total = sum(per_line)
+
+    counts.lines = len(line_offsets) - 1
+    counts.words = types.count(CODE_WORD)
+    counts.punct = len(types) - counts.words
+    # Opening/closing signs in the original text, attached or not. Line breaks
+    # are never among them, so whole-text counts equal the per-line sums.
+    profile = get_profile(include_numbers, keep_hyphens)
+    counts.punct_open = sum(text.count(ch) for ch in profile.opening)
+    counts.punct_close = sum(text.count(ch) for ch in profile.closing)
+    counts.report()
+    return SyllabifiedText(types, texts, syllables, line_offsets, counts.as_dict(), meter)
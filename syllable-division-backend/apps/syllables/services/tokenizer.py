@@ -0,0 +1,214 @@
+from typing import Iterator, List, NamedTuple, Tuple
+
+from apps.syllables.services.word_splitter import CLOSING, DASHLIKE, OPENING, get_profile
+
+
+# Single-pass streaming tokenizer used by `split-syllables/`.
+#
+# One precompiled regex (from the shared TokenizerProfile) walks the whole text and
+# emits typed tokens with their spans in the original text:
+#   word | punct_open | punct_close | punct | newline
+# Line breaks follow str.splitlines() semantics, '...' runs are normalized to
+# '…' on the fly, and punctuation is classified while scanning, so callers no
+# longer re-split per line or rebuild regexes per token.
+
+WORD = "word"
+PUNCT = "punct"
+PUNCT_OPEN = "punct_open"
+PUNCT_CLOSE = "punct_close"
+NEWLINE = "newline"
+
+ATTACH_MODES = {"separate", "left", "right", "auto"}
+
+# Interned type codes of the compact representation (index into TYPE_NAMES).
+TYPE_NAMES = (WORD, PUNCT, PUNCT_OPEN, PUNCT_CLOSE)
+TYPE_CODES = {name: code for code, name in enumerate(TYPE_NAMES)}
+CODE_WORD, CODE_PUNCT, CODE_PUNCT_OPEN, CODE_PUNCT_CLOSE = range(len(TYPE_NAMES))
+
+
+class Token(NamedTuple):
+    type: str
+    text: str
+    start: int
+    end: int
+
+
+class TokenArrays(NamedTuple):
+    """Compact token stream of a whole text: parallel arrays instead of Token records.
+    Tokens of line i are texts[line_offsets[i]:line_offsets[i + 1]].
+    """
+    types: bytearray  # type codes (see TYPE_NAMES)
+    texts: List[str]
+    line_offsets: List[int]
+
+
+def tokenize(
+    text: str,
+    *,
+    include_numbers: bool = True,
+    keep_hyphens: bool = False,
+    keep_punct: bool = True,
+    lower: bool = False,
+    min_len: int = 1,
+    normalize_ellipsis: bool = True,
+) -> Iterator[Token]:
+    """Yield typed tokens for text in a single pass.
+    Words shorter than min_len are dropped (after lowercasing); punctuation is
+    only emitted when keep_punct is True. Newline tokens are always emitted.
+    """
+    profile = get_profile(include_numbers, keep_hyphens)
+    opening = profile.opening
+    closing = profile.closing
+    for m in profile.stream_regex.finditer(text):
+        kind = m.lastgroup
+        start, end = m.span()
+        if kind == WORD:
+            tok = m.group()
+            if lower:
+                tok = tok.lower()
+            if len(tok) < min_len:
+                continue
+            yield Token(WORD, tok, start, end)
+        elif kind == NEWLINE:
+            yield Token(NEWLINE, m.group(), start, end)
+        elif not keep_punct:
+            continue
+        elif kind == "dots":
+            # '...' -> '…', '....' -> '….' (remainder dots stay as '.')
+            n = end - start
+            if normalize_ellipsis:
+                for k in range(n // 3):
+                    yield Token(PUNCT_CLOSE, "…", start + 3 * k, start + 3 * k + 3)
+                first_dot = start + 3 * (n // 3)
+            else:
+                first_dot = start
+            for pos in range(first_dot, end):
+                yield Token(PUNCT_CLOSE, ".", pos, pos + 1)
+        else:
+            ch = m.group()
+            if ch in opening:
+                yield Token(PUNCT_OPEN, ch, start, end)
+            elif ch in closing:
+                yield Token(PUNCT_CLOSE, ch, start, end)
+            else:
+                yield Token(PUNCT, ch, start, end)
+
+
+def tokenize_lines(text: str, **options) -> Iterator[Tuple[int, int, List[Token]]]:
+    """Group the token stream into lines: yield (line_start, line_end, tokens).
+    Lines match text.splitlines(): a trailing line break does not open a new line.
+    """
+    line_start = 0
+    line: List[Token] = []
+    for tok in tokenize(text, **options):
+        if tok.type == NEWLINE:
+            yield line_start, tok.start, line
+            line_start = tok.end
+            line = []
+        else:
+            line.append(tok)
+    if line_start < len(text):
+        yield line_start, len(text), line
+
+
+def tokenize_compact(
+    text: str,
+    *,
+    include_numbers: bool = True,
+    keep_hyphens: bool = False,
+    keep_punct: bool = True,
+    lower: bool = False,
+    min_len: int = 1,
+    normalize_ellipsis: bool = True,
+) -> TokenArrays:
+    """Same tokens and lines as `tokenize_lines`, without a record per token."""
+    profile = get_profile(include_numbers, keep_hyphens)
+    opening = profile.opening
+    closing = profile.closing
+    types = bytearray()
+    texts: List[str] = []
+    line_offsets = [0]
+    add_type = types.append
+    add_text = texts.append
+    line_start = 0
+    for m in profile.stream_regex.finditer(text):
+        kind = m.lastgroup
+        if kind == WORD:
+            tok = m.group()
+            if lower:
+                tok = tok.lower()
+            if len(tok) < min_len:
+                continue
+            add_type(CODE_WORD)
+            add_text(tok)
+        elif kind == NEWLINE:
+            line_offsets.append(len(texts))
+            line_start = m.end()
+        elif not keep_punct:
+            continue
+        elif kind == "dots":
+            n = m.end() - m.start()
+            if normalize_ellipsis:
+                types.extend([CODE_PUNCT_CLOSE] * (n // 3))
+                texts.extend(["…"] * (n // 3))
+                n %= 3
+            types.extend([CODE_PUNCT_CLOSE] * n)
+            texts.extend(["."] * n)
+        else:
+            ch = m.group()
+            add_type(CODE_PUNCT_OPEN if ch in opening else CODE_PUNCT_CLOSE if ch in closing else CODE_PUNCT)
+            add_text(ch)
+    if line_start < len(text):
+        line_offsets.append(len(texts))
+    return TokenArrays(types, texts, line_offsets)
+
+
+def attach_groups(tokens: List[Token], attach_punct: str, keep_hyphens: bool) -> List[List[Token]]:
+    """Group punctuation with neighbouring words the same way `split_words`
+    attaches it ('left' | 'right' | 'auto'; anything else keeps tokens separate).
+    """
+    if attach_punct not in ATTACH_MODES or attach_punct == "separate":
+        return [[tok] for tok in tokens]
+
+    groups: List[List[Token]] = []
+    i = 0
+    n = len(tokens)
+    while i < n:
+        tok = tokens[i]
+        if tok.type == WORD:
+            groups.append([tok])
+            i += 1
+            continue
+        ch = tok.text
+        if attach_punct == "left":
+            direction = "left"
+        elif attach_punct == "right":
+            direction = "right"
+        elif ch in OPENING or ch in DASHLIKE or (ch == "-" and not keep_hyphens):
+            direction = "right"
+        elif ch in CLOSING:
+            direction = "left"
+        else:
+            direction = None
+
+        if direction == "left" and groups and len(groups[-1]) == 1 and groups[-1][0].type == WORD:
+            groups[-1].append(tok)
+        elif direction == "right" and i + 1 < n and tokens[i + 1].type == WORD:
+            groups.append([tok, tokens[i + 1]])
+            i += 1
+        else:
+            groups.append([tok])
+        i += 1
+    return groups
+
+
+def unique_tokens(tokens: List[Token], attach_punct: str, keep_hyphens: bool) -> List[Token]:
+    """Drop repeated (attached) tokens within a line, keeping the first occurrence."""
+    seen = set()
+    out: List[Token] = []
+    for group in attach_groups(tokens, attach_punct, keep_hyphens):
+        key = "".join(tok.text for tok in group)
+        if key not in seen:
+            seen.add(key)
+            out.extend(group)
+    return out
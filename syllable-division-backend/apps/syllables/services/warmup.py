@@ -0,0 +1,62 @@
+import logging
+import threading
+import time
+from typing import Dict, Tuple
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.urls import get_resolver
+
+from apps.syllables.services.dictionary import warm_start
+from apps.syllables.services.languages import LANGUAGES
+from apps.syllables.services.lexicon import get_lexicon
+from apps.syllables.services.rhymes import RHYME_LANGS, get_rhyme_index
+
+
+# Worker warmup and readiness.
+#
+# config/wsgi.py and config/asgi.py call `warm_up` once the application is
+# loaded. Under gunicorn with preload_app (see gunicorn.conf.py) that happens
+# once in the master before forking, so workers inherit the imported views,
+# the compiled tokenizer profiles and language tables, the mapped lexicons, the
+# preloaded cache and rhyme index instead of each building them. /readyz/
+# answers 503 until it has finished and while the database is unreachable.
+
+logger = logging.getLogger(__name__)
+
+_ready = threading.Event()
+_report: Dict[str, object] = {}
+
+
+def warm_up() -> None:
+    started = time.perf_counter()
+    get_resolver().url_patterns  # imports every view and the services behind them
+    lexicons = {lang: len(lexicon) for lang in LANGUAGES if (lexicon := get_lexicon(lang)) is not None}
+    warm_start()
+    if getattr(settings, "SYLLABLE_RHYME_PRELOAD", False):
+        for lang in RHYME_LANGS:
+            get_rhyme_index(lang)
+    _report.update(seconds=round(time.perf_counter() - started, 3), lexicons=lexicons)
+    _ready.set()
+    logger.info("Syllable service warmed up in %.2fs", _report["seconds"])
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def readiness() -> Tuple[bool, Dict[str, object]]:
+    """(ready, details) for the readiness probe."""
+    if not _ready.is_set():
+        return False, {"status": "starting"}
+    try:
+        connection.ensure_connection()
+    except DatabaseError:
+        logger.warning("Readiness check: database unavailable", exc_info=True)
+        return False, {"status": "unavailable", "database": False}
+    return True, {"status": "ready", "database": True, "warmup": dict(_report)}
+
+
+def reset_readiness() -> None:
+    _ready.clear()
+    _report.clear()
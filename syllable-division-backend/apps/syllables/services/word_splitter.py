@@ -1,15 +1,34 @@
 import re
-from typing import List
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
 
 
 # Unicode-aware word splitter for Spanish/English.
 # - Includes accented letters and ñ/ü.
 # - Optionally includes numbers and hyphens inside tokens.
 # - Keeps simple English contractions like don't, it's as one token.
+#
+# There are only four option combinations that change the patterns
+# (include_numbers x keep_hyphens), so every regex is compiled once at import
+# into a TokenizerProfile and shared by split_words, the streaming tokenizer
+# and the views.
 
 
 _LETTER_SET = "A-Za-zÁÉÍÓÚÜáéíóúüÑñ"
 
+# Punctuation set includes Spanish inverted marks and common punctuation.
+_PUNCT_CHARS = r"\?\!¡¿,\.;:…\(\)\[\]\{\}\"“”‘’«»—–_"
+
+# Everything str.splitlines() treats as a line boundary ('\r\n' first).
+_LINE_BREAK = r"\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]"
+
+_ELLIPSIS_RE = re.compile(r"\.{3,}")
+
+OPENING = frozenset({"¿", "¡", "(", "[", "{", "«", "“", "‘"})
+CLOSING = frozenset({"?", "!", ")", "]", "}", "»", "”", "’", ",", ".", ";", ":", "…"})
+DASHLIKE = frozenset({"—", "–", "_"})
+
 
 def _word_pattern_str(include_numbers: bool, keep_hyphens: bool) -> str:
     num = "0-9" if include_numbers else ""
@@ -20,20 +39,88 @@ def _word_pattern_str(include_numbers: bool, keep_hyphens: bool) -> str:
     return pattern
 
 
+def _punct_chars(keep_hyphens: bool) -> str:
+    # If hyphens are not kept inside words, treat '-' as punctuation
+    return _PUNCT_CHARS if keep_hyphens else "-" + _PUNCT_CHARS
+
+
+@dataclass(frozen=True)
+class TokenizerProfile:
+    """Precompiled tokenizer state for one (include_numbers, keep_hyphens) combination."""
+
+    include_numbers: bool
+    keep_hyphens: bool
+    word_pattern: str
+    word_finder: re.Pattern  # unanchored word pattern (findall)
+    word_regex: re.Pattern  # matches a full word token
+    combined_regex: re.Pattern  # word | single punctuation char
+    stream_regex: re.Pattern  # newline | word | '...' run | punctuation (streaming tokenizer)
+    punct_chars: str
+    opening: frozenset
+    closing: frozenset  # includes '-' when hyphens are not kept inside words
+    build_seconds: float
+
+
+def _build_profile(include_numbers: bool, keep_hyphens: bool) -> TokenizerProfile:
+    started = time.perf_counter()
+    word_pat = _word_pattern_str(include_numbers=include_numbers, keep_hyphens=keep_hyphens)
+    punct_chars = _punct_chars(keep_hyphens)
+    return TokenizerProfile(
+        include_numbers=include_numbers,
+        keep_hyphens=keep_hyphens,
+        word_pattern=word_pat,
+        word_finder=re.compile(word_pat),
+        word_regex=re.compile(rf"^(?:{word_pat})$"),
+        combined_regex=re.compile(rf"(?P<word>{word_pat})|[{punct_chars}]"),
+        stream_regex=re.compile(
+            rf"(?P<newline>{_LINE_BREAK})|(?P<word>{word_pat})|(?P<dots>\.{{3,}})|(?P<punct>[{punct_chars}])"
+        ),
+        punct_chars=punct_chars,
+        opening=OPENING,
+        closing=CLOSING if keep_hyphens else CLOSING | {"-"},
+        build_seconds=time.perf_counter() - started,
+    )
+
+
+_PROFILES: Dict[Tuple[bool, bool], TokenizerProfile] = {
+    (include_numbers, keep_hyphens): _build_profile(include_numbers, keep_hyphens)
+    for include_numbers in (True, False)
+    for keep_hyphens in (True, False)
+}
+
+
+def get_profile(include_numbers: bool, keep_hyphens: bool) -> TokenizerProfile:
+    """Return the shared precompiled profile for these tokenizer options."""
+    return _PROFILES[(bool(include_numbers), bool(keep_hyphens))]
+
+
+def profile_stats() -> List[Dict[str, object]]:
+    """Build cost of each tokenizer profile (compiled once at import)."""
+    return [
+        {
+            "include_numbers": p.include_numbers,
+            "keep_hyphens": p.keep_hyphens,
+            "build_ms": round(p.build_seconds * 1000, 3),
+        }
+        for p in _PROFILES.values()
+    ]
+
+
 def get_word_regex(include_numbers: bool, keep_hyphens: bool) -> re.Pattern:
     """Return a compiled regex that matches a full word token under current options."""
-    pat = _word_pattern_str(include_numbers=include_numbers, keep_hyphens=keep_hyphens)
-    return re.compile(rf"^(?:{pat})$")
+    return get_profile(include_numbers, keep_hyphens).word_regex
 
 
 def get_punct_chars(keep_hyphens: bool) -> str:
     """Return the punctuation character class string used by tokenizer.
     If keep_hyphens is False, '-' is considered punctuation.
     """
-    punct_chars = r"\?\!¡¿,\.;:…\(\)\[\]\{\}\"“”‘’«»—–_"
-    if not keep_hyphens:
-        punct_chars = "-" + punct_chars
-    return punct_chars
+    return _punct_chars(keep_hyphens)
+
+
+def _ell_sub(m: re.Match) -> str:
+    dots = len(m.group(0))
+    return "…" * (dots // 3) + "." * (dots % 3)
 
 
 def split_words(
@@ -54,18 +141,14 @@ def split_words(
     if normalize_ellipsis:
         # Replace sequences of three or more dots with '…' repeated.
         # e.g., '...' -> '…', '......' -> '……', '....' -> '….', leaving a remainder dot when not multiple of 3
-        def _ell_sub(m: re.Match) -> str:
-            dots = len(m.group(0))
-            return "…" * (dots // 3) + "." * (dots % 3)
-
-        text = re.sub(r"\.{3,}", _ell_sub, text)
+        text = _ELLIPSIS_RE.sub(_ell_sub, text)
 
-    word_pat_str = _word_pattern_str(include_numbers=include_numbers, keep_hyphens=keep_hyphens)
-    word_regex = re.compile(rf"^(?:{word_pat_str})$")
+    profile = get_profile(include_numbers, keep_hyphens)
+    word_regex = profile.word_regex
 
     if not keep_punct:
         # Simple path: only words
-        tokens = re.findall(word_pat_str, text)
+        tokens = profile.word_finder.findall(text)
 
         if lower:
             tokens = [t.lower() for t in tokens]
@@ -85,19 +168,10 @@ def split_words(
         return tokens
 
     # keep_punct=True: include punctuation tokens as separate items, preserving order
-    # Punctuation set includes Spanish inverted marks and common punctuation.
-    punct_chars = r"\?\!¡¿,\.;:…\(\)\[\]\{\}\"“”‘’«»—–_"
-    # If hyphens are not kept inside words, treat '-' as punctuation
-    if not keep_hyphens:
-        punct_chars = "-" + punct_chars
-
-    combined = re.compile(rf"{word_pat_str}|[{punct_chars}]")
-
     out: List[str] = []
-    for m in combined.finditer(text):
+    for m in profile.combined_regex.finditer(text):
         tok = m.group(0)
-        is_word = bool(word_regex.match(tok))
-        if is_word:
+        if m.lastgroup == "word":
             if lower:
                 tok = tok.lower()
             if len(tok) < min_len:
@@ -110,9 +184,9 @@ def split_words(
         attach_punct = "separate"
 
     if keep_punct and attach_punct != "separate":
-        opening = {"¿", "¡", "(", "[", "{", "«", "“", "‘"}
-        closing = {"?", "!", ")", "]", "}", "»", "”", "’", ",", ".", ";", ":", "…"}
-        dashlike = {"—", "–", "_"}
+        opening = profile.opening
+        closing = profile.closing
+        dashlike = DASHLIKE
         hyphen = {"-"}
 
         def is_word_token(t: str) -> bool:
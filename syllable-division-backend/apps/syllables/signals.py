@@ -0,0 +1,27 @@
+from django.core.signals import request_finished
+from django.db.models.signals import post_delete, post_save
+
+from apps.syllables.models import Syllable
+from apps.syllables.services import dictionary, response_cache, rhymes
+
+
+def _invalidate_cached_word(sender, instance, **_kwargs):
+    # Curated corrections must be visible to the next lookup, not after eviction
+    dictionary.invalidate(instance.word, instance.lang)
+    response_cache.bump_generation()
+
+
+def _reindex_saved_word(sender, instance, **_kwargs):
+    rhymes.update_word(instance.word, instance.lang, instance.syllables if isinstance(instance.syllables, list) else None)
+
+
+def _reindex_deleted_word(sender, instance, **_kwargs):
+    rhymes.update_word(instance.word, instance.lang, None)
+
+
+def connect():
+    post_save.connect(_invalidate_cached_word, sender=Syllable, dispatch_uid="syllable_cache_save")
+    post_delete.connect(_invalidate_cached_word, sender=Syllable, dispatch_uid="syllable_cache_delete")
+    post_save.connect(_reindex_saved_word, sender=Syllable, dispatch_uid="syllable_rhymes_save")
+    post_delete.connect(_reindex_deleted_word, sender=Syllable, dispatch_uid="syllable_rhymes_delete")
+    request_finished.connect(dictionary.flush_writeback, dispatch_uid="syllable_writeback")
@@ -0,0 +1,84 @@
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from apps.syllables.models import Syllable
+from apps.syllables.services import analytics
+from apps.syllables.services.text_syllabifier import syllabify_text
+
+SONGS = {
+    "uno": "¿Qué pasa, amor?\n\nLa casa... la calle\n¡Ay!",
+    "dos": "",
+    "tres": "\n\n(palabra) 2024\nauto-estima\n",
+}
+
+
+@override_settings(SYLLABLE_DICTIONARY_WRITEBACK=False)
+class CorpusAnalyticsTests(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(content)
+        return path
+
+    def analyze(self, **options):
+        songs = [(song_id, text.splitlines(keepends=True)) for song_id, text in SONGS.items()]
+        return analytics.analyze_corpus(songs, **options)
+
+    def test_counts_match_split_syllables(self):
+        index, columns, stats = self.analyze()
+        expected = [syllabify_text(text, keep_punct=False, lower=True)["counts"] for text in SONGS.values()]
+        per_line = [n for counts in expected for n in counts["syllables_per_line"]]
+        self.assertEqual(list(columns["line_syllables"]), per_line)
+        self.assertEqual(list(columns["song_syllables"]), [c["syllables_total"] for c in expected])
+        self.assertEqual(list(columns["song_words"]), [c["words"] for c in expected])
+        self.assertEqual(list(columns["song_lines"]), [c["lines"] for c in expected])
+        self.assertEqual(stats["songs"], 3)
+        self.assertEqual(index.song_ids, list(SONGS))
+
+    def test_meter_statistics_ignore_lines_without_words(self):
+        _, columns, _ = self.analyze()
+        # "uno": 4 lines, the empty one doesn't count -> [5, 6, 1]
+        self.assertEqual(columns["song_verse_lines"][0], 3)
+        self.assertEqual((columns["song_syllables_min"][0], columns["song_syllables_max"][0]), (1, 6))
+        self.assertAlmostEqual(float(columns["song_syllables_mean"][0]), 4.0, places=5)
+        self.assertEqual(columns["song_syllables_mean"][1], 0.0)
+
+    def test_python_and_numpy_backends_agree(self):
+        _, columns, _ = self.analyze()
+        with mock.patch.object(analytics, "np", None):
+            _, fallback, stats = self.analyze()
+        self.assertEqual(stats["backend"], "python")
+        for name, column in columns.items():
+            with self.subTest(column=name):
+                for a, b in zip(column, fallback[name]):
+                    self.assertAlmostEqual(float(a), float(b), places=4)
+
+    def test_curated_rows_are_used(self):
+        Syllable.objects.create(word="amor", syllables=["a", "m", "or"])
+        _, columns, _ = self.analyze()
+        self.assertEqual(columns["line_syllables"][0], 6)
+        _, columns, _ = self.analyze(use_dictionary=False)
+        self.assertEqual(columns["line_syllables"][0], 5)
+
+    def test_command_writes_a_columnar_file(self):
+        corpus = self.write("songs.jsonl", "".join(json.dumps({"id": k, "text": v}) + "\n" for k, v in SONGS.items()))
+        self.write("extra.txt", "Hola mundo\n")
+        output = os.path.join(self.tmpdir.name, "out.sylcol")
+        out = io.StringIO()
+        call_command("analyze_corpus", corpus, os.path.join(self.tmpdir.name, "extra.txt"), "-o", output, stdout=out)
+        self.assertIn("4 songs", out.getvalue())
+
+        meta, columns = analytics.read_columns(output)
+        self.assertEqual(meta["song_ids"][:3], list(SONGS))
+        self.assertEqual(list(columns["song_syllables"]), [12, 0, 9, 4])
+        self.assertEqual(len(columns["line_syllables"]), meta["lines"])
@@ -0,0 +1,37 @@
+import json
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+
+from apps.syllables.benchmarks.cases import build_cases
+from apps.syllables.benchmarks.harness import build_text, compare, load_corpus, measure, save_report
+
+
+class BenchmarkHarnessTests(SimpleTestCase):
+    def test_measure_reports_latency_and_memory(self):
+        result = measure(lambda: [0] * 1000, min_runs=10, min_time=0)
+        self.assertEqual(result["runs"], 10)
+        self.assertLessEqual(result["p50_us"], result["p99_us"])
+        self.assertGreater(result["peak_kib"], 0)
+
+    def test_corpora_and_cases(self):
+        for corpus in ("es", "en", "synthetic"):
+            self.assertTrue(load_corpus(corpus))
+        self.assertEqual(len(build_text(["a", "b"], 5).splitlines()), 5)
+        names = [case.name for case in build_cases(["divider", "split_words"], ["es"], [10])]
+        self.assertIn("split_words/auto/es/10", names)
+        self.assertEqual(len(names), len(set(names)))
+        parallel = [case.name for case in build_cases(["parallel"], ["es"], [10])]
+        self.assertEqual(parallel, ["parallel/serial/es/20000", "parallel/pool/es/20000"])
+
+    def test_compare_flags_regressions(self):
+        results = [{"name": "a", "ops_per_sec": 100.0}, {"name": "b", "ops_per_sec": 100.0}]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "baseline.json")
+            save_report(path, [{"name": "a", "ops_per_sec": 105.0}, {"name": "b", "ops_per_sec": 200.0}], {})
+            with open(path) as fh:
+                self.assertIn("environment", json.load(fh))
+            rows = {row["name"]: row for row in compare(path, results, threshold=0.1)}
+        self.assertFalse(rows["a"]["regression"])
+        self.assertTrue(rows["b"]["regression"])
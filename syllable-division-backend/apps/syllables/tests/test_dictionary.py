@@ -0,0 +1,85 @@
+import json
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.syllables.models import Syllable
+from apps.syllables.services.dictionary import (
+    clear_pending,
+    flush_writeback,
+    preload,
+    resolve_words,
+)
+from apps.syllables.services.languages import get_rules
+from apps.syllables.services.syllable_cache import cache_stats, reset_syllable_cache
+from apps.syllables.services.syllable_divider import divide_into_syllables
+
+
+class SyllableDictionaryTests(TestCase):
+    def setUp(self):
+        reset_syllable_cache()
+        clear_pending()
+        caches["responses"].clear()
+
+    def test_curated_entry_wins_over_heuristic(self):
+        Syllable.objects.create(word="rhythm", syllables=["rhy", "thm"])
+        self.assertEqual(divide_into_syllables("rhythm"), ["rhy", "thm"])
+
+    def test_misses_are_resolved_with_one_query(self):
+        Syllable.objects.create(word="guion", syllables=["gui", "on"])
+        with self.assertNumQueries(1):
+            resolved = resolve_words(["amor", "guion", "amor", "que"])
+        self.assertEqual(list(resolved), ["amor", "guion", "que"])
+        with self.assertNumQueries(0):
+            resolve_words(["amor", "guion"])
+
+    def test_computed_words_are_written_back_after_the_response(self):
+        self.client.post(
+            reverse("split_and_syllabify"),
+            data=json.dumps({"text": "la casa, la casa"}),
+            content_type="application/json",
+        )
+        rows = dict(Syllable.objects.values_list("word", "source"))
+        self.assertEqual(rows, {"la": "computed", "casa": "computed"})
+
+    def test_writeback_keeps_existing_rows(self):
+        Syllable.objects.create(word="casa", syllables=["ca", "sa"])
+        with override_settings(SYLLABLE_DICTIONARY_ENABLED=False):
+            divide_into_syllables("casa")
+        reset_syllable_cache()
+        resolve_words(["casa", "perro"])
+        self.assertEqual(flush_writeback(), 1)
+        self.assertEqual(Syllable.objects.get(word="casa").source, "curated")
+
+    def test_computed_rows_of_older_rules_are_ignored_and_replaced(self):
+        Syllable.objects.create(word="going", lang="en", syllables=["going"], source="computed")
+        self.assertEqual(resolve_words(["going"], "en")["going"], ["go", "ing"])
+        self.assertEqual(flush_writeback(), 1)
+        row = Syllable.objects.get(word="going", lang="en")
+        self.assertEqual((row.syllables, row.rules_version), (["go", "ing"], get_rules("en").version))
+        reset_syllable_cache()
+        with self.assertNumQueries(1):
+            self.assertEqual(resolve_words(["going"], "en")["going"], ["go", "ing"])
+
+    def test_writeback_skips_long_words_and_stops_at_the_cap(self):
+        resolve_words(["casa", "a" * 300])
+        self.assertEqual(flush_writeback(), 1)
+        with override_settings(SYLLABLE_DICTIONARY_MAX_COMPUTED=2):
+            clear_pending()
+            resolve_words(["perro", "gato", "luna"])
+            self.assertEqual(flush_writeback(), 1)
+        self.assertEqual(Syllable.objects.count(), 2)
+
+    def test_saving_a_correction_invalidates_the_cache(self):
+        self.assertEqual(divide_into_syllables("rhythm"), ["rhythm"])
+        Syllable.objects.update_or_create(word="rhythm", defaults={"syllables": ["rhy", "thm"]})
+        self.assertEqual(divide_into_syllables("rhythm"), ["rhy", "thm"])
+
+    def test_preload_fills_the_cache(self):
+        Syllable.objects.create(word="guion", syllables=["gui", "on"])
+        Syllable.objects.create(word="casa", syllables=["ca", "sa"], source="computed")
+        self.assertEqual(preload(limit=1), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(divide_into_syllables("guion"), ["gui", "on"])
+        self.assertEqual(cache_stats()["size"], 1)
@@ -0,0 +1,58 @@
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.syllables.models import Syllable
+
+
+class DictionaryImportExportTests(TestCase):
+    def write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(content)
+        return path
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def run_import(self, path, *args):
+        out, err = io.StringIO(), io.StringIO()
+        call_command("import_syllables", path, *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_csv_import_upserts_in_batches(self):
+        Syllable.objects.create(word="guion", syllables=["guion"], source="computed")
+        path = self.write(
+            "lexicon.csv",
+            "word,syllables\npalabra,pa-la-bra\nguion,gui-on\nroto,ro-xx\namor,a-mor\n",
+        )
+        out, err = self.run_import(path, "--batch-size", "2")
+        self.assertIn("Imported 3 entries in 2 batches", out)
+        self.assertIn("line 4", err)
+        self.assertEqual(Syllable.objects.get(word="guion").syllables, ["gui", "on"])
+        self.assertEqual(Syllable.objects.get(word="guion").source, "curated")
+        self.assertFalse(Syllable.objects.filter(word="roto").exists())
+
+    def test_jsonl_round_trip(self):
+        Syllable.objects.create(word="auto-estima", syllables=["au", "to-es", "ti", "ma"])
+        Syllable.objects.create(word="amor", syllables=["a", "mor"], source="computed")
+        for fmt in ("csv", "jsonl"):
+            with self.subTest(fmt=fmt):
+                path = os.path.join(self.tmpdir.name, f"export.{fmt}")
+                call_command("export_syllables", path, stdout=io.StringIO())
+                exported = dict(Syllable.objects.values_list("word", "syllables"))
+                Syllable.objects.all().delete()
+                self.run_import(path)
+                self.assertEqual(dict(Syllable.objects.values_list("word", "syllables")), exported)
+
+    def test_jsonl_export_lines(self):
+        Syllable.objects.create(word="amor", syllables=["a", "mor"])
+        path = os.path.join(self.tmpdir.name, "out.jsonl")
+        call_command("export_syllables", path, stdout=io.StringIO())
+        with open(path, encoding="utf-8") as fh:
+            self.assertEqual([json.loads(line) for line in fh], [{"word": "amor", "syllables": ["a", "mor"]}])
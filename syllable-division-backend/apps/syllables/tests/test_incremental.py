@@ -0,0 +1,140 @@
+import json
+import random
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.syllables.services.incremental import get_document_store, reset_document_store
+from apps.syllables.services.text_syllabifier import syllabify_text
+
+LINES = [
+    "¿Qué será, será?",
+    "La vida es un carnaval...",
+    "",
+    "«Rhythm» y guion — ay!",
+    "(otra vez) 20 veces",
+    "pa-la-bra",
+]
+
+
+class IncrementalSplitSyllablesTests(TestCase):
+    def setUp(self):
+        reset_document_store()
+
+    def post(self, body):
+        return self.client.post(
+            reverse("split_and_syllabify_incremental"), data=json.dumps(body), content_type="application/json"
+        )
+
+    def assertMatchesFullRun(self, lines, payload_lines, counts, options=None):
+        expected = syllabify_text("\n".join(lines), **(options or {}))
+        if lines and lines[-1] == "":
+            expected["items"].append([])  # "a\n" has a single line
+            expected["counts"]["lines"] += 1
+        self.assertEqual([line["items"] for line in payload_lines], expected["items"])
+        expected["counts"].pop("syllables_per_line")
+        self.assertEqual(counts, expected["counts"])
+
+    def test_open_returns_every_line(self):
+        data = self.post({"text": "\n".join(LINES), "doc_id": "song", "lower": True}).json()
+        self.assertEqual(data["version"], 1)
+        self.assertNotEqual(data["doc_id"], "song")  # ids are always the server's
+        self.assertMatchesFullRun(LINES, data["lines"], data["counts"], {"lower": True})
+
+    def test_random_edits_match_a_full_recomputation(self):
+        rng = random.Random(5)
+        lines = list(LINES)
+        data = self.post({"text": "\n".join(lines)}).json()
+        doc_id, version = data["doc_id"], data["version"]
+        mirror = list(data["lines"])
+        for _ in range(40):
+            start = rng.randint(0, len(lines))
+            end = rng.randint(start, min(len(lines), start + 2))
+            new = [rng.choice(LINES) + rng.choice(["", " amor", "!"]) for _ in range(rng.randint(0, 2))]
+            lines[start:end] = new
+            response = self.post({"doc_id": doc_id, "version": version, "changes": [
+                {"start": start, "end": end, "lines": new},
+            ]})
+            data = response.json()
+            self.assertEqual(data["version"], version + 1)
+            version = data["version"]
+            for op in data["patch"]:
+                mirror[op["start"]:op["start"] + op["delete"]] = op["lines"]
+            self.assertMatchesFullRun(lines, mirror, data["counts"])
+
+    def test_several_changes_apply_in_order(self):
+        doc_id = self.post({"text": "a\nb\nc"}).json()["doc_id"]
+        data = self.post({"doc_id": doc_id, "version": 1, "changes": [
+            {"start": 0, "end": 1, "lines": ["uno", "dos"]},
+            {"start": 3, "end": 4, "lines": []},
+        ]}).json()
+        self.assertEqual([op["delete"] for op in data["patch"]], [1, 1])
+        self.assertEqual(data["counts"]["lines"], 3)
+        self.assertEqual(data["counts"]["syllables_total"], 4)  # u-no dos b
+
+    def test_stale_version_and_unknown_document_conflict(self):
+        doc_id = self.post({"text": "la casa"}).json()["doc_id"]
+        change = {"start": 0, "end": 1, "lines": ["el perro"]}
+        self.assertEqual(self.post({"doc_id": doc_id, "version": 1, "changes": [change]}).status_code, 200)
+        stale = self.post({"doc_id": doc_id, "version": 1, "changes": [change]})
+        self.assertEqual(stale.status_code, 409)
+        self.assertEqual(stale.json()["version"], 2)
+        self.assertEqual(self.post({"doc_id": "nope", "version": 1, "changes": []}).status_code, 409)
+
+    def test_invalid_changes_leave_the_document_untouched(self):
+        doc_id = self.post({"text": "la casa"}).json()["doc_id"]
+        for change in (
+            {"start": 0, "end": 5, "lines": []},
+            {"start": 1, "end": 0, "lines": []},
+            {"start": 0, "end": 1, "lines": ["dos\nlíneas"]},
+            {"start": True, "end": True, "lines": []},
+        ):
+            with self.subTest(change=change):
+                response = self.post({"doc_id": doc_id, "version": 1, "changes": [
+                    {"start": 0, "end": 1, "lines": ["el perro"]}, change,
+                ]})
+                self.assertEqual(response.status_code, 400)
+        data = self.post({"doc_id": doc_id, "version": 1, "changes": []}).json()
+        self.assertEqual(data["counts"]["syllables_total"], 3)
+
+    def test_reopening_never_replaces_another_document(self):
+        doc_id = self.post({"text": "la casa"}).json()["doc_id"]
+        other = self.post({"text": "el perro", "doc_id": doc_id}).json()["doc_id"]
+        self.assertNotEqual(other, doc_id)
+        data = self.post({"doc_id": doc_id, "version": 1, "changes": []}).json()
+        self.assertEqual(data["counts"]["syllables_total"], 3)
+
+    @override_settings(SYLLABLE_REQUEST_LIMITS={
+        "split_and_syllabify_incremental": {"max_lines": 10, "max_tokens": 12, "max_bytes": 300},
+    })
+    def test_edits_cannot_grow_a_document_past_the_limits(self):
+        doc_id = self.post({"text": "la\nla"}).json()["doc_id"]
+        version = 1
+        for change, status in (
+            ({"start": 2, "end": 2, "lines": ["la"] * 8}, 200),  # 10 lines
+            ({"start": 0, "end": 0, "lines": ["la"]}, 413),  # 11 lines
+            ({"start": 0, "end": 1, "lines": ["la la la"]}, 200),  # 12 words
+            ({"start": 1, "end": 2, "lines": ["la la"]}, 413),  # 13 words
+            ({"start": 1, "end": 2, "lines": ["x" * 150]}, 200),  # 184 characters
+            ({"start": 2, "end": 3, "lines": ["x" * 150]}, 413),  # 332, though each body is smaller
+        ):
+            with self.subTest(change=change):
+                response = self.post({"doc_id": doc_id, "version": version, "changes": [change]})
+                self.assertEqual(response.status_code, status)
+                version += status == 200
+        data = self.post({"doc_id": doc_id, "version": version, "changes": []}).json()
+        self.assertEqual((data["counts"]["lines"], data["counts"]["words"]), (10, 12))
+
+    @override_settings(SYLLABLE_INCREMENTAL_MAX_CHARS=100)
+    def test_store_evicts_past_its_size_budget(self):
+        reset_document_store()
+        first = self.post({"text": "la casa " * 5}).json()["doc_id"]  # 40 characters
+        second = self.post({"text": "el perro " * 5}).json()["doc_id"]  # 45
+        self.post({"doc_id": first, "version": 1, "changes": []})  # first is now the most recent
+        third = self.post({"text": "ay " * 10}).json()["doc_id"]  # 30: 115 > 100, second goes
+        change = {"doc_id": second, "version": 1, "changes": []}
+        self.assertEqual(self.post(change).status_code, 409)
+        for doc_id, version in ((first, 2), (third, 1)):
+            self.assertEqual(self.post({"doc_id": doc_id, "version": version, "changes": []}).status_code, 200)
+        stats = get_document_store().stats()
+        self.assertEqual((stats["size"], stats["weight"], stats["evictions"]), (2, 70, 1))
@@ -0,0 +1,65 @@
+import json
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from apps.syllables.services import instrumentation
+from apps.syllables.services.instrumentation import Histogram, span
+
+
+class InstrumentationTests(SimpleTestCase):
+    def test_hooks_are_noops_outside_a_request(self):
+        self.assertIsNone(instrumentation.current())
+        with span("tokenize"):
+            instrumentation.add_counts(words=3)
+        self.assertIs(instrumentation.timed_call(len, "x"), len)
+
+    def test_histogram_quantiles(self):
+        hist = Histogram()
+        for ms in (0.3, 0.4, 3, 7, 20000):
+            hist.observe(ms)
+        data = hist.as_dict()
+        self.assertEqual(data["count"], 5)
+        self.assertEqual(data["p50_ms"], 5)
+        self.assertEqual(data["p99_ms"], 20000)
+
+
+class MetricsMiddlewareTests(TestCase):
+    def setUp(self):
+        instrumentation.reset()
+        caches["responses"].clear()
+
+    def post(self, name, body):
+        return self.client.post(reverse(name), data=json.dumps(body), content_type="application/json")
+
+    @override_settings(SYLLABLE_RESPONSE_CACHE_ENABLED=False)
+    def test_server_timing_lists_the_stages(self):
+        response = self.post("split_and_syllabify", {"text": "la casa\nel perro"})
+        stages = [part.split(";")[0] for part in response["Server-Timing"].split(", ")]
+        self.assertEqual(stages, ["parse", "tokenize", "syllabify", "serialize", "total"])
+
+    def test_metrics_endpoint_aggregates_per_endpoint(self):
+        self.post("split_and_syllabify", {"text": "la casa\nel perro"})
+        self.post("split_and_syllabify_no_slash", {"text": "amor"})
+        self.post("split_text", {"text": "hola, mundo"})
+        endpoints = self.client.get(reverse("syllable_metrics")).json()["endpoints"]
+
+        split_syllables = endpoints["split_and_syllabify"]
+        self.assertEqual(split_syllables["requests"], 2)
+        self.assertEqual(split_syllables["statuses"], {"200": 2})
+        self.assertEqual(split_syllables["counts"], {"lines": 3, "tokens": 5, "words": 5, "syllables": 8})
+        self.assertEqual(split_syllables["stages"]["total"]["count"], 2)
+        self.assertGreater(split_syllables["body_bytes_max"], 0)
+        self.assertEqual(endpoints["split_text"]["counts"], {"tokens": 3})
+
+    @override_settings(SYLLABLE_DICTIONARY_ENABLED=False)
+    async def test_async_views_are_measured(self):
+        response = await self.async_client.post(
+            reverse("split_and_syllabify_async"), data=json.dumps({"text": "la casa"}), content_type="application/json"
+        )
+        self.assertIn("syllabify;dur=", response["Server-Timing"])
+
+    @override_settings(SYLLABLE_SERVER_TIMING=False)
+    def test_header_can_be_disabled(self):
+        self.assertNotIn("Server-Timing", self.post("divide_syllables", {"word": "amor"}))
@@ -0,0 +1,124 @@
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.syllables.models import SyllabifyJob, SyllabifyJobDocument
+from apps.syllables.services import jobs
+from apps.syllables.services.syllable_cache import reset_syllable_cache
+from apps.syllables.services.text_syllabifier import syllabify_text
+
+SONGS = [
+    "¿Qué será, será?\nLa vida es un carnaval...",
+    "Caminante, no hay camino,\nse hace camino al andar.",
+    "«Rhythm» y guion — ay!",
+]
+
+
+# Workers commit claims and results outside any request, as in production
+@override_settings(SYLLABLE_DICTIONARY_WRITEBACK=False, SYLLABLE_JOB_THREADS=0)
+class SyllabifyJobTests(TransactionTestCase):
+    def setUp(self):
+        reset_syllable_cache()
+
+    def submit(self, body):
+        return self.client.post(reverse("syllable_jobs"), data=json.dumps(body), content_type="application/json")
+
+    def results(self, job_id, query=""):
+        return self.client.get(reverse("syllable_job_results", args=[job_id]) + query)
+
+    def test_submit_process_and_poll(self):
+        documents = [{"id": "uno", "text": SONGS[0]}, SONGS[1], {"text": SONGS[2]}]
+        response = self.submit({"documents": documents, "lower": True, "metric": True})
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()["job_id"]
+        self.assertEqual(response.json()["status"], "queued")
+        self.assertEqual(self.results(job_id).json()["results"], [])
+
+        self.assertEqual(jobs.run_worker(batch_size=2, once=True), 3)
+        job = self.client.get(reverse("syllable_job", args=[job_id])).json()
+        self.assertEqual((job["status"], job["processed"], job["failed"], job["progress"]), ("done", 3, 0, 1.0))
+
+        data = self.results(job_id).json()
+        self.assertEqual([r["id"] for r in data["results"]], ["uno", "1", "2"])
+        self.assertEqual(data["next"], 2)
+        for song, record in zip(SONGS, data["results"]):
+            expected = syllabify_text(song, lower=True)
+            self.assertEqual(record["items"], expected["items"])
+            self.assertEqual(record["counts"], expected["counts"])
+            self.assertEqual(len(record["meter"]), len(expected["items"]))
+
+        page = self.results(job_id, "?after=0&limit=1").json()
+        self.assertEqual(([r["index"] for r in page["results"]], page["next"]), ([1], 1))
+        stream = self.results(job_id, "?stream=1")
+        records = [json.loads(line) for line in b"".join(stream.streaming_content).splitlines()]
+        self.assertEqual([r["type"] for r in records], ["document"] * 3 + ["summary"])
+        self.assertEqual(records[-1]["status"], "done")
+
+    def test_results_stop_at_the_first_pending_document(self):
+        job = jobs.submit_job([(str(i), song) for i, song in enumerate(SONGS)], {"lang": "es"})
+        first = jobs.claim_documents(1)
+        self.assertEqual(self.client.get(reverse("syllable_job", args=[job.id])).json()["status"], "running")
+        later = jobs.claim_documents(2)
+        for doc in later:
+            jobs.process_document(doc)
+        self.assertEqual(self.results(job.id).json()["results"], [])  # document 0 still running
+        jobs.process_document(first[0])
+        self.assertEqual([r["index"] for r in self.results(job.id).json()["results"]], [0, 1, 2])
+
+    def test_claims_are_exclusive_and_expired_leases_are_retried(self):
+        jobs.submit_job([(str(i), song) for i, song in enumerate(SONGS)], {})
+        first, second = jobs.claim_documents(2), jobs.claim_documents(2)
+        self.assertEqual(len(first) + len(second), 3)
+        self.assertFalse({d.id for d in first} & {d.id for d in second})
+        self.assertEqual(jobs.claim_documents(2), [])
+
+        # The worker holding `first` died: its documents are claimed again
+        SyllabifyJobDocument.objects.filter(id__in=[d.id for d in first]).update(
+            claimed_at=timezone.now() - timedelta(seconds=jobs.lease_seconds() + 1),
+        )
+        retried = jobs.claim_documents(5)
+        self.assertEqual({d.id for d in retried}, {d.id for d in first})
+        self.assertFalse(jobs.process_document(first[0]))  # the old claim lost its lease
+        self.assertTrue(jobs.process_document(retried[0]))
+
+    @override_settings(SYLLABLE_JOB_MAX_ATTEMPTS=1)
+    def test_failures_are_reported_per_document(self):
+        job = jobs.submit_job([("a", SONGS[0]), ("b", SONGS[1])], {})
+        with mock.patch.object(jobs, "syllabify_compact", side_effect=RuntimeError("boom")):
+            [doc_a] = jobs.claim_documents(1)
+            self.assertTrue(jobs.process_document(doc_a))
+        [doc_b] = jobs.claim_documents(1)
+        SyllabifyJobDocument.objects.filter(id=doc_b.id).update(
+            claimed_at=timezone.now() - timedelta(seconds=jobs.lease_seconds() + 1),
+        )
+        self.assertEqual(jobs.claim_documents(1), [])  # out of attempts
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed, job.failed), (SyllabifyJob.STATUS_DONE, 2, 2))
+        errors = [r["error"] for r in self.results(job.id).json()["results"]]
+        self.assertEqual(errors, ["RuntimeError: boom", "El documento agotó sus reintentos"])
+
+    def test_validation(self):
+        self.assertEqual(self.submit({"documents": []}).status_code, 400)
+        self.assertEqual(self.submit({"documents": [{"id": 3, "text": "la"}]}).status_code, 400)
+        self.assertEqual(self.submit({"documents": ["la", ""]}).status_code, 400)
+        self.assertEqual(self.submit({"documents": ["la"], "metric": True, "lang": "en"}).status_code, 400)
+        with self.settings(SYLLABLE_JOB_MAX_DOCUMENTS=2):
+            self.assertEqual(self.submit({"documents": ["la"] * 3}).status_code, 400)
+        with self.settings(SYLLABLE_REQUEST_LIMITS={"split_and_syllabify": {"max_lines": 2}}):
+            self.assertEqual(self.submit({"documents": ["a\nb\nc"]}).status_code, 413)
+        self.assertFalse(SyllabifyJob.objects.exists())
+        missing = "00000000-0000-0000-0000-000000000000"
+        self.assertEqual(self.client.get(reverse("syllable_job", args=[missing])).status_code, 404)
+        self.assertEqual(self.results(missing, "?limit=0").status_code, 400)
+
+    def test_purge_finished_jobs(self):
+        job = jobs.submit_job([("a", "la casa")], {})
+        jobs.run_worker(once=True)
+        self.assertEqual(jobs.purge_jobs(timedelta(days=1)), 0)
+        SyllabifyJob.objects.filter(id=job.id).update(finished_at=timezone.now() - timedelta(days=2))
+        self.assertEqual(jobs.purge_jobs(timedelta(days=1)), 1)
+        self.assertFalse(SyllabifyJobDocument.objects.exists())
@@ -0,0 +1,95 @@
+import json
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from apps.syllables.models import Syllable
+from apps.syllables.services.dictionary import clear_pending
+from apps.syllables.services.languages import LANGUAGES, UnknownLanguage, get_rules
+from apps.syllables.services.syllable_cache import reset_syllable_cache
+from apps.syllables.services.syllable_divider import divide_into_syllables
+from apps.syllables.services.syllable_engine import SPANISH
+
+
+EXPECTED = {
+    "en": {
+        "table": ["ta", "ble"], "time": ["time"], "beautiful": ["beau", "ti", "ful"],
+        "father": ["fa", "ther"], "little": ["lit", "tle"], "loved": ["loved"],
+        "wanted": ["wan", "ted"], "baby": ["ba", "by"], "yesterday": ["yes", "ter", "day"],
+        # hiatus
+        "going": ["go", "ing"], "doing": ["do", "ing"], "being": ["be", "ing"], "seeing": ["see", "ing"],
+        "trying": ["try", "ing"], "crying": ["cry", "ing"], "flying": ["fly", "ing"], "dying": ["dy", "ing"],
+        "playing": ["play", "ing"], "lion": ["li", "on"], "poem": ["po", "em"], "create": ["cre", "ate"],
+        "quiet": ["qui", "et"], "science": ["sci", "ence"], "idea": ["i", "de", "a"], "cruel": ["cru", "el"],
+        # no hiatus
+        "nation": ["na", "tion"], "million": ["mil", "lion"], "people": ["peo", "ple"], "ancient": ["an", "cient"],
+        "queen": ["queen"], "blue": ["blue"], "does": ["does"], "great": ["great"], "sea": ["sea"],
+    },
+    "pt": {
+        "coração": ["co", "ra", "ção"], "água": ["á", "gua"], "quando": ["quan", "do"],
+        "dia": ["di", "a"], "filho": ["fi", "lho"], "carro": ["car", "ro"], "mãe": ["mãe"],
+    },
+    "it": {
+        "mostro": ["mo", "stro"], "pasta": ["pa", "sta"], "bello": ["bel", "lo"],
+        "bagno": ["ba", "gno"], "occhio": ["oc", "chio"], "cuore": ["cuo", "re"],
+    },
+}
+
+
+class LanguageRulesTests(SimpleTestCase):
+    def test_expected_splits(self):
+        for lang, words in EXPECTED.items():
+            rules = get_rules(lang)
+            for word, syllables in words.items():
+                with self.subTest(lang=lang, word=word):
+                    self.assertEqual(rules.divide(word), syllables)
+                    self.assertEqual("".join(rules.divide(word.upper())), word.upper())
+
+    def test_registry(self):
+        self.assertEqual(set(LANGUAGES), {"es", "en", "pt", "it"})
+        self.assertIs(get_rules(), SPANISH)
+        with override_settings(SYLLABLE_DEFAULT_LANG="it"):
+            self.assertEqual(get_rules().code, "it")
+        with self.assertRaises(UnknownLanguage):
+            get_rules("xx")
+
+
+@override_settings(SYLLABLE_DICTIONARY_WRITEBACK=False)
+class LanguageOptionTests(TestCase):
+    def setUp(self):
+        reset_syllable_cache()
+        clear_pending()
+        caches["responses"].clear()
+
+    def post(self, name, body):
+        return self.client.post(reverse(name), data=json.dumps(body), content_type="application/json")
+
+    def test_lang_on_every_endpoint(self):
+        response = self.post("divide_syllables", {"word": "pasta", "lang": "it"})
+        self.assertEqual(response.json()["syllables"], ["pa", "sta"])
+        response = self.post("divide_syllables_batch", {"words": ["pasta"], "lang": "it"})
+        self.assertEqual(response.json()["results"][0]["syllables"], ["pa", "sta"])
+        response = self.post("split_and_syllabify", {"text": "la pasta", "lang": "it"})
+        self.assertEqual(response.json()["items"][0][1]["syllables"], ["pa", "sta"])
+        self.assertEqual(response.json()["options"]["lang"], "it")
+        response = self.post("split_and_syllabify", {"text": "la pasta"})
+        self.assertEqual(response.json()["items"][0][1]["syllables"], ["pas", "ta"])
+
+    def test_unknown_lang_is_rejected(self):
+        for name, body in [
+            ("divide_syllables", {"word": "pasta", "lang": "xx"}),
+            ("divide_syllables_batch", {"words": ["pasta"], "lang": ["es"]}),
+            ("split_and_syllabify", {"text": "pasta", "lang": "xx"}),
+            ("split_and_syllabify_incremental", {"text": "pasta", "lang": "xx"}),
+        ]:
+            with self.subTest(name=name):
+                self.assertEqual(self.post(name, body).status_code, 400)
+
+    def test_cache_and_dictionary_are_per_language(self):
+        Syllable.objects.create(word="piano", lang="it", syllables=["pia", "no"])
+        self.assertEqual(divide_into_syllables("piano", "it"), ["pia", "no"])
+        Syllable.objects.create(word="piano", lang="en", syllables=["pi", "a", "no"])
+        self.assertEqual(divide_into_syllables("piano", "en"), ["pi", "a", "no"])
+        self.assertEqual(divide_into_syllables("piano", "it"), ["pia", "no"])
+        self.assertEqual(divide_into_syllables("piano"), ["pia", "no"])
@@ -0,0 +1,104 @@
+import io
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from apps.syllables.models import Syllable
+from apps.syllables.services import lexicon as lexicon_module
+from apps.syllables.services.dictionary import clear_pending, resolve_words
+from apps.syllables.services.lexicon import Lexicon, build_lexicon, get_lexicon, reset_lexicons
+from apps.syllables.services.syllable_cache import reset_syllable_cache
+from apps.syllables.services.syllable_engine import divide
+
+
+WORDS = ["a", "amor", "añoranza", "canción", "Zapato", "ábaco", "corazón", "ñu", "árbol"]
+
+
+class LexiconFileTests(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "es.sylx")
+
+    def open(self, entries):
+        build_lexicon(self.path, entries)
+        lexicon = Lexicon(self.path)
+        self.addCleanup(lexicon.close)
+        return lexicon
+
+    def test_round_trip(self):
+        lexicon = self.open([(word, divide(word)) for word in WORDS])
+        self.assertEqual(len(lexicon), len(WORDS))
+        for word in WORDS:
+            with self.subTest(word=word):
+                self.assertEqual(lexicon.get(word), tuple(divide(word)))
+        for word in ["", "b", "amo", "amores", "zapato", "ab", "ñ"]:
+            self.assertIsNone(lexicon.get(word))
+        self.assertEqual(lexicon.stats()["hits"], len(WORDS))
+
+    def test_invalid_entries_are_skipped(self):
+        lexicon = self.open([("casa", ["ca", "sa"]), ("mesa", ["me", "za"]), ("x" * 300, ["x" * 300])])
+        self.assertEqual(len(lexicon), 1)
+        self.assertIsNone(lexicon.get("mesa"))
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as fh:
+            fh.write(b"not a lexicon" * 10)
+        with self.assertRaises(ValueError):
+            Lexicon(self.path)
+
+
+@override_settings(SYLLABLE_DICTIONARY_WRITEBACK=False)
+class LexiconLookupTests(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        settings_override = override_settings(SYLLABLE_LEXICON_DIR=self.tmpdir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        for reset in (reset_lexicons, reset_syllable_cache, clear_pending):
+            reset()
+            self.addCleanup(reset)
+
+    def build(self, *args):
+        wordlist = os.path.join(self.tmpdir.name, "words.txt")
+        with open(wordlist, "w", encoding="utf-8") as fh:
+            fh.write("amor\t120\ncanción\n\nperro 7\n")
+        out = io.StringIO()
+        call_command("build_syllable_lexicon", wordlist, *args, stdout=out)
+        return out.getvalue()
+
+    def test_command_merges_dictionary_rows(self):
+        Syllable.objects.create(word="amor", syllables=["a", "m", "or"])
+        Syllable.objects.create(word="piano", lang="it", syllables=["pia", "no"])
+        self.assertIn("3 es entries", self.build())
+        lexicon = get_lexicon("es")
+        self.assertEqual(lexicon.get("amor"), ("a", "m", "or"))
+        self.assertEqual(lexicon.get("perro"), ("pe", "rro"))
+        self.assertIsNone(lexicon.get("piano"))
+        self.assertIsNone(get_lexicon("it"))
+
+    def test_resolution_skips_the_database(self):
+        Syllable.objects.create(word="amor", syllables=["a", "m", "or"])
+        self.build()
+        Syllable.objects.all().delete()
+        reset_lexicons()
+        reset_syllable_cache()
+        with self.assertNumQueries(0):
+            result = resolve_words(["amor", "canción"])
+        self.assertEqual(result, {"amor": ["a", "m", "or"], "canción": ["can", "ción"]})
+        with self.assertNumQueries(1):
+            self.assertEqual(resolve_words(["gato"]), {"gato": ["ga", "to"]})
+
+    def test_edited_rows_win_over_the_lexicon(self):
+        self.build()
+        self.assertEqual(resolve_words(["perro"])["perro"], ["pe", "rro"])
+        Syllable.objects.create(word="perro", syllables=["pe", "r", "ro"])  # signal invalidates
+        self.assertEqual(resolve_words(["perro"])["perro"], ["pe", "r", "ro"])
+
+    def test_missing_file_disables_the_lexicon(self):
+        self.assertIsNone(get_lexicon("es"))
+        self.assertEqual(lexicon_module.lexicon_stats()["languages"], {})
+        self.assertEqual(resolve_words(["amor"]), {"amor": ["a", "mor"]})
@@ -0,0 +1,99 @@
+import json
+
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from apps.syllables.services.limits import TokenBucket, client_key, request_cost
+
+
+LIMITS = {
+    "default": {"max_bytes": 2000, "max_lines": 5, "max_tokens": 20},
+    "split_text": {"max_lines": 50},
+}
+
+
+@override_settings(SYLLABLE_DICTIONARY_WRITEBACK=False, SYLLABLE_REQUEST_LIMITS=LIMITS)
+class RequestLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def post(self, name, body, **extra):
+        return self.client.post(reverse(name), data=json.dumps(body), content_type="application/json", **extra)
+
+    def test_oversized_body_is_refused_before_parsing(self):
+        response = self.client.post(
+            reverse("split_and_syllabify"), data=b"{" + b" " * 3000, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 413)  # not 400: the invalid JSON is never parsed
+        self.assertEqual(self.post("split_text", {"text": "x" * 3000}).status_code, 413)
+
+    def test_line_and_token_limits_per_endpoint(self):
+        lines = "\n".join(["la la"] * 8)
+        self.assertEqual(self.post("split_and_syllabify", {"text": lines}).status_code, 413)
+        self.assertEqual(self.post("split_text", {"text": lines}).status_code, 200)
+        words = " ".join(["la"] * 25)
+        self.assertEqual(self.post("split_and_syllabify", {"text": words}).status_code, 413)
+        self.assertEqual(self.post("split_and_syllabify_incremental", {"text": words}).status_code, 413)
+        self.assertEqual(self.post("split_and_syllabify", {"text": "la casa"}).status_code, 200)
+
+    def test_min_len_is_validated(self):
+        for value in ["dos", [1], None, True, 1.5]:
+            with self.subTest(min_len=value):
+                self.assertEqual(self.post("split_and_syllabify", {"text": "la casa", "min_len": value}).status_code, 400)
+                self.assertEqual(self.post("split_text", {"text": "la casa", "min_len": value}).status_code, 400)
+        response = self.post("split_text", {"text": "la casa", "min_len": "3"})
+        self.assertEqual(response.json()["tokens"], ["casa"])
+
+    @override_settings(SYLLABLE_RATE_LIMIT_ENABLED=True, SYLLABLE_RATE_LIMIT_BURST=3, SYLLABLE_RATE_LIMIT_RATE=0.5)
+    def test_rate_limit_per_client(self):
+        for _ in range(3):
+            self.assertEqual(self.post("split_text", {"text": "la casa"}).status_code, 200)
+        response = self.post("split_and_syllabify", {"text": "la casa"})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "2")
+        self.assertEqual(self.post("split_text", {"text": "hola"}, REMOTE_ADDR="10.0.0.2").status_code, 200)
+        # divide/ isn't limited
+        self.assertEqual(self.post("divide_syllables", {"word": "casa"}).status_code, 200)
+        self.assertGreaterEqual(self.client.get(reverse("syllable_stats")).json()["limits"]["rate_limited"], 1)
+
+
+class TokenBucketTests(SimpleTestCase):
+    def test_refill_and_cost_cap(self):
+        bucket = TokenBucket(LocMemCache("bucket-tests", {}), rate=2.0, burst=10.0)
+        self.assertEqual(bucket.consume("c", 8, now=100.0), 0.0)
+        self.assertEqual(bucket.consume("c", 4, now=100.0), 1.0)  # 2 left, 2 missing at 2/s
+        self.assertEqual(bucket.consume("c", 4, now=101.0), 0.0)  # refilled to 4
+        self.assertEqual(bucket.consume("c", 50, now=106.0), 0.0)  # capped at the burst
+        self.assertGreater(bucket.consume("c", 1, now=106.0), 0.0)
+
+
+class ClientKeyTests(SimpleTestCase):
+    def request(self, forwarded=None, **extra):
+        if forwarded is not None:
+            extra["HTTP_X_FORWARDED_FOR"] = forwarded
+        return RequestFactory().post("/", data=b"x" * 100, content_type="text/plain", **extra)
+
+    @override_settings(SYLLABLE_RATE_LIMIT_CLIENT_HEADER="HTTP_X_FORWARDED_FOR")
+    def test_forwarded_for_is_read_from_the_trusted_end(self):
+        real = client_key(self.request("203.0.113.7"))
+        # A client-supplied first entry doesn't change the key
+        self.assertEqual(client_key(self.request("1.2.3.4, 203.0.113.7")), real)
+        self.assertNotEqual(client_key(self.request("1.2.3.4")), real)
+        with self.settings(SYLLABLE_RATE_LIMIT_TRUSTED_PROXIES=2):
+            self.assertEqual(client_key(self.request("1.2.3.4, 203.0.113.7, 10.0.0.1")), real)
+        self.assertEqual(client_key(self.request("")), client_key(self.request(REMOTE_ADDR="127.0.0.1")))
+
+    @override_settings(SYLLABLE_RATE_LIMIT_CLIENT_HEADER="HTTP_X_CLIENT")
+    def test_keys_are_safe_for_memcached(self):
+        key = client_key(self.request(HTTP_X_CLIENT="a client with spaces " * 20))
+        self.assertLess(len(key), 250)
+        self.assertNotIn(" ", key)
+
+    @override_settings(SYLLABLE_RATE_LIMIT_BYTES_PER_UNIT=10)
+    def test_cost_without_content_length_uses_the_body(self):
+        request = self.request()
+        self.assertEqual(request_cost(request), 11)
+        del request.META["CONTENT_LENGTH"]
+        self.assertEqual(request_cost(request), 11)
@@ -0,0 +1,77 @@
+import json
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from apps.syllables.services.languages import get_rules
+from apps.syllables.services.meter import line_meter
+from apps.syllables.services.parallel import shutdown_pool
+from apps.syllables.services.text_syllabifier import syllabify_text
+
+VERSES = "Caminante, no hay camino,\nse hace camino al andar.\n\nY el mar...\n"
+
+
+def meter(line):
+    rules = get_rules("es")
+    return line_meter([rules.divide(word) for word in line.split()])
+
+
+class LineMeterTests(SimpleTestCase):
+    def test_synalepha_and_final_stress(self):
+        self.assertEqual(meter("caminante no hay camino"), (8, [0, 1, 2, 3, 4, 4, 5, 6, 7], 1, "llana"))
+        self.assertEqual(meter("se hace camino al andar"), (8, [0, 0, 1, 2, 3, 4, 4, 5, 6], 2, "aguda"))
+        self.assertEqual(meter("la lágrima"), (3, [0, 1, 2, 3], 0, "esdrujula"))
+
+    def test_silent_h_and_y(self):
+        self.assertEqual(meter("de alma").synalephas, 1)
+        self.assertEqual(meter("de huevo").synalephas, 0)  # hue- sounds consonantal
+        self.assertEqual(meter("hoy es").synalephas, 1)
+        self.assertEqual(meter("y el mar"), (3, [0, 0, 1], 1, "aguda"))
+
+    def test_empty_line(self):
+        self.assertEqual(line_meter([]), (0, [], 0, None))
+
+
+@override_settings(SYLLABLE_DICTIONARY_WRITEBACK=False)
+class MetricSplitSyllablesTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutdown_pool()
+        super().tearDownClass()
+
+    def post(self, name, body, query=""):
+        return self.client.post(reverse(name) + query, data=json.dumps(body), content_type="application/json")
+
+    def test_meter_per_line(self):
+        data = self.post("split_and_syllabify", {"text": VERSES, "metric": True}).json()
+        self.assertEqual([m["syllables"] for m in data["meter"]], [8, 8, 0, 3])
+        self.assertTrue(data["options"]["metric"])
+        self.assertEqual(data["items"], syllabify_text(VERSES)["items"])
+        self.assertNotIn("meter", self.post("split_and_syllabify", {"text": VERSES}).json())
+
+    def test_columnar_stream_and_incremental_agree(self):
+        body = {"text": VERSES, "metric": True}
+        meters = self.post("split_and_syllabify", body).json()["meter"]
+        columnar = self.post("split_and_syllabify", body, "?format=columnar").json()
+        self.assertEqual(len(columnar["beats"]), len(columnar["syllables"]))
+        self.assertEqual(columnar["metrical_syllables_per_line"], [m["syllables"] for m in meters])
+        stream = self.post("split_and_syllabify", body, "?stream=1")
+        records = [json.loads(line) for line in b"".join(stream.streaming_content).splitlines()]
+        self.assertEqual([r["meter"] for r in records if r["type"] == "line"], meters)
+        lines = self.post("split_and_syllabify_incremental", body).json()["lines"]
+        self.assertEqual([line["meter"] for line in lines[:len(meters)]], meters)
+
+    @override_settings(
+        SYLLABLE_PARALLEL_WORKERS=2, SYLLABLE_PARALLEL_MIN_CHARS=100, SYLLABLE_RESPONSE_CACHE_ENABLED=False
+    )
+    def test_parallel_path_matches_serial(self):
+        text = VERSES * 20
+        with self.settings(SYLLABLE_PARALLEL_MIN_CHARS=10 ** 9):
+            serial = self.post("split_and_syllabify", {"text": text, "metric": True}).json()
+        parallel = self.post("split_and_syllabify", {"text": text, "metric": True}).json()
+        self.assertEqual(parallel["meter"], serial["meter"])
+        self.assertTrue(self.client.get(reverse("syllable_stats")).json()["parallel"]["pool_started"])
+
+    def test_only_spanish(self):
+        response = self.post("split_and_syllabify", {"text": "la casa", "metric": True, "lang": "it"})
+        self.assertEqual(response.status_code, 400)
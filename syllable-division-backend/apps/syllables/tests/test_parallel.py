@@ -0,0 +1,77 @@
+import json
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.syllables.models import Syllable
+from apps.syllables.services.dictionary import clear_pending
+from apps.syllables.services.parallel import (
+    available_cpus,
+    parallel_workers,
+    shutdown_pool,
+    split_shards,
+    syllabify_compact_parallel,
+)
+from apps.syllables.services.syllable_cache import reset_syllable_cache
+from apps.syllables.services.text_syllabifier import syllabify_compact, syllabify_text
+
+SONG = (
+    "¿Qué será, será? La vida es un carnaval...\r\n"
+    "\n"
+    "«Rhythm» y guion — ay, ay, ay! "
+    "Ciento 20 veces (otra vez)\n"
+) * 25
+
+
+@override_settings(SYLLABLE_PARALLEL_WORKERS=2)
+class ParallelSyllabifyTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutdown_pool()
+        super().tearDownClass()
+
+    def setUp(self):
+        reset_syllable_cache()
+        clear_pending()
+
+    def test_shards_are_whole_lines(self):
+        shards = split_shards(SONG, 7)
+        self.assertEqual("".join(shards), SONG)
+        self.assertLessEqual(len(shards), 7)
+        # every shard but the last ends with its line break
+        self.assertTrue(all(s.splitlines(keepends=True)[-1] != s.splitlines()[-1] for s in shards[:-1]))
+        self.assertEqual(sum(len(s.splitlines()) for s in shards), len(SONG.splitlines()))
+
+    def test_workers_default_to_the_usable_cpus(self):
+        with self.settings(SYLLABLE_PARALLEL_WORKERS=None):
+            self.assertEqual(parallel_workers(), available_cpus())
+        with self.settings(SYLLABLE_PARALLEL_WORKERS=3):
+            self.assertEqual(parallel_workers(), 3)
+
+    def assertSameResult(self, parallel, serial):
+        self.assertEqual(parallel.columnar(), serial.columnar())
+        self.assertEqual(parallel.counts, serial.counts)
+
+    def test_matches_serial_result(self):
+        for options in (
+            {}, {"unique": True, "attach_punct": "left"}, {"keep_hyphens": True, "lower": True}, {"metric": True},
+        ):
+            with self.subTest(options=options):
+                self.assertSameResult(syllabify_compact_parallel(SONG, **options), syllabify_compact(SONG, **options))
+
+    def test_curated_entries_are_patched_in(self):
+        Syllable.objects.create(word="Rhythm", syllables=["Rhy", "th", "m"])
+        result = syllabify_compact_parallel(SONG)
+        reset_syllable_cache()
+        self.assertSameResult(result, syllabify_compact(SONG))
+        self.assertIn(["Rhy", "th", "m"], [list(item.get("syllables", ())) for item in result.line_items(2)])
+
+    @override_settings(SYLLABLE_PARALLEL_MIN_CHARS=1000)
+    def test_view_switches_to_parallel_above_threshold(self):
+        response = self.client.post(
+            reverse("split_and_syllabify"), data=json.dumps({"text": SONG}), content_type="application/json"
+        )
+        self.assertEqual(response.json()["counts"], syllabify_text(SONG)["counts"])
+        stats = self.client.get(reverse("syllable_stats")).json()["parallel"]
+        self.assertTrue(stats["pool_started"])
+        self.assertGreaterEqual(stats["documents"], 1)
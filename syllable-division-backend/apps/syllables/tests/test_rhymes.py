@@ -0,0 +1,85 @@
+import os
+import tempfile
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from apps.syllables.models import Syllable
+from apps.syllables.services.rhymes import get_rhyme_index, reset_rhyme_indexes, rhyme_keys
+from apps.syllables.services.syllable_engine import divide
+
+
+class RhymeKeyTests(SimpleTestCase):
+    def test_stress_and_rhymes(self):
+        expected = {
+            "canción": ("aguda", "on", "o"),
+            "casa": ("llana", "asa", "a-a"),
+            "patria": ("llana", "atria", "a-a"),
+            "árbol": ("llana", "arbol", "a-o"),
+            "lágrima": ("esdrujula", "agrima", "a-a"),
+            "ciudad": ("aguda", "ad", "a"),
+            "quiso": ("llana", "iso", "i-o"),
+            "reloj": ("aguda", "oj", "o"),
+            "examen": ("llana", "amen", "a-e"),
+            "dímelo": ("esdrujula", "imelo", "i-o"),
+        }
+        for word, keys in expected.items():
+            with self.subTest(word=word):
+                self.assertEqual(rhyme_keys(divide(word)), keys)
+        self.assertIsNone(rhyme_keys(["brr"]))
+
+
+@override_settings(SYLLABLE_DICTIONARY_WRITEBACK=False)
+class RhymeEndpointTests(TestCase):
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        wordlist = os.path.join(tmpdir.name, "words.txt")
+        with open(wordlist, "w", encoding="utf-8") as fh:
+            fh.write("corazón 90\nrazón 80\ncanción 50\npasión 10\namor 5\ncasa 70\npatria 3\nlágrima 2\nCalor\n")
+        override = override_settings(SYLLABLE_RHYME_WORDLIST=wordlist)
+        override.enable()
+        self.addCleanup(override.disable)
+        reset_rhyme_indexes()
+        self.addCleanup(reset_rhyme_indexes)
+
+    def get(self, **params):
+        return self.client.get(reverse("rhymes"), params)
+
+    def words(self, response):
+        self.assertEqual(response.status_code, 200, response.content)
+        return [item["word"] for item in response.json()["results"]]
+
+    def test_ranked_by_frequency_without_the_word_itself(self):
+        response = self.get(word="canción")
+        self.assertEqual(self.words(response), ["corazón", "razón", "pasión"])
+        self.assertEqual(response.json()["stress"], "aguda")
+        self.assertEqual(response.json()["results"][0]["syllables"], ["co", "ra", "zón"])
+        self.assertEqual(self.words(self.get(word="patria", type="assonant")), ["casa", "lágrima"])
+        self.assertEqual(self.words(self.get(word="amor")), ["calor"])
+
+    def test_endings_syllable_counts_and_pages(self):
+        self.assertEqual(self.words(self.get(word="ón", syllables=2)), ["razón", "canción", "pasión"])
+        first = self.get(word="canción", page_size=2)
+        self.assertEqual(self.words(first), ["corazón", "razón"])
+        self.assertEqual(first.json()["count"], 3)
+        self.assertEqual(self.words(self.get(word="canción", page_size=2, page=2)), ["pasión"])
+        self.assertEqual(self.words(self.get(word="corazón", page_size=1, page=2)), ["canción"])
+
+    def test_index_follows_dictionary_changes(self):
+        self.assertEqual(self.words(self.get(word="ratón")), ["corazón", "razón", "canción", "pasión"])
+        row = Syllable.objects.create(word="ratón", syllables=["ra", "tón"])
+        self.assertNotIn("ratón", self.words(self.get(word="ratón")))
+        self.assertIn("ratón", self.words(self.get(word="razón")))
+        row.delete()
+        self.assertNotIn("ratón", self.words(self.get(word="razón")))
+        Syllable.objects.create(word="casa", syllables=["cas", "a"])
+        self.assertEqual(get_rhyme_index().entries["casa"].syllables, ("cas", "a"))
+        self.assertEqual(get_rhyme_index().entries["casa"].frequency, 70)
+
+    def test_invalid_queries(self):
+        for params in [{}, {"word": "casa", "type": "x"}, {"word": "casa", "page": "0"},
+                       {"word": "casa", "page_size": "500"}, {"word": "casa", "lang": "it"},
+                       {"word": "casa", "lang": "xx"}, {"word": "brr"}]:
+            with self.subTest(params=params):
+                self.assertEqual(self.get(**params).status_code, 400)
@@ -0,0 +1,71 @@
+import json
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from apps.syllables.services.serialization import dumps, loads
+from apps.syllables.services.tokenizer import TYPE_NAMES
+
+TEXT = "¿Qué pasa, amor?\n\n«Hola» — adiós..."
+
+
+class SerializationTests(SimpleTestCase):
+    def test_backends_agree(self):
+        payload = {"text": "ñandú «x» \U0001F3B5", "n": [1, 2.5, None, True], "lone": "\ud800"}
+        for backend in ("auto", "json"):
+            with self.subTest(backend=backend), override_settings(SYLLABLE_JSON_BACKEND=backend):
+                encoded = dumps(payload)
+                self.assertIsInstance(encoded, bytes)
+                self.assertEqual(json.loads(encoded), payload)
+                self.assertEqual(loads(encoded), payload)
+
+    def test_loads_rejects_invalid_input_with_value_error(self):
+        for body in (b"{", b"\xff\xfe{}", b""):
+            with self.subTest(body=body), self.assertRaises(ValueError):
+                loads(body)
+
+
+@override_settings(SYLLABLE_DICTIONARY_ENABLED=False)
+class SerializedViewsTests(TestCase):
+    def setUp(self):
+        caches["responses"].clear()
+
+    def post(self, path, body, **extra):
+        return self.client.post(path, data=body, content_type="application/json", **extra)
+
+    def test_invalid_utf8_body_is_a_bad_request(self):
+        self.assertEqual(self.post(reverse("split_text"), b'{"text": "\xff"}').status_code, 400)
+
+    def test_stdlib_backend_returns_the_same_documents(self):
+        body = json.dumps({"text": TEXT})
+        fast = self.post(reverse("split_and_syllabify"), body).json()
+        caches["responses"].clear()
+        with override_settings(SYLLABLE_JSON_BACKEND="json"):
+            slow = self.post(reverse("split_and_syllabify"), body).json()
+        self.assertEqual(fast, slow)
+
+    def test_columnar_format_rebuilds_the_items(self):
+        body = json.dumps({"text": TEXT})
+        items = self.post(reverse("split_and_syllabify"), body).json()
+        columnar = self.post(reverse("split_and_syllabify") + "?format=columnar", body).json()
+        self.assertEqual(columnar["format"], "columnar")
+        self.assertEqual(columnar["type_names"], list(TYPE_NAMES))
+        self.assertEqual(columnar["counts"], items["counts"])
+
+        rebuilt = []
+        offsets = columnar["line_offsets"]
+        for i in range(len(offsets) - 1):
+            line = []
+            for j in range(offsets[i], offsets[i + 1]):
+                item = {"type": columnar["type_names"][columnar["types"][j]], "token": columnar["tokens"][j]}
+                if item["type"] == "word":
+                    start, end = columnar["syllable_offsets"][j:j + 2]
+                    item["syllables"] = columnar["syllables"][start:end]
+                line.append(item)
+            rebuilt.append(line)
+        self.assertEqual(rebuilt, items["items"])
+
+    def test_unknown_format(self):
+        response = self.post(reverse("split_and_syllabify") + "?format=xml", json.dumps({"text": "la"}))
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,48 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.syllables.services.syllable_cache import LRUCache, cache_stats, reset_syllable_cache
+from apps.syllables.services.syllable_divider import divide_into_syllables
+
+
+class LRUCacheTests(SimpleTestCase):
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_zero_capacity_disables_storage(self):
+        cache = LRUCache(0)
+        cache.put("a", 1)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+
+class CachedDividerTests(TestCase):
+    def setUp(self):
+        reset_syllable_cache(capacity=10)
+
+    def tearDown(self):
+        reset_syllable_cache()
+
+    def test_repeated_words_are_hits(self):
+        for _ in range(3):
+            self.assertEqual(divide_into_syllables("palabra"), ["pa", "la", "bra"])
+        stats = cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (2, 1, 1))
+
+    def test_callers_get_independent_lists(self):
+        divide_into_syllables("amor").append("x")
+        self.assertEqual(divide_into_syllables("amor"), ["a", "mor"])
+
+    @override_settings(SYLLABLE_CACHE_SIZE=1)
+    def test_capacity_comes_from_settings(self):
+        reset_syllable_cache()
+        divide_into_syllables("que")
+        divide_into_syllables("amor")
+        self.assertEqual(cache_stats()["capacity"], 1)
+        self.assertEqual(cache_stats()["evictions"], 1)
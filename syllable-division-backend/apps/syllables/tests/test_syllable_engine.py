@@ -0,0 +1,59 @@
+import random
+
+from django.test import SimpleTestCase
+
+from apps.syllables.services.syllable_divider import syllable_divider
+from apps.syllables.services.syllable_engine import ALLOWED_CLUSTERS, DIGRAPHS, SyllableRules, divide
+
+
+# Golden corpus: lyric vocabulary plus edge cases for every nucleus/cluster rule.
+GOLDEN_WORDS = [
+    "palabra", "corazón", "amor", "que", "canción", "noche", "calle", "perro",
+    "tierra", "ciudad", "cuidado", "buey", "Uruguay", "Paraguay", "hoy", "rey",
+    "muy", "ley", "estrella", "transporte", "instrumento", "obstáculo", "abstracto",
+    "país", "día", "río", "oído", "baúl", "aéreo", "poeta", "caos", "pingüino",
+    "vergüenza", "averigüéis", "guion", "huir", "construir", "ñandú", "Ñoño",
+    "CORAZÓN", "LLUVIA", "Chile", "cHarro", "ARRIBA", "auto-estima", "don't",
+    "ISO9001", "hello", "world", "believin'", "stop", "strength", "rhythm",
+    "queue", "beautiful", "yesterday", "y", "yy", "ay", "ayer", "yo", "brrr",
+    "xyz", "a", "e", "aeiou", "iu", "ui", "uy", "íy", "ía", "aí",
+]
+
+
+class SyllableEngineTests(SimpleTestCase):
+    def test_matches_reference_on_golden_corpus(self):
+        for word in GOLDEN_WORDS:
+            with self.subTest(word=word):
+                self.assertEqual(divide(word), syllable_divider(word))
+
+    def test_matches_reference_on_random_words(self):
+        rng = random.Random(20240601)
+        alphabet = "aeiouyáéíóúüAEIOUYÁÍÚÜbcdfghlmnñprstCHLR-'1İ"
+        for _ in range(5000):
+            word = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 12)))
+            with self.subTest(word=word):
+                self.assertEqual(divide(word), syllable_divider(word))
+
+    def test_expected_splits(self):
+        self.assertEqual(divide("palabra"), ["pa", "la", "bra"])
+        self.assertEqual(divide("buey"), ["buey"])
+        self.assertEqual(divide("calle"), ["ca", "lle"])
+        self.assertEqual(divide("instrumento"), ["ins", "tru", "men", "to"])
+        self.assertEqual(divide(""), [])
+        self.assertEqual(divide("brrr"), ["brrr"])
+
+    def test_custom_rules(self):
+        def spanish_with(clusters, digraphs):
+            return SyllableRules(
+                "xx", "Test", classes={"S": "aeo", "W": "iu"}, nucleus=r"[SW]", clusters=clusters, digraphs=digraphs
+            )
+
+        with_st = spanish_with(ALLOWED_CLUSTERS | {"st"}, DIGRAPHS)
+        self.assertEqual(divide("pasta"), ["pas", "ta"])
+        self.assertEqual(divide("pasta", with_st), ["pa", "sta"])
+        self.assertEqual(divide("PASTA", with_st), ["PA", "STA"])
+        no_digraphs = spanish_with(ALLOWED_CLUSTERS - DIGRAPHS, ())
+        self.assertEqual(divide("calle", no_digraphs), ["cal", "le"])
+        self.assertEqual(divide("noche", no_digraphs), ["noc", "he"])
+        with_str = spanish_with(ALLOWED_CLUSTERS | {"str"}, DIGRAPHS)
+        self.assertEqual(divide("mostro", with_str), ["mo", "stro"])
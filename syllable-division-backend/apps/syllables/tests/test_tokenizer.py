@@ -0,0 +1,94 @@
+from django.test import SimpleTestCase, override_settings
+
+from apps.syllables.services.text_syllabifier import syllabify_compact, syllabify_text
+from apps.syllables.services.tokenizer import (
+    TYPE_NAMES,
+    Token,
+    tokenize,
+    tokenize_compact,
+    tokenize_lines,
+    unique_tokens,
+)
+from apps.syllables.services.word_splitter import get_profile, get_word_regex
+
+
+class TokenizerTests(SimpleTestCase):
+    def test_typed_tokens_with_spans(self):
+        text = "¿Qué? sí...\nya"
+        self.assertEqual(
+            list(tokenize(text)),
+            [
+                Token("punct_open", "¿", 0, 1),
+                Token("word", "Qué", 1, 4),
+                Token("punct_close", "?", 4, 5),
+                Token("word", "sí", 6, 8),
+                Token("punct_close", "…", 8, 11),
+                Token("newline", "\n", 11, 12),
+                Token("word", "ya", 12, 14),
+            ],
+        )
+
+    def test_ellipsis_normalization_keeps_remainder_dots(self):
+        texts = [t.text for t in tokenize("a....")]
+        self.assertEqual(texts, ["a", "…", "."])
+        texts = [t.text for t in tokenize("a...", normalize_ellipsis=False)]
+        self.assertEqual(texts, ["a", ".", ".", "."])
+
+    def test_lines_follow_splitlines(self):
+        for text in ["a\nb", "a\n", "a\r\n\r\nb", "\n", "a\n  ", "a b\x0cc"]:
+            with self.subTest(text=text):
+                lines = [text[s:e] for s, e, _ in tokenize_lines(text)]
+                self.assertEqual(lines, text.splitlines())
+
+    def test_unique_dedupes_attached_tokens(self):
+        tokens = list(tokenize("hola, hola hola,"))
+        texts = [t.text for t in unique_tokens(tokens, "left", keep_hyphens=False)]
+        self.assertEqual(texts, ["hola", ",", "hola"])
+        texts = [t.text for t in unique_tokens(tokens, "separate", keep_hyphens=False)]
+        self.assertEqual(texts, ["hola", ","])
+
+
+class TokenizerProfileTests(SimpleTestCase):
+    def test_profiles_are_shared(self):
+        profile = get_profile(include_numbers=1, keep_hyphens=0)
+        self.assertIs(profile, get_profile(True, False))
+        self.assertIs(get_word_regex(True, False), profile.word_regex)
+
+    def test_hyphen_closes_only_when_not_kept(self):
+        self.assertIn("-", get_profile(True, False).closing)
+        self.assertNotIn("-", get_profile(True, True).closing)
+
+
+@override_settings(SYLLABLE_DICTIONARY_ENABLED=False)
+class CompactRepresentationTests(SimpleTestCase):
+    TEXTS = ["¿Qué? sí...\nya", "«Hola» — adiós,\r\n\r\n(bien-venido) 2024", "a\n", "", "hola, hola hola,"]
+    OPTIONS = [
+        {},
+        {"keep_hyphens": True},
+        {"keep_punct": False, "lower": True, "min_len": 3},
+        {"unique": True},
+        {"unique": True, "attach_punct": "never"},
+    ]
+
+    def test_arrays_match_tokenize_lines(self):
+        for text in self.TEXTS:
+            with self.subTest(text=text):
+                types, texts, line_offsets = tokenize_compact(text)
+                lines = [[(TYPE_NAMES[types[j]], texts[j]) for j in range(a, b)]
+                         for a, b in zip(line_offsets, line_offsets[1:])]
+                expected = [[(t.type, t.text) for t in tokens] for _, _, tokens in tokenize_lines(text)]
+                self.assertEqual(lines, expected)
+
+    def test_same_result_as_syllabify_text(self):
+        for text in self.TEXTS:
+            for options in self.OPTIONS:
+                with self.subTest(text=text, options=options):
+                    expected = syllabify_text(text, **options)
+                    result = syllabify_compact(text, **options)
+                    items = [
+                        [dict(item, syllables=list(item["syllables"])) if "syllables" in item else item
+                         for item in result.line_items(i)]
+                        for i in range(len(result))
+                    ]
+                    self.assertEqual(items, expected["items"])
+                    self.assertEqual(result.counts, expected["counts"])
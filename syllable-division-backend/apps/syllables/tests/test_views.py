@@ -0,0 +1,173 @@
+import json
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from apps.syllables.models import Syllable
+from apps.syllables.services.offload import Offloader, OffloadQueueFull, offload_stats
+
+from apps.syllables.services.syllable_cache import cache_stats, reset_syllable_cache
+
+
+class DivideBatchViewTests(TestCase):
+    def setUp(self):
+        reset_syllable_cache()
+
+    def post(self, body):
+        return self.client.post(
+            reverse("divide_syllables_batch"), data=json.dumps(body), content_type="application/json"
+        )
+
+    def test_results_follow_input_order_and_dedupe(self):
+        response = self.post({"words": ["amor", "que", "amor", "palabra", "que"]})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data["count"], data["distinct"]), (5, 3))
+        self.assertEqual(
+            [r["word"] for r in data["results"]], ["amor", "que", "amor", "palabra", "que"]
+        )
+        self.assertEqual(data["results"][3]["syllables"], ["pa", "la", "bra"])
+        self.assertEqual(cache_stats()["misses"], 3)
+
+    def test_distinct_only(self):
+        data = self.post({"words": ["amor", "amor", "que"], "distinct_only": True}).json()
+        self.assertEqual(data["syllables"], {"amor": ["a", "mor"], "que": ["que"]})
+        self.assertNotIn("results", data)
+
+    def test_rejects_invalid_words(self):
+        self.assertEqual(self.post({"words": "amor"}).status_code, 400)
+        self.assertEqual(self.post({"words": ["amor", ""]}).status_code, 400)
+
+
+class SplitSyllablesStreamTests(TestCase):
+    text = "¿Qué pasa, amor?\n\nla la"
+
+    def post(self, path, **extra):
+        return self.client.post(
+            path, data=json.dumps({"text": self.text}), content_type="application/json", **extra
+        )
+
+    def read_ndjson(self, response):
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        return [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+
+    def test_stream_matches_buffered_response(self):
+        url = reverse("split_and_syllabify")
+        buffered = self.post(url).json()
+        records = self.read_ndjson(self.post(url + "?stream=1"))
+
+        lines, summary = records[:-1], records[-1]
+        self.assertEqual([r["items"] for r in lines], buffered["items"])
+        self.assertEqual([r["syllables"] for r in lines], buffered["counts"]["syllables_per_line"])
+        self.assertEqual(summary["type"], "summary")
+        expected = dict(buffered["counts"])
+        del expected["syllables_per_line"]
+        self.assertEqual(summary["counts"], expected)
+
+    def test_accept_header_selects_stream(self):
+        response = self.post(reverse("split_and_syllabify"), HTTP_ACCEPT="application/x-ndjson")
+        self.assertEqual(len(self.read_ndjson(response)), 4)
+
+
+@override_settings(SYLLABLE_DICTIONARY_ENABLED=False)
+class AsyncViewTests(SimpleTestCase):
+    async def apost(self, name, body, path_suffix=""):
+        return await self.async_client.post(
+            reverse(name) + path_suffix, data=json.dumps(body), content_type="application/json"
+        )
+
+    async def test_async_views_match_sync_views(self):
+        text = "¿Qué pasa, amor?\nla la"
+        cases = [
+            ("divide_syllables", {"word": "palabra"}),
+            ("split_text", {"text": text}),
+            ("split_and_syllabify", {"text": text}),
+        ]
+        for name, body in cases:
+            with self.subTest(name=name):
+                sync = await sync_to_async(self.client.post)(
+                    reverse(name), data=json.dumps(body), content_type="application/json"
+                )
+                response = await self.apost(f"{name}_async", body)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), sync.json())
+
+    @override_settings(SYLLABLE_ASYNC_INLINE_MAX_BYTES=0)
+    async def test_large_bodies_go_through_the_pool(self):
+        before = offload_stats()["completed"]
+        response = await self.apost("split_and_syllabify_async", {"text": "la casa"})
+        self.assertEqual(response.json()["counts"]["syllables_total"], 3)
+        self.assertEqual(offload_stats()["completed"], before + 2)  # decoding, then the work
+
+    async def test_stream_mode(self):
+        response = await self.apost("split_and_syllabify_async", {"text": "a\nb"}, "?stream=1")
+        body = b"".join([chunk async for chunk in response.streaming_content])
+        records = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([r["type"] for r in records], ["line", "line", "summary"])
+
+    async def test_full_queue_answers_503(self):
+        offloader = Offloader(max_workers=1, max_queue=0)
+        stream = offloader.stream(["a", "b"])
+        with self.assertRaises(OffloadQueueFull):
+            await offloader.run(len, "x")
+        with self.assertRaises(OffloadQueueFull):
+            offloader.stream([])
+        self.assertEqual(offloader.stats()["rejected"], 2)
+        self.assertEqual([item async for item in stream], ["a", "b"])
+        self.assertEqual(await offloader.run(len, "x"), 1)  # the finished stream freed its slot
+
+    async def test_closing_an_unread_stream_frees_its_slot(self):
+        offloader = Offloader(max_workers=1, max_queue=0)
+        offloader.stream(["a"]).close()
+        self.assertEqual(offloader.stats()["streams"], 0)
+        self.assertEqual(await offloader.run(len, "x"), 1)
+
+
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        caches["responses"].clear()
+
+    def post(self, name, body, **headers):
+        return self.client.post(reverse(name), data=json.dumps(body), content_type="application/json", **headers)
+
+    def test_repeated_requests_are_served_from_cache(self):
+        for name in ("split_text", "split_and_syllabify"):
+            with self.subTest(name=name):
+                first = self.post(name, {"text": "la casa, amor", "lower": True})
+                with patch("apps.syllables.views.split_words") as split_words, \
+                        patch("apps.syllables.views.syllabify_compact") as syllabify_compact:
+                    # Same text and options, different JSON formatting: still a hit
+                    second = self.post(name, {"lower": True, "text": "la casa, amor", "keep_punct": True})
+                split_words.assert_not_called()
+                syllabify_compact.assert_not_called()
+                self.assertEqual(second.content, first.content)
+                self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_etag_depends_on_text_and_options(self):
+        etag = self.post("split_text", {"text": "la casa"})["ETag"]
+        self.assertNotEqual(self.post("split_text", {"text": "la casa "})["ETag"], etag)
+        self.assertNotEqual(self.post("split_text", {"text": "la casa", "lower": True})["ETag"], etag)
+        self.assertNotEqual(self.post("split_and_syllabify", {"text": "la casa"})["ETag"], etag)
+
+    def test_if_none_match_answers_304(self):
+        etag = self.post("split_and_syllabify", {"text": "la casa"})["ETag"]
+        response = self.post("split_and_syllabify", {"text": "la casa"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_dictionary_changes_retire_etags(self):
+        etag = self.post("split_and_syllabify", {"text": "rhythm"})["ETag"]
+        # the first response wrote "rhythm" back as a computed row; curate it
+        Syllable.objects.update_or_create(word="rhythm", defaults={"syllables": ["rhy", "thm"], "source": Syllable.SOURCE_CURATED})
+        response = self.post("split_and_syllabify", {"text": "rhythm"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["items"][0][0]["syllables"], ["rhy", "thm"])
+
+    @override_settings(SYLLABLE_RESPONSE_CACHE_ENABLED=False)
+    def test_can_be_disabled(self):
+        self.assertNotIn("ETag", self.post("split_text", {"text": "la casa"}))
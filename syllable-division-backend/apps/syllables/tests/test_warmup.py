@@ -0,0 +1,40 @@
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+
+from apps.syllables.services import warmup
+from apps.syllables.services.syllable_cache import get_syllable_cache, reset_syllable_cache
+
+
+class ReadinessTests(TestCase):
+    def setUp(self):
+        warmup.reset_readiness()
+        reset_syllable_cache()
+        self.addCleanup(warmup.warm_up)  # leave the process ready, as wsgi.py does
+
+    def test_ready_only_after_warmup(self):
+        response = self.client.get("/readyz/")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["status"], "starting")
+        self.assertEqual(self.client.get("/healthz/").status_code, 200)
+
+        warmup.warm_up()
+        response = self.client.get("/readyz/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "ready")
+
+    @override_settings(SYLLABLE_DICTIONARY_PRELOAD=True)
+    def test_warmup_preloads_the_dictionary(self):
+        from apps.syllables.models import Syllable
+
+        Syllable.objects.create(word="amor", syllables=["a", "mor"])
+        warmup.warm_up()
+        self.assertEqual(get_syllable_cache().get(("es", "amor")), ("a", "mor"))
+
+    def test_not_ready_without_database(self):
+        warmup.warm_up()
+        with mock.patch.object(warmup.connection, "ensure_connection", side_effect=DatabaseError):
+            response = self.client.get("/readyz/")
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(response.json()["database"])
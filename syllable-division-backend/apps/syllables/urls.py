@@ -1,12 +1,46 @@
 from django.urls import path
-from .views import divide_syllables, split_text, split_and_syllabify
+from .async_views import divide_syllables_async, split_text_async, split_and_syllabify_async
+from .views import (
+    divide_syllables,
+    divide_syllables_batch,
+    rhymes,
+    split_text,
+    split_and_syllabify,
+    split_and_syllabify_incremental,
+    syllable_job,
+    syllable_job_results,
+    syllable_jobs,
+    syllable_metrics,
+    syllable_stats,
+)
 
 urlpatterns = [
     path("divide/", divide_syllables, name="divide_syllables"),
+    path("divide-batch/", divide_syllables_batch, name="divide_syllables_batch"),
     path("split/", split_text, name="split_text"),
     path("split-syllables/", split_and_syllabify, name="split_and_syllabify"),
+    path("split-syllables/incremental/", split_and_syllabify_incremental, name="split_and_syllabify_incremental"),
+    path("rhymes/", rhymes, name="rhymes"),
+    path("jobs/", syllable_jobs, name="syllable_jobs"),
+    path("jobs/<uuid:job_id>/", syllable_job, name="syllable_job"),
+    path("jobs/<uuid:job_id>/results/", syllable_job_results, name="syllable_job_results"),
+    path("stats/", syllable_stats, name="syllable_stats"),
+    path("metrics/", syllable_metrics, name="syllable_metrics"),
+    # Variantes async (ASGI): textos grandes se procesan en un pool acotado
+    path("async/divide/", divide_syllables_async, name="divide_syllables_async"),
+    path("async/split/", split_text_async, name="split_text_async"),
+    path("async/split-syllables/", split_and_syllabify_async, name="split_and_syllabify_async"),
     # Sin barra (evita 301 en preflight)
     path("divide", divide_syllables, name="divide_syllables_no_slash"),
+    path("divide-batch", divide_syllables_batch, name="divide_syllables_batch_no_slash"),
     path("split", split_text, name="split_text_no_slash"),
     path("split-syllables", split_and_syllabify, name="split_and_syllabify_no_slash"),
+    path("split-syllables/incremental", split_and_syllabify_incremental, name="split_and_syllabify_incremental_no_slash"),
+    path("rhymes", rhymes, name="rhymes_no_slash"),
+    path("jobs", syllable_jobs, name="syllable_jobs_no_slash"),
+    path("jobs/<uuid:job_id>", syllable_job, name="syllable_job_no_slash"),
+    path("jobs/<uuid:job_id>/results", syllable_job_results, name="syllable_job_results_no_slash"),
+    path("async/divide", divide_syllables_async, name="divide_syllables_async_no_slash"),
+    path("async/split", split_text_async, name="split_text_async_no_slash"),
+    path("async/split-syllables", split_and_syllabify_async, name="split_and_syllabify_async_no_slash"),
 ]
\ No newline at end of file
@@ -1,209 +1,609 @@
-from django.http import JsonResponse, HttpResponseBadRequest
+import itertools
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseNotFound, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
-import json
-import re
 
+from apps.syllables.services.batch import divide_distinct
+from apps.syllables.services.incremental import (
+    DocumentConflict,
+    InvalidChange,
+    get_document_store,
+    line_payload,
+)
+from apps.syllables.services.instrumentation import add_counts, snapshot as metrics_snapshot, span
+from apps.syllables.services.jobs import (
+    finished_documents,
+    get_job,
+    job_payload,
+    job_stats,
+    submit_job,
+)
+from apps.syllables.services.languages import UnknownLanguage, get_rules
+from apps.syllables.services.lexicon import lexicon_stats
+from apps.syllables.services.meter import METER_LANGS, meter_payload
+from apps.syllables.services.limits import RequestTooLarge, check_text, limit_request, limit_stats, too_large
+from apps.syllables.services.offload import offload_stats
+from apps.syllables.services.parallel import parallel_stats, syllabify_compact_parallel, use_parallel
+from apps.syllables.services.rhymes import RHYME_LANGS, RHYME_TYPES, get_rhyme_index, rhyme_stats
+from apps.syllables.services.response_cache import cached_response, response_cache_stats
+from apps.syllables.services.serialization import (
+    CONTENT_TYPE,
+    dumps,
+    json_array,
+    json_object,
+    json_response,
+    loads,
+)
+from apps.syllables.services.syllable_cache import cache_stats
 from apps.syllables.services.syllable_divider import divide_into_syllables
-from apps.syllables.services.word_splitter import split_words, get_word_regex, get_punct_chars
+from apps.syllables.services.text_syllabifier import (
+    SyllabifiedText,
+    SyllabifyCounts,
+    iter_syllabified_lines,
+    syllabify_compact,
+)
+from apps.syllables.services.word_splitter import profile_stats, split_words
 
 @csrf_exempt
 def divide_syllables(request):
     if request.method != "POST":
         return HttpResponseBadRequest("Use POST con JSON {'word': '...'}")
+    data, error = parse_json_body(request)
+    if error:
+        return error
+    return divide_response(data)
+
+
+def parse_json_body(request):
+    """Return (data, None), or (None, HttpResponseBadRequest) if the body isn't valid JSON."""
+    try:
+        with span("parse"):
+            return loads(request.body), None
+    except ValueError:  # invalid JSON or not UTF-8
+        return None, HttpResponseBadRequest("JSON inválido")
+
+
+class InvalidOption(ValueError):
+    pass
+
+
+def request_min_len(data):
+    """Validated `min_len` option (an integer, 1 when missing). Raises InvalidOption."""
+    value = data.get("min_len", 1)
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise InvalidOption("El campo 'min_len' debe ser un número entero")
     try:
-        data = json.loads(request.body.decode("utf-8"))
-    except json.JSONDecodeError:
-        return HttpResponseBadRequest("JSON inválido")
+        return int(value)
+    except ValueError:
+        raise InvalidOption("El campo 'min_len' debe ser un número entero")
+
+
+def request_lang(data):
+    """Validated `lang` option: a code from languages.LANGUAGES, the default
+    language when missing. Raises UnknownLanguage.
+    """
+    lang = data.get("lang")
+    if lang is not None and not isinstance(lang, str):
+        raise UnknownLanguage("El campo 'lang' debe ser un código de idioma")
+    return get_rules(lang).code
 
+
+def divide_response(data):
     word = data.get("word")
     if not isinstance(word, str) or not word:
         return HttpResponseBadRequest("El campo 'word' es requerido")
+    try:
+        lang = request_lang(data)
+    except UnknownLanguage as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    with span("syllabify"):
+        syllables = divide_into_syllables(word, lang)
+    return json_response({"word": word, "syllables": syllables})
 
-    return JsonResponse({"word": word, "syllables": divide_into_syllables(word)})
+
+@csrf_exempt
+@limit_request("divide_syllables_batch")
+def divide_syllables_batch(request):
+    """Syllabify many words in one request.
+    Body JSON:
+    {
+      "words": ["...", ...],
+      "distinct_only": false,  # true -> return only the {word: syllables} map
+      "lang": "es"             # es | en | pt | it (default SYLLABLE_DEFAULT_LANG)
+    }
+    Each distinct word is syllabified once; `results` follows the input order.
+    """
+    if request.method != "POST":
+        return HttpResponseBadRequest("Use POST con JSON {'words': ['...']}")
+    data, error = parse_json_body(request)
+    if error:
+        return error
+
+    words = data.get("words")
+    if not isinstance(words, list) or not all(isinstance(w, str) and w for w in words):
+        return HttpResponseBadRequest("El campo 'words' debe ser una lista de palabras")
+    max_words = getattr(settings, "SYLLABLE_BATCH_MAX_WORDS", 20000)
+    if len(words) > max_words:
+        return HttpResponseBadRequest(f"Máximo {max_words} palabras por petición")
+    distinct_only = bool(data.get("distinct_only", False))
+    try:
+        lang = request_lang(data)
+    except UnknownLanguage as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    with span("syllabify"):
+        distinct = divide_distinct(words, lang)
+    add_counts(words=len(words), distinct_words=len(distinct))
+    payload = {"count": len(words), "distinct": len(distinct)}
+    if distinct_only:
+        payload["syllables"] = distinct
+    else:
+        payload["results"] = [{"word": w, "syllables": distinct[w]} for w in words]
+    return json_response(payload)
 
 
 @csrf_exempt
+@limit_request("split_text")
 def split_text(request):
     if request.method != "POST":
         return HttpResponseBadRequest("Use POST con JSON {'text': '...'}")
-    try:
-        data = json.loads(request.body.decode("utf-8"))
-    except json.JSONDecodeError:
-        return HttpResponseBadRequest("JSON inválido")
+    data, error = parse_json_body(request)
+    if error:
+        return error
+    return split_response(data, request)
+
+
+def split_response(data, request=None):
+    text, options, error = split_text_args(data)
+    if error:
+        return error
+    if request is None:
+        return split_text_response(text, options)
+    return cached_response(request, "split_text", text, options, split_text_response)
+
 
+def split_text_args(data):
+    """Validate a split body: return (text, options, None) or (None, None, error
+    response): 400, or 413 when the text exceeds the endpoint limits.
+    """
     text = data.get("text")
     if not isinstance(text, str) or not text:
-        return HttpResponseBadRequest("El campo 'text' es requerido")
+        return None, None, HttpResponseBadRequest("El campo 'text' es requerido")
+    try:
+        check_text(text, "split_text")
+        min_len = request_min_len(data)
+    except RequestTooLarge as exc:
+        return None, None, too_large(str(exc))
+    except InvalidOption as exc:
+        return None, None, HttpResponseBadRequest(str(exc))
 
     # Optional flags
-    include_numbers = bool(data.get("include_numbers", True))
-    keep_hyphens = bool(data.get("keep_hyphens", False))
-    keep_punct = bool(data.get("keep_punct", True))
-    lower = bool(data.get("lower", False))
-    min_len = int(data.get("min_len", 1))
-    unique = bool(data.get("unique", False))
-    attach_punct = str(data.get("attach_punct", "separate"))
-    normalize_ellipsis = bool(data.get("normalize_ellipsis", True))
+    options = {
+        "include_numbers": bool(data.get("include_numbers", True)),
+        "keep_hyphens": bool(data.get("keep_hyphens", False)),
+        "keep_punct": bool(data.get("keep_punct", True)),
+        "lower": bool(data.get("lower", False)),
+        "min_len": min_len,
+        "unique": bool(data.get("unique", False)),
+        "attach_punct": str(data.get("attach_punct", "separate")),
+        "normalize_ellipsis": bool(data.get("normalize_ellipsis", True)),
+    }
+    return text, options, None
 
-    tokens = split_words(
-        text,
-        include_numbers=include_numbers,
-        keep_hyphens=keep_hyphens,
-        keep_punct=keep_punct,
-        lower=lower,
-        min_len=min_len,
-        unique=unique,
-        attach_punct=attach_punct,
-        normalize_ellipsis=normalize_ellipsis,
-    )
-
-    return JsonResponse({
-        "text": text,
-        "tokens": tokens,
-        "count": len(tokens),
-        "options": {
-            "include_numbers": include_numbers,
-            "keep_hyphens": keep_hyphens,
-            "keep_punct": keep_punct,
-            "lower": lower,
-            "min_len": min_len,
-            "unique": unique,
-            "attach_punct": attach_punct,
-            "normalize_ellipsis": normalize_ellipsis,
-        },
-    })
+
+def split_text_response(text, options):
+    with span("tokenize"):
+        tokens = split_words(text, **options)
+    add_counts(tokens=len(tokens))
+
+    with span("serialize"):
+        return json_response({
+            "text": text,
+            "tokens": tokens,
+            "count": len(tokens),
+            "options": options,
+        })
 
 
 @csrf_exempt
+@limit_request("split_and_syllabify")
 def split_and_syllabify(request):
     """Split the text (by lines) and syllabify only word tokens (skip punctuation).
     Body JSON:
     {
       "text": "...",
+      "lang": "es",   # es | en | pt | it (default SYLLABLE_DEFAULT_LANG)
+      "metric": false, # true -> also the sung syllable count of each line (Spanish only)
       ... same options as split_text ...
     }
         Returns items grouped per line (list of lists). Each item is:
             { type: 'word'|'punct'|'punct_open'|'punct_close', token: str, [syllables]: [...] }
+        With metric, `meter` has one entry per line:
+            { syllables: int, beats: [beat of each syllable], synalephas: int, final_stress: str }
+    With ?stream=1 (or Accept: application/x-ndjson) the response is streamed as
+    NDJSON, one line record at a time plus a final summary record.
+    With ?format=columnar items are returned as parallel arrays instead (see
+    SyllabifiedText.columnar).
     """
     if request.method != "POST":
         return HttpResponseBadRequest("Use POST con JSON {'text': '...'}")
-    try:
-        data = json.loads(request.body.decode("utf-8"))
-    except json.JSONDecodeError:
-        return HttpResponseBadRequest("JSON inválido")
+    data, error = parse_json_body(request)
+    if error:
+        return error
+    text, options, error = split_syllables_args(data)
+    if error:
+        return error
+
+    if wants_stream(request):
+        return ndjson_response(ndjson_lines(text, options))
+    return split_syllables_cached(request, text, options)
+
 
+def split_syllables_args(data):
+    """Validate a split-syllables body: return (text, options, None) or
+    (None, None, error response): 400, or 413 when the text exceeds the limits.
+    """
     text = data.get("text")
     if not isinstance(text, str) or not text:
-        return HttpResponseBadRequest("El campo 'text' es requerido")
+        return None, None, HttpResponseBadRequest("El campo 'text' es requerido")
+    try:
+        check_text(text, "split_and_syllabify")
+        options = split_syllables_options(data)
+    except RequestTooLarge as exc:
+        return None, None, too_large(str(exc))
+    except (UnknownLanguage, InvalidOption) as exc:
+        return None, None, HttpResponseBadRequest(str(exc))
+    return text, options, None
 
+
+def split_syllables_options(data):
     include_numbers = bool(data.get("include_numbers", True))
     keep_hyphens = bool(data.get("keep_hyphens", False))
     keep_punct = bool(data.get("keep_punct", True))  # default True for this endpoint
     attach_punct = str(data.get("attach_punct", "auto"))
     normalize_ellipsis = bool(data.get("normalize_ellipsis", True))
     lower = bool(data.get("lower", False))
-    min_len = int(data.get("min_len", 1))
+    min_len = request_min_len(data)
     unique = bool(data.get("unique", False))
+    lang = request_lang(data)
+    metric = bool(data.get("metric", False))
+    if metric and lang not in METER_LANGS:
+        raise InvalidOption("El análisis métrico solo está disponible en español")
 
-    # Classify tokens and syllabify only words (strip punctuation for syllabifier)
-    word_re = get_word_regex(include_numbers=include_numbers, keep_hyphens=keep_hyphens)
-    punct_class = get_punct_chars(keep_hyphens=keep_hyphens)
-    # Define opening/closing sets for item tagging and counts
-    opening = {"¿", "¡", "(", "[", "{", "«", "“", "‘"}
-    closing = {"?", "!", ")", "]", "}", "»", "”", "’", ",", ".", ";", ":", "…"}
-    if not keep_hyphens:
-        closing = set(list(closing) + ["-"])
-    items = []  # list of lists (per line)
-    syllables_total = 0
-    syllables_per_line = []
-    lines = text.splitlines()
-    for line in lines:
-        line_tokens = split_words(
-            line,
-            include_numbers=include_numbers,
-            keep_hyphens=keep_hyphens,
-            keep_punct=keep_punct,
-            attach_punct=attach_punct,
-            lower=lower,
-            min_len=min_len,
-            unique=unique,
-            normalize_ellipsis=normalize_ellipsis,
-        )
-
-        line_items = []
-        line_syllables_total = 0
-
-        def push_punct_chars(punc: str):
-            for ch in punc:
-                if ch in opening:
-                    ptype = "punct_open"
-                elif ch in closing:
-                    ptype = "punct_close"
-                else:
-                    ptype = "punct"
-                line_items.append({"type": ptype, "token": ch})
-
-        for tok in line_tokens:
-            # Split token into prefix punctuation, core, and suffix punctuation
-            pre_match = re.match(rf'^[{punct_class}]+', tok)
-            suf_match = re.search(rf'[{punct_class}]+$', tok)
-            prefix = pre_match.group(0) if pre_match else ""
-            suffix = suf_match.group(0) if suf_match else ""
-
-            core_start = len(prefix)
-            core_end = len(tok) - len(suffix)
-            core = tok[core_start:core_end] if core_end >= core_start else ""
-            core_no_hyphen = core.replace("-", "")
-
-            # If the core is a word (after removing hyphens), output prefix punct(s), word, then suffix punct(s)
-            if core and (word_re.match(core) or word_re.match(core_no_hyphen)):
-                if prefix:
-                    push_punct_chars(prefix)
-                sylls = divide_into_syllables(core_no_hyphen)
-                line_items.append({
-                    "type": "word",
-                    "token": core_no_hyphen,
-                    "syllables": sylls
-                })
-                line_syllables_total += len(sylls)
-                syllables_total += len(sylls)
-                if suffix:
-                    push_punct_chars(suffix)
-            else:
-                # Entire token considered punctuation or non-word
-                if tok:
-                    push_punct_chars(tok)
-
-        items.append(line_items)
-        syllables_per_line.append(line_syllables_total)
-
-    # Count punctuation in the original text to capture opening signs even if attached
-    punct_open_count = sum(1 for ch in text if ch in opening)
-    punct_close_count = sum(1 for ch in text if ch in closing)
-    punct_total_count = punct_open_count + punct_close_count
-
-    return JsonResponse({
-        "text": text,
-        "items": items,
-        "counts": {
-            "lines": len(items),
-            "total with symbols": sum(len(line) for line in items),
-            "words": sum(1 for line in items for it in line if it["type"] == "word"),
-            "punct": sum(1 for line in items for it in line if it["type"] in {"punct", "punct_open", "punct_close"}),
-            "punct_open": punct_open_count,
-            "punct_close": punct_close_count,
-            "punct_total": punct_total_count,
-            "syllables_total": syllables_total,
-            "syllables_per_line": syllables_per_line,
-        },
-        "options": {
-            "include_numbers": include_numbers,
-            "keep_hyphens": keep_hyphens,
-            "keep_punct": keep_punct,
-            "attach_punct": attach_punct,
-            "normalize_ellipsis": normalize_ellipsis,
-            "lower": lower,
-            "min_len": min_len,
-            "unique": unique,
-        },
-    })
\ No newline at end of file
+    options = {
+        "include_numbers": include_numbers,
+        "keep_hyphens": keep_hyphens,
+        "keep_punct": keep_punct,
+        "attach_punct": attach_punct,
+        "normalize_ellipsis": normalize_ellipsis,
+        "lower": lower,
+        "min_len": min_len,
+        "unique": unique,
+        "lang": lang,
+        "metric": metric,
+    }
+    return options
+
+
+@csrf_exempt
+@limit_request("split_and_syllabify_incremental")
+def split_and_syllabify_incremental(request):
+    """Incremental split-syllables for live editing.
+    Open a document with its full text:
+    {
+      "text": "...",
+      ... same options as split-syllables ...
+    }
+        -> { doc_id, version: 1, lines: [{items, syllables}, ...], counts }
+    The server picks doc_id (a random id; a `doc_id` sent along is ignored), so
+    reopening gives a new one.
+    Then send only the changed line ranges, against the last version received:
+    {
+      "doc_id": "...",
+      "version": 1,
+      "changes": [{"start": 3, "end": 4, "lines": ["new text of line 3"]}, ...]
+    }
+        -> { doc_id, version: 2, patch: [{start, delete, lines: [{items, syllables}]}], counts }
+    Each change replaces lines [start, end) (str.splitlines() numbering) of the
+    document as left by the previous change; the patch mirrors them. 409 means the
+    document is unknown here or the version is stale: reopen it with the full text.
+    413 means the edits would take the document past the endpoint limits.
+    """
+    if request.method != "POST":
+        return HttpResponseBadRequest("Use POST con JSON {'text': '...'} o {'doc_id', 'version', 'changes'}")
+    data, error = parse_json_body(request)
+    if error:
+        return error
+
+    store = get_document_store()
+
+    if "text" in data:
+        text = data["text"]
+        if not isinstance(text, str):
+            return HttpResponseBadRequest("El campo 'text' debe ser un texto")
+        try:
+            check_text(text, "split_and_syllabify_incremental")
+            options = split_syllables_options(data)
+        except RequestTooLarge as exc:
+            return too_large(str(exc))
+        except (UnknownLanguage, InvalidOption) as exc:
+            return HttpResponseBadRequest(str(exc))
+        doc = store.open(text, options)
+        with span("serialize"):
+            return json_response({
+                "doc_id": doc.doc_id,
+                "version": doc.version,
+                "lines": [line_payload(line) for line in doc.lines],
+                "counts": doc.totals(),
+                "options": doc.options,
+            })
+
+    doc_id = data.get("doc_id")
+    if doc_id is not None and (not isinstance(doc_id, str) or not doc_id or len(doc_id) > 128):
+        return HttpResponseBadRequest("El campo 'doc_id' debe ser un texto de hasta 128 caracteres")
+    version = data.get("version")
+    changes = data.get("changes")
+    if doc_id is None or isinstance(version, bool) or not isinstance(version, int) or not isinstance(changes, list):
+        return HttpResponseBadRequest("Envíe 'text' para abrir el documento, o 'doc_id', 'version' y 'changes'")
+    try:
+        doc, patch = store.apply(doc_id, version, changes)
+    except DocumentConflict as exc:
+        return json_response({"error": str(exc), "doc_id": doc_id, "version": exc.version}, status=409)
+    except InvalidChange as exc:
+        return HttpResponseBadRequest(str(exc))
+    except RequestTooLarge as exc:
+        return too_large(str(exc))
+    with span("serialize"):
+        return json_response({"doc_id": doc.doc_id, "version": doc.version, "patch": patch, "counts": doc.totals()})
+
+
+def split_syllables_cached(request, text, options):
+    """Serve split-syllables (?format=items|columnar) through the response cache."""
+    fmt = request.GET.get("format", "items")
+    if fmt == "columnar":
+        return cached_response(request, "split_and_syllabify:columnar", text, options, split_syllables_columnar_response)
+    if fmt != "items":
+        return HttpResponseBadRequest("Formato desconocido (use 'items' o 'columnar')")
+    return cached_response(request, "split_and_syllabify", text, options, split_syllables_response)
+
+
+def _syllabify(text, options) -> SyllabifiedText:
+    if use_parallel(text):
+        return syllabify_compact_parallel(text, **options)
+    return syllabify_compact(text, **options)
+
+
+def split_syllables_response(text, options):
+    result = _syllabify(text, options)
+
+    with span("serialize"):
+        # Item dicts only exist for the line being encoded
+        items = json_array(dumps(result.line_items(i)) for i in range(len(result)))
+        members = [("text", text), ("items", items), ("counts", result.counts), ("options", options)]
+        if result.meter is not None:
+            members.insert(3, ("meter", [meter_payload(meter) for meter in result.meter]))
+        return HttpResponse(json_object(members), content_type=CONTENT_TYPE)
+
+
+def split_syllables_columnar_response(text, options):
+    result = _syllabify(text, options)
+
+    with span("serialize"):
+        return json_response({
+            "text": text,
+            "format": "columnar",
+            **result.columnar(),
+            "counts": result.counts,
+            "options": options,
+        })
+
+
+def wants_stream(request) -> bool:
+    if request.GET.get("stream", "").lower() in {"1", "true", "yes"}:
+        return True
+    return "application/x-ndjson" in request.headers.get("Accept", "")
+
+
+def ndjson_response(lines):
+    response = StreamingHttpResponse(lines, content_type="application/x-ndjson")
+    response["X-Accel-Buffering"] = "no"  # let proxies flush each line
+    return response
+
+
+def ndjson_lines(text, options):
+    """Stream split-syllables as NDJSON: one {"type": "line"} record per lyric
+    line as soon as it is processed, then a {"type": "summary"} record with the
+    counts accumulated along the way (per-line syllables live in each line record).
+    """
+    counts = SyllabifyCounts(keep_per_line=False)
+    for line in iter_syllabified_lines(text, counts, **options):
+        record = {
+            "type": "line",
+            "index": line.index,
+            "items": line.items,
+            "syllables": line.syllables,
+        }
+        if line.meter is not None:
+            record["meter"] = meter_payload(line.meter)
+        yield dumps(record) + b"\n"
+    yield dumps({"type": "summary", "counts": counts.as_dict(), "options": options}) + b"\n"
+
+
+@csrf_exempt
+@limit_request("syllable_jobs")
+def syllable_jobs(request):
+    """Queue a batch of documents for background split-syllables (see services/jobs.py).
+    Body JSON:
+    {
+      "documents": [{"id": "song-1", "text": "..."}, "...", ...],  # id optional
+      ... same options as split-syllables, applied to every document ...
+    }
+        -> 202 { job_id, status, total, processed, failed, progress, ... }
+    Poll GET jobs/<job_id>/ for progress and GET jobs/<job_id>/results/ for the
+    documents processed so far.
+    """
+    if request.method != "POST":
+        return HttpResponseBadRequest("Use POST con JSON {'documents': [...]}")
+    data, error = parse_json_body(request)
+    if error:
+        return error
+
+    documents = data.get("documents")
+    max_documents = getattr(settings, "SYLLABLE_JOB_MAX_DOCUMENTS", 1000)
+    if not isinstance(documents, list) or not documents:
+        return HttpResponseBadRequest("El campo 'documents' debe ser una lista de documentos")
+    if len(documents) > max_documents:
+        return HttpResponseBadRequest(f"Máximo {max_documents} documentos por trabajo")
+    queued = []
+    for index, document in enumerate(documents):
+        name, text = str(index), document
+        if isinstance(document, dict):
+            name, text = document.get("id", name), document.get("text")
+        if not isinstance(name, str) or not name or len(name) > 128:
+            return HttpResponseBadRequest(f"Documento {index}: 'id' debe ser un texto de hasta 128 caracteres")
+        if not isinstance(text, str) or not text:
+            return HttpResponseBadRequest(f"Documento {index}: el campo 'text' es requerido")
+        try:
+            check_text(text, "split_and_syllabify")
+        except RequestTooLarge as exc:
+            return too_large(f"Documento {index}: {exc}")
+        queued.append((name, text))
+    try:
+        options = split_syllables_options(data)
+    except (UnknownLanguage, InvalidOption) as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    job = submit_job(queued, options)
+    return json_response(job_payload(job), status=202)
+
+
+def syllable_job(request, job_id):
+    """Status and progress of a job: GET jobs/<job_id>/."""
+    if request.method != "GET":
+        return HttpResponseBadRequest("Use GET")
+    job = get_job(job_id)
+    if job is None:
+        return HttpResponseNotFound("Trabajo no encontrado")
+    return json_response(job_payload(job))
+
+
+def syllable_job_results(request, job_id):
+    """Processed documents of a job, in document order.
+    GET ?after=-1&limit=50   documents after index `after`, up to `limit` (max 500)
+    Each record is { index, id, status: 'done', items, counts, [meter] } or
+    { index, id, status: 'failed', error }. Records stop at the first document
+    still pending, so paging with after=<last index received> never skips one;
+    `next` is that cursor. With ?stream=1 the records are streamed as NDJSON plus
+    a final {"type": "summary"} record with the job status.
+    """
+    if request.method != "GET":
+        return HttpResponseBadRequest("Use GET")
+    try:
+        after = _query_int(request, "after", -1, -1, 10 ** 9)
+        limit = _query_int(request, "limit", 50, 1, 500)
+    except InvalidOption as exc:
+        return HttpResponseBadRequest(str(exc))
+    job = get_job(job_id)
+    if job is None:
+        return HttpResponseNotFound("Trabajo no encontrado")
+
+    with span("fetch"):
+        records = finished_documents(job, after, limit)
+    cursor = records[-1]["index"] if records else after
+    if wants_stream(request):
+        lines = (dumps({"type": "document", **record}) + b"\n" for record in records)
+        summary = dumps({"type": "summary", "next": cursor, **job_payload(job)}) + b"\n"
+        return ndjson_response(itertools.chain(lines, [summary]))
+    with span("serialize"):
+        return json_response({**job_payload(job), "results": records, "next": cursor})
+
+
+def _query_int(request, name, default, minimum, maximum):
+    value = request.GET.get(name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        number = minimum - 1
+    if not minimum <= number <= maximum:
+        raise InvalidOption(f"El parámetro '{name}' debe ser un entero entre {minimum} y {maximum}")
+    return number
+
+
+def rhymes(request):
+    """Words that rhyme with a word, most frequent first (see services/rhymes.py).
+    GET ?word=canción          consonant rhyme: same letters from the stressed vowel
+        &type=assonant         same vowels from the stressed one instead
+        &syllables=3           only words with this many syllables
+        &page=1&page_size=50   page_size up to 200
+        &lang=es               only Spanish is indexed
+    `word` may also be an ending: ?word=ón&syllables=2 lists two-syllable words
+    ending in stressed -ón.
+    """
+    if request.method != "GET":
+        return HttpResponseBadRequest("Use GET")
+    word = request.GET.get("word", "").strip()
+    if not word or len(word) > 64:
+        return HttpResponseBadRequest("El parámetro 'word' es requerido")
+    rhyme = request.GET.get("type", "consonant")
+    if rhyme not in RHYME_TYPES:
+        return HttpResponseBadRequest("Tipo de rima desconocido (use 'consonant' o 'assonant')")
+    try:
+        lang = request_lang(request.GET)
+        syllables = _query_int(request, "syllables", 0, 0, 30)
+        page = _query_int(request, "page", 1, 1, 10000)
+        page_size = _query_int(request, "page_size", 50, 1, 200)
+    except (UnknownLanguage, InvalidOption) as exc:
+        return HttpResponseBadRequest(str(exc))
+    if lang not in RHYME_LANGS:
+        return HttpResponseBadRequest("El índice de rimas solo está disponible en español")
+
+    with span("rhymes"):
+        found = get_rhyme_index(lang).query(word, rhyme, syllables, (page - 1) * page_size, page_size)
+    if found is None:
+        return HttpResponseBadRequest("La palabra no tiene vocales para rimar")
+    return json_response({
+        "word": word,
+        "type": rhyme,
+        "syllables": syllables or None,
+        "page": page,
+        "page_size": page_size,
+        **found,
+    })
+
+
+def syllable_stats(request):
+    """Inspect in-process syllabification stats: divider cache (size, hits, misses,
+    evictions), the memory-mapped lexicons, request limit rejections, build cost
+    of the precompiled tokenizer profiles, the async offload pool (concurrency
+    limit, queue depth, rejections), the parallel process pool used for very
+    large texts, the split response cache, the incremental document store, the
+    rhyme indexes and the background job workers of this process.
+    """
+    if request.method != "GET":
+        return HttpResponseBadRequest("Use GET")
+    return json_response({
+        "cache": cache_stats(),
+        "lexicon": lexicon_stats(),
+        "limits": limit_stats(),
+        "tokenizer": profile_stats(),
+        "offload": offload_stats(),
+        "parallel": parallel_stats(),
+        "response_cache": response_cache_stats(),
+        "incremental_documents": get_document_store().stats(),
+        "rhymes": rhyme_stats(),
+        "jobs": job_stats(),
+    })
+
+
+def syllable_metrics(request):
+    """Per-endpoint request metrics collected by SyllableMetricsMiddleware:
+    status counts, body sizes, token/word/syllable totals and latency
+    histograms per stage (parse, tokenize, syllabify, serialize, total).
+    """
+    if request.method != "GET":
+        return HttpResponseBadRequest("Use GET")
+    return json_response({"endpoints": metrics_snapshot()})
@@ -1,22 +1,10 @@
-def divide_into_syllables(word):
-    vowels = "aeiouy"
-    syllables = []
-    current_syllable = ""
-    
-    for char in word:
-        if char.lower() in vowels:
-            if current_syllable and current_syllable[-1] not in vowels:
-                syllables.append(current_syllable)
-                current_syllable = char
-            else:
-                current_syllable += char
-        else:
-            current_syllable += char
-    
-    if current_syllable:
-        syllables.append(current_syllable)
-    
-    return syllables
+from apps.syllables.services.syllable_divider import divide_into_syllables  # noqa: F401
+
+
+# `divide_into_syllables` used to have its own vowel-splitting heuristic here,
+# which disagreed with the API. It now is the API's: cache, dictionary and the
+# per-language rules (`divide_into_syllables(word, lang)`).
+
 
 def is_vowel(char):
-    return char.lower() in "aeiouy"
\ No newline at end of file
+    return char.lower() in "aeiouy"
@@ -1,6 +1,23 @@
 import os
+import sys
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.base')
 
-application = get_asgi_application()
\ No newline at end of file
+application = get_asgi_application()
+
+# Load the syllable tables, lexicons and (with SYLLABLE_DICTIONARY_PRELOAD) the
+# dictionary cache before serving; /readyz/ reports ready afterwards. Under
+# gunicorn's preload_app this runs once in the master, before the fork.
+from apps.syllables.services.warmup import warm_up  # noqa: E402
+
+warm_up()
+
+# SYLLABLE_JOB_THREADS job worker threads run in the serving processes from the
+# start, not from the first job submission. Under gunicorn that is the post_fork
+# hook (gunicorn.conf.py): threads started here, in the master, would not survive
+# the fork.
+if "gunicorn" not in sys.modules:
+    from apps.syllables.services.jobs import start_job_threads  # noqa: E402
+
+    start_job_threads()
@@ -11,6 +11,8 @@ https://docs.djangoproject.com/en/X.X/topics/settings/
 import os
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
@@ -40,6 +42,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'apps.syllables.middleware.SyllableMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -54,6 +57,9 @@ CORS_ALLOWED_ORIGINS = [
     "http://localhost:4200",
 ]
 CORS_ALLOW_CREDENTIALS = True
+# The editor revalidates split responses with If-None-Match and reads ETag/Server-Timing
+CORS_ALLOW_HEADERS = (*default_headers, 'if-none-match')
+CORS_EXPOSE_HEADERS = ['ETag', 'Server-Timing']
 
 ROOT_URLCONF = 'config.urls'
 
@@ -85,6 +91,24 @@ DATABASES = {
     }
 }
 
+# Cache framework. Local memory by default (per process); point the caches to
+# Redis or Memcached to share them between workers. Split responses get their own
+# alias so large bodies can't evict the rate-limit buckets of 'default'; with local
+# memory it holds at most MAX_ENTRIES bodies of SYLLABLE_RESPONSE_CACHE_MAX_BYTES
+# (32 MiB per process by default).
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('DJANGO_CACHE_LOCATION', 'syllables'),
+        'OPTIONS': {'MAX_ENTRIES': int(os.getenv('DJANGO_CACHE_MAX_ENTRIES', '1000'))},
+    },
+    'responses': {
+        'BACKEND': os.getenv('SYLLABLE_RESPONSE_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('SYLLABLE_RESPONSE_CACHE_LOCATION', 'syllable-responses'),
+        'OPTIONS': {'MAX_ENTRIES': int(os.getenv('SYLLABLE_RESPONSE_CACHE_MAX_ENTRIES', '512'))},
+    },
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/X.X/ref/settings/#auth-password-validators
 
@@ -125,3 +149,101 @@ STATIC_URL = '/static/'
 # https://docs.djangoproject.com/en/X.X/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Syllabification
+# Capacity (in words) of the in-process LRU cache in front of the syllable divider.
+# 0 disables caching. Check /api/syllables/stats/ to size it against real traffic.
+SYLLABLE_CACHE_SIZE = int(os.getenv('SYLLABLE_CACHE_SIZE', '50000'))
+# Language used when a request has no `lang` option (es, en, pt or it; see
+# apps/syllables/services/languages.py).
+SYLLABLE_DEFAULT_LANG = os.getenv('SYLLABLE_DEFAULT_LANG', 'es')
+# Maximum number of words accepted by POST /api/syllables/divide-batch/.
+SYLLABLE_BATCH_MAX_WORDS = int(os.getenv('SYLLABLE_BATCH_MAX_WORDS', '20000'))
+# Persistent syllable dictionary (Syllable model): consulted on cache misses before
+# the heuristic, so curated corrections win. Newly computed words are written back
+# in bulk after each response, up to MAX_COMPUTED computed rows in the table; they
+# are only used while the rules that produced them are unchanged. PRELOAD warms the
+# cache from the table at worker start.
+SYLLABLE_DICTIONARY_ENABLED = os.getenv('SYLLABLE_DICTIONARY_ENABLED', 'True') == 'True'
+SYLLABLE_DICTIONARY_WRITEBACK = os.getenv('SYLLABLE_DICTIONARY_WRITEBACK', 'True') == 'True'
+SYLLABLE_DICTIONARY_MAX_COMPUTED = int(os.getenv('SYLLABLE_DICTIONARY_MAX_COMPUTED', '200000'))
+SYLLABLE_DICTIONARY_PRELOAD = os.getenv('SYLLABLE_DICTIONARY_PRELOAD', 'False') == 'True'
+# Directory with the memory-mapped lexicons built by build_syllable_lexicon
+# (<lang>.sylx), consulted between the cache and the dictionary. Empty disables it.
+SYLLABLE_LEXICON_DIR = os.getenv('SYLLABLE_LEXICON_DIR', '')
+# Async (ASGI) endpoints under /api/syllables/async/: bodies larger than
+# INLINE_MAX_BYTES run in a bounded pool of ASYNC_WORKERS threads (default
+# min(4, CPUs)); at most ASYNC_MAX_QUEUE more may wait before answering 503.
+SYLLABLE_ASYNC_INLINE_MAX_BYTES = int(os.getenv('SYLLABLE_ASYNC_INLINE_MAX_BYTES', str(16 * 1024)))
+SYLLABLE_ASYNC_WORKERS = int(os.getenv('SYLLABLE_ASYNC_WORKERS', '0')) or None
+SYLLABLE_ASYNC_MAX_QUEUE = int(os.getenv('SYLLABLE_ASYNC_MAX_QUEUE', '64'))
+# Texts of at least PARALLEL_MIN_CHARS characters are syllabified across a pool of
+# PARALLEL_WORKERS processes (default: CPUs available to the process, divided by
+# the gunicorn workers under gunicorn.conf.py; fewer than 2 disables it, as does
+# a min of 0). Streaming requests always run serially.
+SYLLABLE_PARALLEL_MIN_CHARS = int(os.getenv('SYLLABLE_PARALLEL_MIN_CHARS', '100000'))
+SYLLABLE_PARALLEL_WORKERS = int(os.getenv('SYLLABLE_PARALLEL_WORKERS', '0')) or None
+# Per-request stage timings (Server-Timing header) and the in-process metrics
+# served by /api/syllables/metrics/.
+SYLLABLE_METRICS_ENABLED = os.getenv('SYLLABLE_METRICS_ENABLED', 'True') == 'True'
+SYLLABLE_SERVER_TIMING = os.getenv('SYLLABLE_SERVER_TIMING', 'True') == 'True'
+# split/ and split-syllables/ response cache: bodies of up to MAX_BYTES are kept
+# in the RESPONSE_CACHE_ALIAS cache for TIMEOUT seconds; responses carry an ETag
+# and If-None-Match answers 304. The dictionary generation that retires them on
+# Syllable changes lives in the same cache: with the local-memory backend
+# bump_generation only reaches the process that saved the row, so other workers
+# serve their old bodies until TIMEOUT (use a shared backend to avoid that).
+SYLLABLE_RESPONSE_CACHE_ENABLED = os.getenv('SYLLABLE_RESPONSE_CACHE_ENABLED', 'True') == 'True'
+SYLLABLE_RESPONSE_CACHE_ALIAS = os.getenv('SYLLABLE_RESPONSE_CACHE_ALIAS', 'responses')
+SYLLABLE_RESPONSE_CACHE_TIMEOUT = int(os.getenv('SYLLABLE_RESPONSE_CACHE_TIMEOUT', '300'))
+SYLLABLE_RESPONSE_CACHE_MAX_BYTES = int(os.getenv('SYLLABLE_RESPONSE_CACHE_MAX_BYTES', str(64 * 1024)))
+# Size limits of the text endpoints (413 when exceeded), per url name with a
+# "default" fallback, e.g. {'split_text': {'max_bytes': 256 * 1024}}. Bodies above
+# DATA_UPLOAD_MAX_MEMORY_SIZE are refused by Django before these apply.
+SYLLABLE_REQUEST_LIMITS = {
+    'default': {
+        'max_bytes': int(os.getenv('SYLLABLE_MAX_BODY_BYTES', str(2 * 1024 * 1024))),
+        'max_lines': int(os.getenv('SYLLABLE_MAX_LINES', '50000')),
+        'max_tokens': int(os.getenv('SYLLABLE_MAX_TOKENS', '500000')),
+    },
+    # An editor document, kept in memory between requests: much smaller than a songbook
+    'split_and_syllabify_incremental': {
+        'max_bytes': int(os.getenv('SYLLABLE_INCREMENTAL_MAX_BYTES', str(256 * 1024))),
+        'max_lines': int(os.getenv('SYLLABLE_INCREMENTAL_MAX_LINES', '5000')),
+        'max_tokens': int(os.getenv('SYLLABLE_INCREMENTAL_MAX_TOKENS', '50000')),
+    },
+}
+# Per-client token bucket (429 + Retry-After) of the text endpoints, kept in the
+# CACHE_ALIAS cache: BURST units refilled at RATE units/s; a request costs 1 unit
+# plus one per BYTES_PER_UNIT bytes of body. CLIENT_HEADER (e.g.
+# 'HTTP_X_FORWARDED_FOR' behind a proxy) identifies clients instead of REMOTE_ADDR:
+# the entry TRUSTED_PROXIES from the right, the one the outermost trusted proxy
+# appended (entries further left are client-supplied and can be forged).
+SYLLABLE_RATE_LIMIT_ENABLED = os.getenv('SYLLABLE_RATE_LIMIT_ENABLED', 'False') == 'True'
+SYLLABLE_RATE_LIMIT_RATE = float(os.getenv('SYLLABLE_RATE_LIMIT_RATE', '10'))
+SYLLABLE_RATE_LIMIT_BURST = float(os.getenv('SYLLABLE_RATE_LIMIT_BURST', '60'))
+SYLLABLE_RATE_LIMIT_BYTES_PER_UNIT = int(os.getenv('SYLLABLE_RATE_LIMIT_BYTES_PER_UNIT', str(16 * 1024)))
+SYLLABLE_RATE_LIMIT_CACHE_ALIAS = os.getenv('SYLLABLE_RATE_LIMIT_CACHE_ALIAS', 'default')
+SYLLABLE_RATE_LIMIT_CLIENT_HEADER = os.getenv('SYLLABLE_RATE_LIMIT_CLIENT_HEADER', '')
+SYLLABLE_RATE_LIMIT_TRUSTED_PROXIES = int(os.getenv('SYLLABLE_RATE_LIMIT_TRUSTED_PROXIES', '1'))
+# Rhyme index of GET /api/syllables/rhymes/: Syllable rows plus this wordlist
+# ("word [frequency]" per line; frequencies rank the results). Built on first use,
+# or at startup (before the fork under gunicorn) with PRELOAD.
+SYLLABLE_RHYME_WORDLIST = os.getenv('SYLLABLE_RHYME_WORDLIST', '')
+SYLLABLE_RHYME_PRELOAD = os.getenv('SYLLABLE_RHYME_PRELOAD', 'False') == 'True'
+# Documents kept (per worker process) by split-syllables/incremental/, and their
+# total size in characters (least recently used evicted past either; ~80 bytes of
+# memory per character, so the default is ~160 MB per worker at most).
+SYLLABLE_INCREMENTAL_MAX_DOCS = int(os.getenv('SYLLABLE_INCREMENTAL_MAX_DOCS', '1000'))
+SYLLABLE_INCREMENTAL_MAX_CHARS = int(os.getenv('SYLLABLE_INCREMENTAL_MAX_CHARS', '2000000'))
+# Background batch jobs (POST /api/syllables/jobs/): documents per job, worker
+# threads started in each web process (0: only `manage.py run_syllable_jobs`
+# workers), seconds before a claimed document of a dead worker is retried and
+# claims per document before it is marked failed.
+SYLLABLE_JOB_MAX_DOCUMENTS = int(os.getenv('SYLLABLE_JOB_MAX_DOCUMENTS', '1000'))
+SYLLABLE_JOB_THREADS = int(os.getenv('SYLLABLE_JOB_THREADS', '0'))
+SYLLABLE_JOB_LEASE_SECONDS = int(os.getenv('SYLLABLE_JOB_LEASE_SECONDS', '300'))
+SYLLABLE_JOB_MAX_ATTEMPTS = int(os.getenv('SYLLABLE_JOB_MAX_ATTEMPTS', '3'))
+# JSON backend of the syllable views: 'auto' uses orjson when installed, 'json'
+# forces the stdlib.
+SYLLABLE_JSON_BACKEND = os.getenv('SYLLABLE_JSON_BACKEND', 'auto')
@@ -1,18 +1,24 @@
-SECRET_KEY = 'your-production-secret-key'
+from .base import *  # noqa: F401,F403
+
+SECRET_KEY = os.getenv('DJANGO_SECRET_KEY', 'your-production-secret-key')
 
 DEBUG = False
 
-ALLOWED_HOSTS = ['yourdomain.com', 'www.yourdomain.com']
+ALLOWED_HOSTS = os.getenv('DJANGO_ALLOWED_HOSTS', 'yourdomain.com,www.yourdomain.com').split(',')
 
 # Database configuration
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',  # or your preferred database
-        'NAME': 'your_db_name',
-        'USER': 'your_db_user',
-        'PASSWORD': 'your_db_password',
-        'HOST': 'db',  # service name in docker-compose
-        'PORT': '5432',  # default PostgreSQL port
+        'NAME': os.getenv('DB_NAME', 'your_db_name'),
+        'USER': os.getenv('DB_USER', 'your_db_user'),
+        'PASSWORD': os.getenv('DB_PASSWORD', 'your_db_password'),
+        'HOST': os.getenv('DB_HOST', 'db'),  # service name in docker-compose
+        'PORT': os.getenv('DB_PORT', '5432'),  # default PostgreSQL port
+        # Persistent connections: each gunicorn worker thread reuses its connection
+        # for this many seconds instead of reconnecting on every request.
+        'CONN_MAX_AGE': int(os.getenv('DJANGO_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
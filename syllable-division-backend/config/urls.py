@@ -2,10 +2,18 @@ from django.contrib import admin
 from django.urls import path, include
 from django.http import JsonResponse
 
+from apps.syllables.services.warmup import readiness
+
 def healthz(_request):
     return JsonResponse({"status": "ok"})
 
+def readyz(_request):
+    # 503 until the worker has warmed up (and while the database is unreachable)
+    ready, details = readiness()
+    return JsonResponse(details, status=200 if ready else 503)
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/syllables/", include("apps.syllables.urls")),
-    path("healthz/", healthz),]
+    path("healthz/", healthz),
+    path("readyz/", readyz),]
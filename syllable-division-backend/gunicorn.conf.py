@@ -0,0 +1,63 @@
+# Production server settings, read by `gunicorn` from the project root (see
+# scripts/entrypoint.sh). Every value can be overridden with an environment
+# variable or on the command line.
+#
+# preload_app loads Django and runs the syllable warmup (config/wsgi.py) once in
+# the master, so the compiled tables, the mapped lexicons and the preloaded
+# dictionary cache are shared copy-on-write by all workers instead of being
+# rebuilt per worker. Syllabification is CPU-bound: one process per CPU, with a
+# couple of threads each to overlap database and client I/O.
+
+import os
+
+
+def _cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))  # honours container CPU sets
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", "0")) or max(2, _cpus())
+threads = int(os.getenv("GUNICORN_THREADS", "2"))
+# Each worker starts its own pool for very large texts (services/parallel.py):
+# split the CPUs between workers instead of giving every one a pool per CPU. With
+# the default one worker per CPU that disables it; lower GUNICORN_WORKERS to use it.
+os.environ.setdefault("SYLLABLE_PARALLEL_WORKERS", str(max(1, _cpus() // workers)))
+# gthread by default; uvicorn.workers.UvicornWorker serves the ASGI app
+# (async endpoints) and needs uvicorn installed.
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread" if threads > 1 else "sync")
+wsgi_app = "config.asgi:application" if "uvicorn" in worker_class.lower() else "config.wsgi:application"
+
+preload_app = True
+# Idle keep-alive connections from the load balancer / reverse proxy.
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+backlog = int(os.getenv("GUNICORN_BACKLOG", "2048"))
+# Recycle workers now and then; the jitter keeps them from restarting together.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "5000"))
+max_requests_jitter = max_requests // 10
+# Heartbeat files on tmpfs, so a slow disk can't make the master kill workers.
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def pre_fork(server, worker):
+    # Runs in the master: don't hand the database connection opened by the
+    # warmup to the workers; each one opens (and keeps, see CONN_MAX_AGE) its own.
+    from django.db import connections
+
+    connections.close_all()
+
+
+def post_fork(server, worker):
+    # Runs in each new worker: start its SYLLABLE_JOB_THREADS job threads (the
+    # Django app is already loaded, see preload_app).
+    from apps.syllables.services.jobs import start_job_threads
+
+    start_job_threads()
@@ -14,4 +14,9 @@ echo "Base de datos lista."
 python manage.py migrate --noinput
 python manage.py collectstatic --noinput || true
 
-python manage.py runserver 0.0.0.0:8000
\ No newline at end of file
+# DJANGO_SERVER=runserver keeps the development server (autoreload); otherwise
+# gunicorn serves with gunicorn.conf.py (preloaded app, one worker per CPU).
+if [ "${DJANGO_SERVER:-gunicorn}" = "runserver" ]; then
+  exec python manage.py runserver 0.0.0.0:8000
+fi
+exec gunicorn